@@ -1,15 +1,28 @@
 import os
 import json
-from typing import List, Dict, Any, Tuple
+import asyncio
+import copy
+import threading
+import queue
+from typing import List, Dict, Any, Tuple, Optional
 import uuid
 from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.prompts import PromptTemplate
-from langchain.chains import RetrievalQA
+from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_community.retrievers import TavilySearchAPIRetriever
-from newspaper import Article
 from langchain_community.vectorstores import Chroma
-from llm_client import llm
+from llm_client import llm, LLM_MODEL
+from llm_scheduler import llm_request_scope
+from single_flight import coalesced
+from telemetry import external_span, register_stats
+from scraper import page_fetcher
+from semantic_cache import create_semantic_cache
+from embedding_cache import CachedEmbeddings, with_embedding_cache
+from vector_index import NumpyVectorIndex
+from store_versions import VersionedStore
+from config import resolve_backend_path
+import time
 from dotenv import load_dotenv
 import re
 from urllib.parse import urlparse
@@ -23,6 +36,26 @@ load_dotenv()
 # --- Configuration for RAG Knowledge Base ---
 # Directory to persist ChromaDB
 CHROMA_PERSIST_DIR = "behavioral_chroma_db"
+# Vector store backend: "chroma", or "numpy" for the in-process exact index
+# (suited to a KB of up to ~100k chunks; no HNSW/SQLite startup cost)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+NUMPY_INDEX_DIR = "behavioral_numpy_index"
+# Each backend keeps its own directory (and source index); switching backends
+# starts from default content and the next refresh repopulates it, served
+# mostly from the embedding cache.
+KB_PERSIST_DIR = resolve_backend_path(
+    "KB_PERSIST_DIR", NUMPY_INDEX_DIR if VECTOR_BACKEND == "numpy" else CHROMA_PERSIST_DIR
+)
+# Multi-process access (uvicorn --workers, several pods on a shared volume):
+# "lock"     - any process may write; mutations are serialized by a file lock
+#              and published as a new version of the store.
+# "readonly" - never write; only pick up versions published by the writer.
+KB_WRITE_MODE = os.getenv("KB_WRITE_MODE", "lock").lower()
+# How often a process checks whether a newer version has been published
+KB_RELOAD_INTERVAL_SECONDS = float(os.getenv("KB_RELOAD_INTERVAL_SECONDS", "5"))
+# Old versions kept for readers that have not switched yet
+KB_KEEP_VERSIONS = int(os.getenv("KB_KEEP_VERSIONS", "3"))
+KB_LOCK_TIMEOUT_SECONDS = float(os.getenv("KB_LOCK_TIMEOUT_SECONDS", "300"))
 # Sources to periodically scrape (conceptual for this file, actual list might be external)
 # For demonstration, we can list some common interview prep sites.
 # In a real system, this would be managed more dynamically.
@@ -35,14 +68,9 @@ DEFAULT_SCRAPE_SOURCES = [
 ]
 
 # --- Convert Job Description to Search Query ---
-def convert_jd_to_search_query(job_description: str) -> str:
-    """
-    Convert a job description to an optimized search query for finding relevant behavioral interview questions.
-    """
-    try:
-        search_query_prompt = PromptTemplate(
-            input_variables=["job_description"],
-            template="""
+search_query_prompt = PromptTemplate(
+    input_variables=["job_description"],
+    template="""
 You are an expert at creating search queries for finding relevant behavioral interview questions.
 
 Given the following job description, extract the key skills, technologies, responsibilities, and role requirements to create an optimized search query for finding behavioral interview questions.
@@ -66,35 +94,59 @@ Example inputs and outputs:
 - Output: "data scientist behavioral interview questions Python machine learning"
 
 Search Query:"""
-        )
+)
 
-        # Use the LLM to generate the search query
-        search_query = llm.predict(search_query_prompt.format(job_description=job_description))
+def clean_search_query(search_query: str) -> str:
+    """
+    Normalize the raw LLM output into a bounded behavioral-interview search query.
+    """
+    # Clean up the response - remove any extra text
+    search_query = search_query.strip()
 
-        # Clean up the response - remove any extra text
-        search_query = search_query.strip()
+    # Add "behavioral interview questions" if not already present
+    if "behavioral interview" not in search_query.lower():
+        search_query = f"behavioral interview questions {search_query}"
 
-        # Add "behavioral interview questions" if not already present
-        if "behavioral interview" not in search_query.lower():
-            search_query = f"behavioral interview questions {search_query}"
+    # Limit length and clean up
+    words = search_query.split()
+    if len(words) > 15:
+        search_query = " ".join(words[:15])
 
-        # Limit length and clean up
-        words = search_query.split()
-        if len(words) > 15:
-            search_query = " ".join(words[:15])
+    print(f"Generated search query: {search_query}")
+    return search_query
 
-        print(f"Generated search query: {search_query}")
-        return search_query
+# Concurrent requests for the same JD share one search query, one Tavily
+# search and one question generation (see single_flight.coalesced)
+@coalesced("search_query")
+def convert_jd_to_search_query(job_description: str) -> str:
+    """
+    Convert a job description to an optimized search query for finding relevant behavioral interview questions.
+    """
+    try:
+        # Use the LLM to generate the search query
+        search_query = llm.predict(search_query_prompt.format(job_description=job_description))
+        return clean_search_query(search_query)
 
     except Exception as e:
         print(f"Error converting JD to search query: {e}")
         # Fallback: extract basic terms
         return extract_basic_search_terms(job_description)
 
-def extract_basic_search_terms(job_description: str) -> str:
+@coalesced("search_query")
+async def aconvert_jd_to_search_query(job_description: str) -> str:
     """
-    Fallback method to extract basic search terms from job description.
+    Async counterpart of convert_jd_to_search_query.
     """
+    try:
+        search_query = await llm.apredict(search_query_prompt.format(job_description=job_description))
+        return clean_search_query(search_query)
+
+    except Exception as e:
+        print(f"Error converting JD to search query: {e}")
+        return extract_basic_search_terms(job_description)
+
+def find_jd_terms(job_description: str) -> List[str]:
+    """Role and technology keywords found in the job description (at most 6)."""
     # Common technical terms and skills to look for
     technical_terms = [
         'java', 'python', 'javascript', 'c#', 'c++', 'react', 'angular', 'node.js',
@@ -122,6 +174,14 @@ def extract_basic_search_terms(job_description: str) -> str:
         if term in jd_lower and len(found_terms) < 6:  # Limit to 6 terms total
             found_terms.append(term)
 
+    return found_terms
+
+def extract_basic_search_terms(job_description: str) -> str:
+    """
+    Fallback method to extract basic search terms from job description.
+    """
+    found_terms = find_jd_terms(job_description)
+
     # Create search query
     if found_terms:
         search_query = f"behavioral interview questions {' '.join(found_terms[:5])}"
@@ -144,44 +204,60 @@ def get_domain_name(url: str) -> str:
     except:
         return "web_source"
 
+def with_domain(page: Dict[str, Any]) -> Dict[str, Any]:
+    page['domain'] = get_domain_name(page['url'])
+    return page
+
+def scrape_urls(
+    urls: List[str],
+    validators: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch and parse several URLs concurrently through the shared page fetcher.
+    validators maps a URL to the etag/last_modified of its previous fetch, so
+    unchanged pages come back with not_modified=True and no content.
+    """
+    return [with_domain(page) for page in page_fetcher.fetch_all_sync(urls, validators)]
+
+async def ascrape_urls(
+    urls: List[str],
+    validators: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """Async counterpart of scrape_urls, sharing the API's keep-alive connection pool."""
+    return [with_domain(page) for page in await page_fetcher.fetch_all(urls, validators)]
+
 def scrape_text_with_metadata(url: str) -> Dict[str, Any]:
     """Scrape text and return with metadata for better source tracking."""
-    try:
-        article = Article(url)
-        article.download()
-        article.parse()
-
-        return {
-            'content': article.text,
-            'title': article.title or 'Untitled',
-            'url': url,
-            'domain': get_domain_name(url),
-            'success': True,
-            'last_scraped': datetime.now().isoformat() # Add timestamp
-        }
-    except Exception as e:
-        print(f"Failed to scrape {url}: {e}")
-        return {
-            'content': '',
-            'title': '',
-            'url': url,
-            'domain': get_domain_name(url),
-            'success': False,
-            'last_scraped': datetime.now().isoformat()
-        }
+    return scrape_urls([url])[0]
 
 # --- Get URLs using TavilySearchAPIRetriever ---
+def urls_from_search_docs(docs: List[Document]) -> List[str]:
+    urls = []
+    for d in docs:
+        url = d.metadata.get("source", d.metadata.get("url"))
+        if url:
+            urls.append(url)
+    print(f"Retrieved {len(urls)} URLs from search")
+    return urls
+
+@coalesced("behavioral_urls")
 def retrieve_behavioral_urls(query: str, k: int = 5) -> List[str]:
     try:
         retriever = TavilySearchAPIRetriever(k=k)
-        docs = retriever.invoke(query)
-        urls = []
-        for d in docs:
-            url = d.metadata.get("source", d.metadata.get("url"))
-            if url:
-                urls.append(url)
-        print(f"Retrieved {len(urls)} URLs from search")
-        return urls
+        with external_span("tavily_search"):
+            docs = retriever.invoke(query)
+        return urls_from_search_docs(docs)
+    except Exception as e:
+        print(f"Error retrieving URLs: {e}")
+        return []
+
+@coalesced("behavioral_urls")
+async def aretrieve_behavioral_urls(query: str, k: int = 5) -> List[str]:
+    try:
+        retriever = TavilySearchAPIRetriever(k=k)
+        with external_span("tavily_search"):
+            docs = await retriever.ainvoke(query)
+        return urls_from_search_docs(docs)
     except Exception as e:
         print(f"Error retrieving URLs: {e}")
         return []
@@ -189,19 +265,17 @@ def retrieve_behavioral_urls(query: str, k: int = 5) -> List[str]:
 # --- Setup persistent Chroma DB with enhanced source tracking ---
 from datetime import datetime
 
-def setup_chroma_from_urls(urls: List[str], persist_dir=CHROMA_PERSIST_DIR) -> Tuple[Chroma, Dict[str, str]]:
+def create_embeddings():
     """
-    Setup Chroma DB and return source mapping for attribution.
-    This function now handles initial setup and updates conceptually.
+    Create the embedding model, preferring Google and falling back to local MiniLM.
+    Chunk embeddings are served from the persistent embedding cache when the
+    same text was embedded before by the same model.
     """
-    source_mapping = {}  # Maps chunk IDs or original URLs to source domains
-
-    # Try to load existing vectorstore
-    vectorstore = None
     try:
         from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        model = "models/embedding-001"
         embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
+            model=model,
             google_api_key=os.getenv("GOOGLE_API_KEY")
         )
         print("Using Google embeddings for ChromaDB initialization.")
@@ -209,198 +283,759 @@ def setup_chroma_from_urls(urls: List[str], persist_dir=CHROMA_PERSIST_DIR) -> T
         print(f"Google embeddings failed for ChromaDB: {e}")
         try:
             from langchain_community.embeddings import HuggingFaceEmbeddings
+            model = "sentence-transformers/all-MiniLM-L6-v2"
             embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
+                model_name=model
             )
             print("Using HuggingFace embeddings as fallback for ChromaDB initialization.")
         except Exception as e:
             print(f"HuggingFace embeddings failed for ChromaDB: {e}")
             raise Exception("No embedding service available for ChromaDB.")
+    embeddings = with_embedding_cache(embeddings, model)
+    if isinstance(embeddings, CachedEmbeddings):
+        register_stats("embedding_cache", embeddings.stats)
+    return embeddings
+
+# --- URL -> content-hash index ---
+SOURCE_INDEX_FILE = "source_index.json"
+SYSTEM_SOURCES = ("system_default", "system_fallback")
+
+
+class SourceIndex:
+    """
+    Remembers, for every scraped URL in the store, the hash of the page content
+    and the ids of the chunks it produced. A refresh compares hashes against it
+    so unchanged pages are skipped and changed pages replace (rather than
+    duplicate) their old chunks. Saved as JSON next to the Chroma files.
+    """
+
+    def __init__(self, path: str, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, persist_dir: str, vectorstore: Optional[Chroma] = None) -> "SourceIndex":
+        """Read the index file, or rebuild it from chunk metadata for stores created before it existed."""
+        path = os.path.join(persist_dir, SOURCE_INDEX_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return cls(path, json.load(f))
+            except Exception as e:
+                print(f"Failed to read source index {path}: {e}. Rebuilding from the store.")
+        index = cls(path)
+        if vectorstore is not None:
+            index.rebuild_from_store(vectorstore)
+        return index
+
+    def rebuild_from_store(self, vectorstore: Chroma) -> None:
+        stored = vectorstore.get(include=["metadatas"])
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for chunk_id, metadata in zip(stored.get("ids", []), stored.get("metadatas", [])):
+            metadata = metadata or {}
+            url = metadata.get("source")
+            if not url or url in SYSTEM_SOURCES:
+                continue
+            entry = grouped.setdefault(url, {"hashes": set(), "scrapes": set(), "chunk_ids": [], "metadata": metadata})
+            entry["hashes"].add(metadata.get("content_hash"))
+            entry["scrapes"].add(metadata.get("last_scraped"))
+            entry["chunk_ids"].append(chunk_id)
+
+        for url, entry in grouped.items():
+            # Older stores appended every refresh, so a URL may hold several copies.
+            # Leave its hash unset in that case; the next refresh replaces them all.
+            single_copy = len(entry["hashes"]) == 1 and len(entry["scrapes"]) == 1
+            self.entries[url] = {
+                "content_hash": next(iter(entry["hashes"])) if single_copy else None,
+                "chunk_ids": entry["chunk_ids"],
+                "domain": entry["metadata"].get("domain", get_domain_name(url)),
+                "origin": "unknown",
+                "last_scraped": entry["metadata"].get("last_scraped"),
+            }
+        if self.entries:
+            print(f"Rebuilt source index for {len(self.entries)} URLs from existing chunks.")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def set(self, url: str, entry: Dict[str, Any]) -> None:
+        self.entries[url] = entry
+
+    def remove(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.pop(url, None)
+
+    def validators(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """ETag/Last-Modified of indexed pages, for conditional re-fetching."""
+        validators = {}
+        for url in urls:
+            entry = self.entries.get(url)
+            # Without a known hash a 304 would leave the page unverified, so fetch it in full
+            if entry and entry.get("content_hash") and (entry.get("etag") or entry.get("last_modified")):
+                validators[url] = {"etag": entry.get("etag"), "last_modified": entry.get("last_modified")}
+        return validators
+
+    def source_mapping(self) -> Dict[str, str]:
+        return {url: entry.get("domain", get_domain_name(url)) for url, entry in self.entries.items()}
+
+    def save(self) -> None:
+        # Write then rename so a crash mid-write never leaves a truncated index
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def content_hash_for(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def split_into_chunks(documents: List[Document]) -> List[Document]:
+    """Split page documents into store chunks tagged with their source domain."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks = splitter.split_documents(documents)
+    for chunk in chunks:
+        chunk_source = chunk.metadata.get('source', 'unknown')
+        chunk.metadata['source_domain'] = get_domain_name(chunk_source) if chunk_source != 'unknown' else 'unknown'
+    return chunks
+
+
+def chunk_ids_for(url: str, content_hash: str, count: int) -> List[str]:
+    """Deterministic chunk ids, so the index can delete exactly what a page added."""
+    url_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return [f"{url_key}-{content_hash[:16]}-{i}" for i in range(count)]
+
+
+def apply_scraped_pages(
+    vectorstore: Chroma,
+    source_index: SourceIndex,
+    scraped_pages: List[Dict[str, Any]],
+    origin: str = "search"
+) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Bring the store in line with freshly scraped pages. Pages whose content hash
+    matches the index are skipped without embedding anything; changed pages have
+    their old chunks deleted before the new ones are added; new pages are added.
+    Pages that came back 304 Not Modified count as unchanged. Failed scrapes
+    leave whatever the store already has for that URL untouched.
+    Returns (counts, source_mapping) where counts has added/updated/unchanged/failed.
+    """
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    source_mapping: Dict[str, str] = {}
+
+    for scraped_data in scraped_pages:
+        url = scraped_data['url']
+        entry = source_index.get(url)
+        if scraped_data.get('not_modified') and entry:
+            source_mapping[url] = scraped_data['domain']
+            counts["unchanged"] += 1
+            continue
+        if not (scraped_data['success'] and scraped_data['content'].strip()):
+            print(f"Skipping empty or failed scrape for {url}")
+            counts["failed"] += 1
+            continue
+
+        content_hash = content_hash_for(scraped_data['content'])
+        source_mapping[url] = scraped_data['domain']
+        validators = {"etag": scraped_data.get('etag'), "last_modified": scraped_data.get('last_modified')}
+
+        if entry and entry.get("content_hash") == content_hash:
+            # Same content, but the server may have issued new validators
+            entry.update(validators)
+            counts["unchanged"] += 1
+            continue
+
+        doc = Document(
+            page_content=scraped_data['content'],
+            metadata={
+                "source": url,
+                "domain": scraped_data['domain'],
+                "title": scraped_data['title'],
+                "last_scraped": scraped_data['last_scraped'],
+                "content_hash": content_hash
+            }
+        )
+        chunks = split_into_chunks([doc])
+        ids = chunk_ids_for(url, content_hash, len(chunks))
 
+        if entry and entry.get("chunk_ids"):
+            vectorstore.delete(ids=entry["chunk_ids"])
+        if chunks:
+            vectorstore.add_documents(chunks, ids=ids)
+
+        source_index.set(url, {
+            "content_hash": content_hash,
+            "chunk_ids": ids,
+            "domain": scraped_data['domain'],
+            "origin": entry.get("origin", origin) if entry else origin,
+            "last_scraped": scraped_data['last_scraped'],
+            **validators,
+        })
+        counts["updated" if entry else "added"] += 1
+
+    return counts, source_mapping
+
+
+def stale_sources(
+    source_index: SourceIndex,
+    keep_urls: List[str],
+    origins: Tuple[str, ...] = ("scheduled",)
+) -> List[str]:
+    """Indexed URLs from the given origins that are no longer in keep_urls."""
+    keep = set(keep_urls)
+    return [
+        url for url, entry in source_index.entries.items()
+        if entry.get("origin") in origins and url not in keep
+    ]
+
+
+def changed_pages(source_index: SourceIndex, scraped_pages: List[Dict[str, Any]]) -> List[str]:
+    """URLs among scraped_pages that apply_scraped_pages would add or re-embed."""
+    changed = []
+    for scraped_data in scraped_pages:
+        if scraped_data.get('not_modified') or not (scraped_data['success'] and scraped_data['content'].strip()):
+            continue
+        entry = source_index.get(scraped_data['url'])
+        if not entry or entry.get("content_hash") != content_hash_for(scraped_data['content']):
+            changed.append(scraped_data['url'])
+    return changed
+
+
+def prune_sources(
+    vectorstore: Chroma,
+    source_index: SourceIndex,
+    keep_urls: List[str],
+    origins: Tuple[str, ...] = ("scheduled",)
+) -> List[str]:
+    """
+    Delete the chunks of indexed URLs from the given origins that are no longer
+    in keep_urls (a source removed from the refresh list). URLs added by live
+    search belong to other origins and are left alone.
+    """
+    pruned = stale_sources(source_index, keep_urls, origins)
+    for url in pruned:
+        entry = source_index.remove(url)
+        if entry and entry.get("chunk_ids"):
+            vectorstore.delete(ids=entry["chunk_ids"])
+    return pruned
+
+
+def open_vectorstore(persist_dir: str, embeddings):
+    """Open the persisted store of the configured backend, or None if there is none yet."""
+    if VECTOR_BACKEND == "numpy":
+        return NumpyVectorIndex.load(persist_dir, embeddings) if NumpyVectorIndex.exists(persist_dir) else None
     if os.path.exists(persist_dir) and os.listdir(persist_dir):
+        return Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+    return None
+
+def new_vectorstore(persist_dir: str, embeddings):
+    """Create an empty store of the configured backend."""
+    if VECTOR_BACKEND == "numpy":
+        return NumpyVectorIndex(persist_directory=persist_dir, embedding_function=embeddings)
+    return Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+
+# Chroma has no public way to stop the system behind a single client: reset()
+# wipes the data and clear_system_cache() forgets every system without stopping
+# it. Releasing therefore reaches into SharedSystemClient's per-directory cache,
+# which is only done on the releases checked to have it; on any other release
+# replaced stores stay open until the process exits.
+CHROMA_RELEASABLE_VERSIONS = ("0.5.", "0.6.")
+
+def _chroma_systems() -> Optional[Dict[str, Any]]:
+    """Chroma's identifier -> system cache, or None on an unchecked release."""
+    import chromadb
+    if not chromadb.__version__.startswith(CHROMA_RELEASABLE_VERSIONS):
+        return None
+    from chromadb.api.client import SharedSystemClient
+    return getattr(SharedSystemClient, "_identifier_to_system", None)
+
+def release_vectorstore(vectorstore) -> None:
+    """
+    Free a store that has been replaced by a newer version. Chroma keeps one
+    system (SQLite connection, loaded HNSW index) per directory for the life of
+    the process unless it is stopped explicitly.
+    """
+    if not isinstance(vectorstore, Chroma):
+        return
+    try:
+        systems = _chroma_systems()
+        if systems is None:
+            return
+        system = systems.pop(vectorstore._client._identifier, None)
+        if system is not None:
+            system.stop()
+    except Exception as e:
+        print(f"Failed to release Chroma store in {vectorstore._persist_directory}: {e}")
+
+def setup_chroma_from_urls(
+    urls: List[str],
+    persist_dir=KB_PERSIST_DIR,
+    scraped_pages: Optional[List[Dict[str, Any]]] = None,
+    embeddings=None,
+    vectorstore: Optional[Chroma] = None,
+    source_index: Optional[SourceIndex] = None,
+    origin: str = "search"
+) -> Tuple[Chroma, Dict[str, str]]:
+    """
+    Setup Chroma DB and return source mapping for attribution.
+    If scraped_pages is given (e.g. from ascrape_urls), those results are used
+    instead of scraping the URLs again. An already-loaded embeddings model,
+    vectorstore and source index can be passed in to skip reloading them from disk.
+    Pages are applied through the source index, so only new or changed content
+    is embedded, and the store is only persisted when something changed.
+    """
+    source_mapping = {}  # Maps original URLs to source domains
+
+    if embeddings is None:
+        embeddings = create_embeddings()
+
+    if vectorstore is None:
         try:
-            vectorstore = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
-            print(f"Loaded existing ChromaDB from {persist_dir}")
+            vectorstore = open_vectorstore(persist_dir, embeddings)
+            if vectorstore is not None:
+                print(f"Loaded existing {VECTOR_BACKEND} vectorstore from {persist_dir}")
         except Exception as e:
-            print(f"Failed to load ChromaDB: {e}. Rebuilding...")
+            print(f"Failed to load {VECTOR_BACKEND} vectorstore: {e}. Rebuilding...")
             vectorstore = None # Force rebuild if load fails
 
-    new_documents = []
-    successful_sources = []
+    if source_index is None and urls:
+        source_index = SourceIndex.load(persist_dir, vectorstore)
 
-    # If no URLs provided, or we need to refresh/add default content
-    if not urls and not vectorstore:
-        print("No URLs provided and no existing DB. Creating with default content.")
-        documents = [Document(
-            page_content="Behavioral interview questions focus on past experiences and how candidates handled specific situations.",
-            metadata={"source": "system_default", "domain": "system", "title": "Default Content", "last_scraped": datetime.now().isoformat()}
-        )]
-        new_documents.extend(documents)
-        source_mapping["system_default"] = "system_default"
-    elif urls:
+    created = vectorstore is None
+    if created:
+        print(f"Creating new {VECTOR_BACKEND} vectorstore in {persist_dir}")
+        vectorstore = new_vectorstore(persist_dir, embeddings)
+
+    changed = False
+    if urls:
         print(f"Processing {len(urls)} URLs for scraping and potential addition/update to ChromaDB.")
-        for url in urls:
-            scraped_data = scrape_text_with_metadata(url)
-            if scraped_data['success'] and scraped_data['content'].strip():
-                # Hash content to check for duplicates/changes
-                content_hash = hashlib.sha256(scraped_data['content'].encode('utf-8')).hexdigest()
-
-                # Conceptual check for existing content (Chroma doesn't easily support direct content updates by URL yet)
-                # For real-world, might need to query by metadata (source URL) and delete/re-add.
-                # For simplicity here, we assume if content hash matches, it's a duplicate.
-                # More robust: fetch existing docs by URL and compare hash, then delete/add.
-                # For this example, we'll just add new docs and rely on Chroma's internal de-duplication if content is identical.
-                # A better approach for updates might involve a separate index for metadata/hashes.
-
-                doc = Document(
-                    page_content=scraped_data['content'],
-                    metadata={
-                        "source": url,
-                        "domain": scraped_data['domain'],
-                        "title": scraped_data['title'],
-                        "last_scraped": scraped_data['last_scraped'],
-                        "content_hash": content_hash # Store hash for future checks
-                    }
-                )
-                new_documents.append(doc)
-                successful_sources.append(scraped_data['domain'])
-                source_mapping[url] = scraped_data['domain']
-            else:
-                print(f"Skipping empty or failed scrape for {url}")
-
-    if not new_documents and not vectorstore:
-        print("No new documents scraped and no existing vectorstore. Adding essential fallback content.")
+        if scraped_pages is None:
+            scraped_pages = scrape_urls(urls, source_index.validators(urls))
+        counts, source_mapping = apply_scraped_pages(vectorstore, source_index, scraped_pages, origin=origin)
+        print(f"Source refresh: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['failed']} failed.")
+        changed = counts["added"] + counts["updated"] > 0
+
+    if created and not changed:
+        # A brand-new store with nothing scraped into it still needs some content
+        source = "system_fallback" if urls else "system_default"
+        print(f"No content scraped for the new ChromaDB. Adding {source} content.")
         documents = [Document(
             page_content="Behavioral interview questions focus on past experiences and how candidates handled specific situations. It's crucial to prepare STAR method answers.",
-            metadata={"source": "system_fallback", "domain": "system", "title": "Fallback Content", "last_scraped": datetime.now().isoformat()}
+            metadata={"source": source, "domain": "system", "title": "Default Content", "last_scraped": datetime.now().isoformat()}
         )]
-        new_documents.extend(documents)
-        source_mapping["system_fallback"] = "system_fallback"
+        vectorstore.add_documents(split_into_chunks(documents))
+        source_mapping[source] = source
+        changed = True
+
+    if changed:
+        vectorstore.persist()
+        if source_index is not None:
+            source_index.save()
+    else:
+        print("No new or changed content for ChromaDB.")
 
+    return vectorstore, source_mapping
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    chunks = splitter.split_documents(new_documents)
+# --- Process-wide knowledge base ---
+class BehavioralKnowledgeBase:
+    """
+    Holds the embedding model and the vector store (Chroma or NumpyVectorIndex,
+    per VECTOR_BACKEND) for the lifetime of the process.
+    load() is called once at API startup; every request then shares the same
+    warm instance instead of reloading the model and reopening the DB.
+
+    The store lives in versioned directories under persist_dir (see
+    store_versions.VersionedStore), so several workers or pods can share it:
+    a mutation takes the cross-process write lock, applies the change to a
+    copy of the current version and publishes the copy. Readers keep serving
+    the version they opened and switch to a newly published one within
+    KB_RELOAD_INTERVAL_SECONDS. With write_mode="readonly" the process never
+    writes and only follows what the writer publishes.
+    """
 
-    # Update source mapping for chunks (using original document's metadata)
-    for chunk in chunks:
-        chunk_source = chunk.metadata.get('source', 'unknown')
-        chunk.metadata['source_domain'] = get_domain_name(chunk_source) if chunk_source != 'unknown' else 'unknown'
-        # Add last_scraped to chunk metadata if available from original doc
-        if 'last_scraped' in chunk.metadata:
-            chunk.metadata['last_scraped'] = chunk.metadata['last_scraped']
+    def __init__(self, persist_dir: str = KB_PERSIST_DIR, write_mode: str = KB_WRITE_MODE):
+        self.persist_dir = persist_dir
+        self.write_mode = write_mode
+        self.embeddings = None
+        self.vectorstore: Optional[Chroma] = None
+        self.source_index: Optional[SourceIndex] = None
+        self.source_mapping: Dict[str, str] = {}
+        self.version: Optional[str] = None
+        self._versions: Optional[VersionedStore] = None
+        self._checked_at = 0.0
+        # Versions this process has opened, newest last; older ones are released
+        self._opened: List[Tuple[str, Chroma]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.vectorstore is not None
+
+    @property
+    def read_only(self) -> bool:
+        return self.write_mode == "readonly"
+
+    def load(self) -> None:
+        """Load the embedding model and open the published store (no-op if already loaded)."""
+        if self.is_loaded:
+            return
+        with self._lock:
+            if self.is_loaded:
+                return
+            if self.embeddings is None:
+                self.embeddings = create_embeddings()
+            self._versions = VersionedStore(self.persist_dir, KB_KEEP_VERSIONS, KB_LOCK_TIMEOUT_SECONDS)
+            if self._versions.current_version() is None:
+                if self.read_only:
+                    raise RuntimeError(f"No published knowledge base in {self.persist_dir} yet; start the writer first")
+                with self._versions.lock:
+                    if self._versions.current_version() is None:
+                        self._bootstrap()
+            self._open_current()
+            print(f"Behavioral knowledge base {self.version} loaded from {self.persist_dir}")
+
+    def _bootstrap(self) -> None:
+        """
+        Publish the first version: the store already in persist_dir from before
+        versioning if there is one, otherwise a new store with default content.
+        Call with the write lock held.
+        """
+        version = self._versions.stage_legacy() or self._versions.stage()
+        try:
+            path = self._versions.path(version)
+            vectorstore, _ = setup_chroma_from_urls(urls=[], persist_dir=path, embeddings=self.embeddings)
+            source_index = SourceIndex.load(path, vectorstore)
+            if not os.path.exists(source_index.path):
+                source_index.save()
+            release_vectorstore(vectorstore)
+        except Exception:
+            self._versions.discard(version)
+            raise
+        self._versions.publish(version)
+
+    def _open_version(self, version: str) -> None:
+        """Open a published version and make it the live store. Call with self._lock held."""
+        path = self._versions.path(version)
+        vectorstore = open_vectorstore(path, self.embeddings)
+        if vectorstore is None:
+            raise RuntimeError(f"Knowledge base version {version} in {self.persist_dir} is empty")
+        self._swap(version, vectorstore, SourceIndex.load(path, vectorstore))
+
+    def _open_current(self, attempts: int = 3) -> None:
+        """
+        Open the version CURRENT points at. Without the write lock a writer may
+        publish again and prune that version while it is being opened; in that
+        case retry with the newer one. Call with self._lock held.
+        """
+        for attempt in range(attempts):
+            version = self._versions.current_version()
+            try:
+                self._open_version(version)
+                return
+            except Exception:
+                if attempt == attempts - 1 or self._versions.current_version() == version:
+                    raise
+                print(f"Knowledge base version {version} was replaced while opening it; retrying")
+
+    def _swap(self, version: str, vectorstore: Chroma, source_index: SourceIndex) -> None:
+        # Requests that already hold the old store finish on it; it is only
+        # released once it has dropped out of the kept versions
+        self.vectorstore, self.source_index, self.version = vectorstore, source_index, version
+        self.source_mapping = source_index.source_mapping()
+        self._checked_at = time.monotonic()
+        self._opened.append((version, vectorstore))
+        while len(self._opened) > KB_KEEP_VERSIONS:
+            release_vectorstore(self._opened.pop(0)[1])
+
+    def _catch_up(self) -> None:
+        """Switch to the published version if another process has moved it on. Call with self._lock held."""
+        version = self._versions.current_version()
+        self._checked_at = time.monotonic()
+        if version and version != self.version:
+            print(f"Switching behavioral knowledge base from {self.version} to {version}")
+            self._open_current()
+
+    def _maybe_reload(self) -> None:
+        if time.monotonic() - self._checked_at < KB_RELOAD_INTERVAL_SECONDS:
+            return
+        # A request that finds the lock taken keeps the current store rather than waiting
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self.is_loaded:
+                self._catch_up()
+        except Exception as e:
+            print(f"Failed to switch to the latest knowledge base version: {e}")
+        finally:
+            self._lock.release()
+
+    def get(self) -> Tuple[Chroma, Dict[str, str]]:
+        """Return the shared vectorstore and its source mapping, loading lazily if needed."""
+        self.load()
+        self._maybe_reload()
+        return self.vectorstore, dict(self.source_mapping)
+
+    def _write(
+        self,
+        scraped_pages: List[Dict[str, Any]],
+        origin: str,
+        keep_urls: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """
+        Apply scraped pages (and, if keep_urls is given, prune scheduled sources
+        not in it) under the cross-process write lock. Any change, including
+        refreshed ETag/Last-Modified validators alone, is made to a copy of the
+        current version, which is then published; a published version is never
+        modified in place. If nothing changed at all, nothing is written.
+        """
+        with self._lock, self._versions.lock:
+            self._catch_up()
+            pruning = stale_sources(self.source_index, keep_urls) if keep_urls is not None else []
+            if not changed_pages(self.source_index, scraped_pages) and not pruning:
+                # Nothing to embed or delete; see on a scratch copy of the index
+                # whether the servers issued new validators worth publishing
+                preview = SourceIndex(self.source_index.path, copy.deepcopy(self.source_index.entries))
+                counts, source_mapping = apply_scraped_pages(self.vectorstore, preview, scraped_pages, origin=origin)
+                if preview.entries == self.source_index.entries:
+                    counts["pruned"] = 0
+                    self.source_mapping.update(source_mapping)
+                    return counts, source_mapping
+
+            version = self._versions.stage(base=self.version)
+            try:
+                path = self._versions.path(version)
+                vectorstore = open_vectorstore(path, self.embeddings)
+                source_index = SourceIndex.load(path, vectorstore)
+                counts, source_mapping = apply_scraped_pages(vectorstore, source_index, scraped_pages, origin=origin)
+                counts["pruned"] = len(prune_sources(vectorstore, source_index, keep_urls)) if pruning else 0
+                vectorstore.persist()
+                source_index.save()
+            except Exception:
+                self._versions.discard(version)
+                raise
+            self._versions.publish(version)
+            self._swap(version, vectorstore, source_index)
+            print(f"Published behavioral knowledge base {version}")
+            return counts, source_mapping
+
+    def add_urls(
+        self,
+        urls: List[str],
+        scraped_pages: Optional[List[Dict[str, Any]]] = None,
+        origin: str = "search"
+    ) -> Tuple[Chroma, Dict[str, str]]:
+        """Scrape (or reuse scraped_pages for) the URLs and add new or changed pages to the shared store."""
+        self.load()
+        if self.read_only or not urls:
+            if urls:
+                print(f"Knowledge base is read-only in this process; not adding {len(urls)} URLs")
+            return self.get()[0], {}
+        if scraped_pages is None:
+            scraped_pages = scrape_urls(urls, self.source_index.validators(urls))
+        counts, source_mapping = self._write(scraped_pages, origin)
+        print(f"Source refresh: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['failed']} failed.")
+        return self.vectorstore, source_mapping
+
+    def refresh_sources(
+        self,
+        urls: List[str],
+        scraped_pages: Optional[List[Dict[str, Any]]] = None,
+        prune: bool = True
+    ) -> Dict[str, int]:
+        """
+        Re-sync the scheduled source list: unchanged pages are skipped, changed
+        pages replace their old chunks, and (with prune) scheduled sources that
+        are no longer listed are deleted. Returns the per-outcome counts.
+        """
+        self.load()
+        if self.read_only:
+            print("Knowledge base is read-only in this process; skipping source refresh")
+            return {"added": 0, "updated": 0, "unchanged": 0, "failed": 0, "pruned": 0}
+        if scraped_pages is None:
+            scraped_pages = scrape_urls(urls, self.source_index.validators(urls))
+        counts, _ = self._write(scraped_pages, origin="scheduled", keep_urls=urls if prune else None)
+        return counts
+
+    async def aadd_urls(self, urls: List[str]) -> Tuple[Chroma, Dict[str, str]]:
+        """Async counterpart of add_urls: pages are scraped concurrently first."""
+        await asyncio.to_thread(self.load)
+        if self.read_only:
+            return await asyncio.to_thread(self.add_urls, urls)
+        scraped_pages = await ascrape_urls(urls, self.source_index.validators(urls)) if urls else None
+        return await asyncio.to_thread(self.add_urls, urls, scraped_pages)
+
+    def close(self) -> None:
+        """Drop the loaded model and store; the next get() reloads them."""
+        with self._lock:
+            for _, vectorstore in self._opened:
+                release_vectorstore(vectorstore)
+            self._opened = []
+            self.vectorstore = None
+            self.embeddings = None
+            self.source_index = None
+            self.source_mapping = {}
+            self.version = None
+
+knowledge_base = BehavioralKnowledgeBase()
+
+# --- Background enrichment (stale-while-revalidate) ---
+KB_ENRICHMENT_WORKERS = int(os.getenv("KB_ENRICHMENT_WORKERS", "1"))
+KB_ENRICHMENT_QUEUE_SIZE = int(os.getenv("KB_ENRICHMENT_QUEUE_SIZE", "100"))
+# A topic that was just enriched is not searched again for this long
+KB_ENRICHMENT_COOLDOWN_SECONDS = int(os.getenv("KB_ENRICHMENT_COOLDOWN_SECONDS", "3600"))
+
+
+def enrichment_topic(job_description: str) -> str:
+    """
+    De-duplication key for enrichment jobs: JDs mentioning the same role and
+    technologies share a topic. JDs with no known keywords fall back to a hash
+    of their normalized text.
+    """
+    terms = find_jd_terms(job_description)
+    if terms:
+        return " ".join(sorted(terms))
+    normalized = " ".join(job_description.lower().split())
+    return "jd:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
 
-    if vectorstore:
-        if chunks:
-            print(f"Adding {len(chunks)} new or updated chunks to existing ChromaDB.")
-            vectorstore.add_documents(chunks)
-        else:
-            print("No new chunks to add to existing ChromaDB.")
-    else:
-        if chunks:
-            print(f"Creating new ChromaDB with {len(chunks)} chunks.")
-            vectorstore = Chroma.from_documents(
-                chunks,
-                embedding=embeddings,
-                persist_directory=persist_dir
-            )
-        else:
-            print("No chunks to add, cannot create vectorstore.")
-            raise ValueError("No content available to create or update ChromaDB.")
 
-    vectorstore.persist()
-    return vectorstore, source_mapping
+class KnowledgeBaseRefresher:
+    """
+    Runs knowledge-base enrichment (JD -> search query -> Tavily -> scrape ->
+    embed) on background worker threads, so a request that finds too little in
+    the index is answered right away and later requests get the enriched index.
+    A topic that is queued, running or within its cooldown is not enqueued again.
+    """
 
-# --- Conceptual function for periodic update ---
+    def __init__(
+        self,
+        kb: BehavioralKnowledgeBase,
+        workers: int = KB_ENRICHMENT_WORKERS,
+        max_queue: int = KB_ENRICHMENT_QUEUE_SIZE,
+        cooldown_seconds: int = KB_ENRICHMENT_COOLDOWN_SECONDS
+    ):
+        self.kb = kb
+        self.workers = workers
+        self.cooldown_seconds = cooldown_seconds
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=max_queue)
+        self._in_flight: Dict[str, float] = {}   # topic -> enqueued at
+        self._completed: Dict[str, float] = {}   # topic -> finished at
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._counters = {"enqueued": 0, "deduplicated": 0, "dropped": 0, "completed": 0, "failed": 0}
+
+    def start(self) -> None:
+        """Start the worker threads (no-op if already running)."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"kb-enrichment-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Ask the workers to exit after their current job and wait for them."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def enqueue(self, job_description: str) -> bool:
+        """Queue an enrichment job for the JD's topic. Returns False if de-duplicated or dropped."""
+        if self.kb.read_only:
+            # Searching would cost Tavily calls that this process cannot store
+            return False
+        topic = enrichment_topic(job_description)
+        now = time.time()
+        with self._lock:
+            finished_at = self._completed.get(topic)
+            recently_done = finished_at is not None and now - finished_at < self.cooldown_seconds
+            if topic in self._in_flight or recently_done:
+                self._counters["deduplicated"] += 1
+                return False
+            try:
+                self._queue.put_nowait((topic, job_description))
+            except queue.Full:
+                self._counters["dropped"] += 1
+                print(f"Enrichment queue full, dropping job for topic '{topic}'")
+                return False
+            self._in_flight[topic] = now
+            self._counters["enqueued"] += 1
+        self.start()
+        print(f"Queued knowledge base enrichment for topic '{topic}'")
+        return True
+
+    def join(self) -> None:
+        """Block until every queued job has been processed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                topic, job_description = job
+                try:
+                    self._enrich(job_description)
+                    outcome = "completed"
+                except Exception as e:
+                    outcome = "failed"
+                    print(f"Knowledge base enrichment failed for topic '{topic}': {e}")
+                with self._lock:
+                    self._in_flight.pop(topic, None)
+                    self._completed[topic] = time.time()
+                    self._counters[outcome] += 1
+            finally:
+                self._queue.task_done()
+
+    def _enrich(self, job_description: str) -> None:
+        # Background work yields the LLM to interactive requests
+        with llm_request_scope("batch"):
+            search_query = convert_jd_to_search_query(job_description)
+        urls = retrieve_behavioral_urls(search_query)
+        if urls:
+            self.kb.add_urls(urls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "queue_depth": self._queue.qsize(),
+                "in_flight": len(self._in_flight),
+                "workers": len(self._threads),
+            }
+
+
+knowledge_refresher = KnowledgeBaseRefresher(knowledge_base)
+register_stats("kb_enrichment", knowledge_refresher.stats)
+
+# --- Periodic update ---
 def update_behavioral_knowledge_base(
     urls_to_scrape: List[str] = DEFAULT_SCRAPE_SOURCES
 ) -> None:
     """
-    Conceptually updates the behavioral knowledge base.
+    Refresh the behavioral knowledge base from the scheduled source list.
     In a real system, this would be triggered by a scheduler.
-    It scrapes the provided URLs and adds/updates them in the ChromaDB.
+    Only pages whose content hash changed are re-embedded; sources dropped
+    from the list are pruned from the store.
     """
     print(f"Initiating update of behavioral knowledge base from {len(urls_to_scrape)} sources.")
     try:
-        # Load existing vectorstore to check for content freshness
-        vectorstore, _ = setup_chroma_from_urls(urls=[]) # Load existing, don't scrape new URLs yet
-
-        documents_to_add = []
-        for url in urls_to_scrape:
-            scraped_data = scrape_text_with_metadata(url)
-            if scraped_data['success'] and scraped_data['content'].strip():
-                content_hash = hashlib.sha256(scraped_data['content'].encode('utf-8')).hexdigest()
-
-                # Check if this URL/content hash already exists and is fresh enough
-                # This is a simplified check. A more robust solution would query Chroma by source URL.
-                # For now, we'll assume new scrapes are always added, letting Chroma handle some internal deduplication.
-                # A better approach would query existing docs by metadata (e.g., 'source' == url) and compare 'content_hash' and 'last_scraped'
-                # For this iteration, we focus on adding new data.
-                
-                # Check for existing documents from this source to avoid re-adding identical content
-                # Note: Chroma's `get` or `query` by metadata filters are needed for proper "update" logic.
-                # This simple add_documents will add duplicates if content changes slightly.
-                # A true update requires deleting old docs for a URL and adding new ones.
-                
-                doc = Document(
-                    page_content=scraped_data['content'],
-                    metadata={
-                        "source": url,
-                        "domain": scraped_data['domain'],
-                        "title": scraped_data['title'],
-                        "last_scraped": scraped_data['last_scraped'],
-                        "content_hash": content_hash
-                    }
-                )
-                documents_to_add.append(doc)
-            else:
-                print(f"Skipping update for {url} due to scraping failure or empty content.")
-
-        if documents_to_add:
-            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            chunks_to_add = splitter.split_documents(documents_to_add)
-            for chunk in chunks_to_add:
-                chunk_source = chunk.metadata.get('source', 'unknown')
-                chunk.metadata['source_domain'] = get_domain_name(chunk_source) if chunk_source != 'unknown' else 'unknown'
-            
-            # This will add new chunks. For true "update" where content might have changed,
-            # you'd need to delete old chunks associated with the URL before adding new ones.
-            vectorstore.add_documents(chunks_to_add)
-            vectorstore.persist()
-            print(f"Successfully added/updated {len(chunks_to_add)} chunks in the knowledge base.")
-        else:
-            print("No new content to add during knowledge base update.")
+        counts = knowledge_base.refresh_sources(list(urls_to_scrape))
+        print(f"Knowledge base refresh: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['failed']} failed, {counts['pruned']} pruned.")
 
     except Exception as e:
         print(f"Error updating behavioral knowledge base: {e}")
 
 # --- Enhanced behavioral patterns with proper source attribution ---
-def get_behavioral_patterns(job_description: str) -> dict:
-    try:
-        # Ensure the knowledge base is prepared/loaded
-        # We call setup_chroma_from_urls with no URLs initially to just load the existing DB.
-        # The update_behavioral_knowledge_base would be called separately by a scheduler.
-        # For a first run or if DB is empty, setup_chroma_from_urls will add default content.
-        try:
-            vectorstore, source_mapping = setup_chroma_from_urls(urls=[])
-            # If the vectorstore is empty or only contains fallback, attempt a live search
-            if not has_relevant_data(vectorstore, job_description): # Use job_description as query for relevance check
-                print("Existing ChromaDB is empty or lacks relevant data. Performing live search.")
-                search_query = convert_jd_to_search_query(job_description)
-                urls = retrieve_behavioral_urls(search_query)
-                vectorstore, source_mapping = setup_chroma_from_urls(urls) # Build/update with search results
-            else:
-                print("Using existing ChromaDB for behavioral patterns.")
-        except ValueError as ve: # Catch the ValueError from setup_chroma_from_urls if no content
-            print(f"Initial ChromaDB setup failed: {ve}. Attempting live search as primary source.")
-            search_query = convert_jd_to_search_query(job_description)
-            urls = retrieve_behavioral_urls(search_query)
-            vectorstore, source_mapping = setup_chroma_from_urls(urls) # Build/update with search results
-        
-        # At this point, vectorstore and source_mapping should be populated.
-        retriever = vectorstore.as_retriever(search_type="similarity", k=5)
-
-        # Enhanced prompt template with source attribution
-        behavioral_prompt_template = """
+# Enhanced prompt template with source attribution
+BEHAVIORAL_PROMPT_TEMPLATE = """
 You are a helpful interview coach with access to relevant behavioral interview information.
 
 Use the following context from behavioral interview resources to generate relevant questions:
@@ -436,66 +1071,196 @@ Format your response strictly in JSON:
 Important: Output only the JSON object. No preamble or explanation.
 """
 
-        # Create the prompt template with the correct variable names
-        prompt = PromptTemplate(
-            template=behavioral_prompt_template,
-            input_variables=["context", "question"]
-        )
+# Create the prompt template with the correct variable names
+behavioral_prompt = PromptTemplate(
+    template=BEHAVIORAL_PROMPT_TEMPLATE,
+    input_variables=["context", "question"]
+)
+
+# Stuffs the already-retrieved chunks into the prompt; retrieval happens once,
+# in retrieve_behavioral_context, instead of inside the chain.
+behavioral_qa_chain = create_stuff_documents_chain(llm, behavioral_prompt)
+
+class QueryEmbeddingCache:
+    """Per-request memo of query embeddings, so each query text is embedded at most once."""
+
+    def __init__(self):
+        self._vectors: Dict[str, List[float]] = {}
+
+    def embed_query(self, embeddings, text: str) -> List[float]:
+        if text not in self._vectors:
+            self._vectors[text] = embeddings.embed_query(text)
+        return self._vectors[text]
+
+def retrieve_behavioral_context(
+    vectorstore: Chroma,
+    query: str,
+    query_embeddings: Optional[QueryEmbeddingCache] = None,
+    k: int = 5
+) -> List[Tuple[Document, float]]:
+    """
+    Embed the query (reusing query_embeddings if given) and return the top-k chunks
+    with their distance scores. The result feeds the relevance check, the prompt
+    context and source attribution.
+    """
+    if query_embeddings is None:
+        query_embeddings = QueryEmbeddingCache()
+    with external_span("query_embedding"):
+        embedding = query_embeddings.embed_query(vectorstore.embeddings, query)
+    with external_span("chroma_query"):
+        return vectorstore.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
+
+def attribute_sources(parsed_result: dict, retrieved_docs: List[Document]) -> dict:
+    """Replace generic 'web_search_results' sources with domains of the retrieved documents."""
+    if 'questions' in parsed_result:
+        # Get unique domains from the actual retrieved documents
+        unique_retrieved_domains = list(set([d.metadata.get('source_domain', 'web_search_results') for d in retrieved_docs]))
+
+        for i, question in enumerate(parsed_result['questions']):
+            # If LLM defaulted to 'web_search_results', try to assign a more specific domain from retrieved docs
+            if question.get('source') == 'web_search_results' and unique_retrieved_domains:
+                question['source'] = unique_retrieved_domains[i % len(unique_retrieved_domains)] # Cycle through available domains
+    return parsed_result
+
+def extract_behavioral_json(result: str) -> Optional[dict]:
+    """Parse the LLM output as JSON, or the outermost {...} inside it; None if neither works."""
+    # Try to parse as JSON
+    try:
+        return json.loads(result.strip()) # .strip() for robustness
+    except json.JSONDecodeError:
+        print("Failed to parse JSON, trying to extract it")
+        # Try to find JSON in the response
+        result_str = str(result)
+        start = result_str.find('{')
+        end = result_str.rfind('}')
+        if start != -1 and end != -1:
+            try:
+                return json.loads(result_str[start:end+1].strip())
+            except Exception as ex:
+                print(f"Could not extract or parse JSON substring: {ex}")
+        return None
+
+# --- Semantic cache of generated question sets ---
+# Near-identical JDs (reposts, the same template with another location) reuse
+# the questions generated for the first one instead of calling the LLM again.
+behavioral_cache = create_semantic_cache()
+if behavioral_cache is not None:
+    register_stats("behavioral_cache", behavioral_cache.stats)
+
+def semantic_cache_namespace(embeddings) -> str:
+    """Entries are only comparable when made with the same embedding model and LLM."""
+    model = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None) or type(embeddings).__name__
+    return f"{model}|{LLM_MODEL}"
+
+def lookup_cached_patterns(embeddings, job_description: str, query_embeddings: QueryEmbeddingCache) -> Optional[dict]:
+    """Return cached questions for a near-identical JD, embedding the JD once for this request."""
+    if behavioral_cache is None:
+        return None
+    with external_span("query_embedding"):
+        vector = query_embeddings.embed_query(embeddings, job_description)
+    hit = behavioral_cache.lookup(vector, semantic_cache_namespace(embeddings))
+    if hit is None:
+        return None
+    patterns, similarity = hit
+    print(f"Semantic cache hit for behavioral questions (similarity {similarity:.3f})")
+    return patterns
+
+def cache_patterns(embeddings, job_description: str, query_embeddings: QueryEmbeddingCache, patterns: dict) -> None:
+    if behavioral_cache is None:
+        return
+    vector = query_embeddings.embed_query(embeddings, job_description)
+    behavioral_cache.update(job_description, vector, patterns, semantic_cache_namespace(embeddings))
+
+def indexed_docs(retrieved: List[Tuple[Document, float]]) -> List[Document]:
+    """Retrieved documents that came from scraped pages rather than system default content."""
+    return [doc for doc, _ in retrieved if doc.metadata.get('source') not in SYSTEM_SOURCES]
+
+@coalesced("behavioral_patterns")
+def get_behavioral_patterns(job_description: str) -> dict:
+    try:
+        # The job description is embedded once and searched once.
+        query_embeddings = QueryEmbeddingCache()
+        # Use the process-wide knowledge base, loaded once at API startup.
+        # The update_behavioral_knowledge_base would be called separately by a scheduler.
+        vectorstore, source_mapping = knowledge_base.get()
+        cached = lookup_cached_patterns(vectorstore.embeddings, job_description, query_embeddings)
+        if cached is not None:
+            return cached
+
+        retrieved = retrieve_behavioral_context(vectorstore, job_description, query_embeddings)
+        # Too little indexed for this JD: answer with what we have now and let the
+        # background refresher search, scrape and embed for the next request.
+        relevant = has_relevant_data(vectorstore, job_description, retrieved=retrieved)
+        if not relevant:
+            print("Existing ChromaDB lacks relevant data. Queuing background enrichment.")
+            knowledge_refresher.enqueue(job_description)
+            if not indexed_docs(retrieved):
+                return get_fallback_questions_for_role(job_description, source_mapping)
+        else:
+            print("Using existing ChromaDB for behavioral patterns.")
 
-        # Create the RetrievalQA chain
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=llm,
-            chain_type="stuff",
-            retriever=retriever,
-            chain_type_kwargs={"prompt": prompt}
-        )
+        retrieved_docs = [doc for doc, _ in retrieved]
 
-        # Run the chain with the job description
-        result = qa_chain.run(job_description)
+        # Run the chain with the job description and the retrieved context
+        result = behavioral_qa_chain.invoke({"context": retrieved_docs, "question": job_description})
         print(f"Raw LLM result: {result}")
 
-        # Try to parse as JSON
-        try:
-            parsed_result = json.loads(result.strip()) # .strip() for robustness
-            # Enhance source attribution with actual domains if available
-            if 'questions' in parsed_result:
-                # Get unique domains from the actual retrieved documents
-                retrieved_docs = retriever.get_relevant_documents(job_description)
-                unique_retrieved_domains = list(set([d.metadata.get('source_domain', 'web_search_results') for d in retrieved_docs]))
-                
-                for i, question in enumerate(parsed_result['questions']):
-                    # If LLM defaulted to 'web_search_results', try to assign a more specific domain from retrieved docs
-                    if question.get('source') == 'web_search_results' and unique_retrieved_domains:
-                        question['source'] = unique_retrieved_domains[i % len(unique_retrieved_domains)] # Cycle through available domains
-            return parsed_result
-        except json.JSONDecodeError:
-            print("Failed to parse JSON, trying to extract it")
-            # Try to find JSON in the response
-            result_str = str(result)
-            start = result_str.find('{')
-            end = result_str.rfind('}')
-            if start != -1 and end != -1:
-                try:
-                    extracted_json = json.loads(result_str[start:end+1].strip())
-                    # Apply source attribution logic here too
-                    if 'questions' in extracted_json:
-                        retrieved_docs = retriever.get_relevant_documents(job_description)
-                        unique_retrieved_domains = list(set([d.metadata.get('source_domain', 'web_search_results') for d in retrieved_docs]))
-                        for i, question in enumerate(extracted_json['questions']):
-                            if question.get('source') == 'web_search_results' and unique_retrieved_domains:
-                                question['source'] = unique_retrieved_domains[i % len(unique_retrieved_domains)]
-                    return extracted_json
-                except Exception as ex:
-                    print(f"Could not extract or parse JSON substring: {ex}")
-
+        parsed_result = extract_behavioral_json(result)
+        if parsed_result is None:
             print("Could not extract JSON, returning fallback")
             return get_fallback_questions_for_role(job_description, source_mapping)
+        patterns = attribute_sources(parsed_result, retrieved_docs)
+        # Answers built from a thin index are not cached; enrichment will improve them
+        if relevant:
+            cache_patterns(vectorstore.embeddings, job_description, query_embeddings, patterns)
+        return patterns
 
     except Exception as e:
         print(f"Error in get_behavioral_patterns: {e}")
         # Pass source_mapping if available, otherwise an empty dict
         return get_fallback_questions_for_role(job_description, source_mapping if 'source_mapping' in locals() else {})
 
+@coalesced("behavioral_patterns")
+async def aget_behavioral_patterns(job_description: str) -> dict:
+    """
+    Async counterpart of get_behavioral_patterns. The LLM call is awaited;
+    Chroma access runs in a worker thread and enrichment is left to the refresher.
+    """
+    try:
+        query_embeddings = QueryEmbeddingCache()
+        vectorstore, source_mapping = await asyncio.to_thread(knowledge_base.get)
+        cached = await asyncio.to_thread(lookup_cached_patterns, vectorstore.embeddings, job_description, query_embeddings)
+        if cached is not None:
+            return cached
+
+        retrieved = await asyncio.to_thread(retrieve_behavioral_context, vectorstore, job_description, query_embeddings)
+        relevant = has_relevant_data(vectorstore, job_description, retrieved=retrieved)
+        if not relevant:
+            print("Existing ChromaDB lacks relevant data. Queuing background enrichment.")
+            knowledge_refresher.enqueue(job_description)
+            if not indexed_docs(retrieved):
+                return get_fallback_questions_for_role(job_description, source_mapping)
+        else:
+            print("Using existing ChromaDB for behavioral patterns.")
+
+        retrieved_docs = [doc for doc, _ in retrieved]
+
+        result = await behavioral_qa_chain.ainvoke({"context": retrieved_docs, "question": job_description})
+        print(f"Raw LLM result: {result}")
+
+        parsed_result = extract_behavioral_json(result)
+        if parsed_result is None:
+            print("Could not extract JSON, returning fallback")
+            return get_fallback_questions_for_role(job_description, source_mapping)
+        patterns = attribute_sources(parsed_result, retrieved_docs)
+        if relevant:
+            await asyncio.to_thread(cache_patterns, vectorstore.embeddings, job_description, query_embeddings, patterns)
+        return patterns
+
+    except Exception as e:
+        print(f"Error in get_behavioral_patterns: {e}")
+        return get_fallback_questions_for_role(job_description, source_mapping if 'source_mapping' in locals() else {})
+
 def get_fallback_questions_for_role(job_description: str, source_mapping: Dict[str, str] = {}) -> dict:
     """
     Generate role-specific fallback questions with proper source attribution.
@@ -541,21 +1306,30 @@ def get_fallback_questions_for_role(job_description: str, source_mapping: Dict[s
     # Default fallback for other roles
     return get_fallback_questions(source_attribution)
 
-def has_relevant_data(vectorstore: Chroma, query: str, min_docs: int = 2) -> bool:
+def has_relevant_data(
+    vectorstore: Chroma,
+    query: str,
+    min_docs: int = 2,
+    retrieved: Optional[List[Tuple[Document, float]]] = None,
+    max_distance: Optional[float] = None
+) -> bool:
     """
     Check if the vectorstore contains a reasonable number of relevant documents for the given query,
     excluding only system default/fallback content.
+    Pass the output of retrieve_behavioral_context as retrieved to avoid searching again;
+    max_distance optionally drops matches whose distance score is too large.
     """
     if not vectorstore:
         return False
     try:
-        retriever = vectorstore.as_retriever(search_type="similarity", k=5) # Search for a few documents
-        results = retriever.get_relevant_documents(query)
+        if retrieved is None:
+            retrieved = retrieve_behavioral_context(vectorstore, query)
         
         # Filter out system default/fallback documents
         actual_relevant_docs = [
-            doc for doc in results
-            if doc.metadata.get('source') not in ['system_default', 'system_fallback']
+            doc for doc, score in retrieved
+            if doc.metadata.get('source') not in SYSTEM_SOURCES
+            and (max_distance is None or score <= max_distance)
         ]
         return len(actual_relevant_docs) >= min_docs
     except Exception as e:
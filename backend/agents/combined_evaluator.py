@@ -0,0 +1,123 @@
+# 📄 File: backend/agents/combined_evaluator.py
+# Fast evaluation mode: mock interview scores, outcome reason and improvement
+# plan from one LLM call instead of three sequential ones.
+
+import json
+import asyncio
+from typing import List, Optional
+from pydantic import BaseModel
+from langchain.prompts import PromptTemplate
+from langchain.output_parsers import PydanticOutputParser
+from llm_client import llm
+from agents.mock_evaluator import InterviewScores
+from agents.outcome_predictor import (
+    compute_outcome_inputs,
+    final_success_score,
+    template_reason,
+    wants_llm_reason
+)
+from agents.gap_fixer import (
+    ImprovementPlan,
+    finalize_improvement_plan,
+    get_learning_resource_urls,
+    aget_learning_resource_urls
+)
+
+COMBINED_PROMPT = """
+You are an AI interview coach completing a full interview evaluation in one pass.
+
+Resume scores: {resume_scores}
+Interview question: {question}
+Candidate response: {response}
+
+{tasks}
+
+Respond in strict JSON format matching this Pydantic schema:
+{format_instructions}
+"""
+
+SCORES_TASK = """Evaluate the candidate response on tone (confident, enthusiastic, professional),
+   confidence (sure of their experience and delivery) and relevance (aligned with
+   the question), each scored out of 100, with 2-3 actionable feedback tips."""
+REASON_TASK = """Based on the resume scores and your interview evaluation, write a one-sentence
+   reason justifying a success prediction score (0-100). Focus on strengths and
+   areas for improvement."""
+PLAN_TASK = """Suggest 3 actionable improvement suggestions and 2 personalized learning
+   resources (like courses or websites)."""
+
+class CombinedScoresAndPlan(BaseModel):
+    mock_scores: InterviewScores
+    improvement_plan: ImprovementPlan
+
+class CombinedEvaluation(CombinedScoresAndPlan):
+    outcome_reason: str
+
+def build_combined_chain(with_reason: bool):
+    """The combined chain; the outcome reason is only asked for when the LLM should write it."""
+    tasks = [SCORES_TASK, REASON_TASK, PLAN_TASK] if with_reason else [SCORES_TASK, PLAN_TASK]
+    parser = PydanticOutputParser(pydantic_object=CombinedEvaluation if with_reason else CombinedScoresAndPlan)
+    prompt = PromptTemplate.from_template(COMBINED_PROMPT).partial(
+        tasks="\n".join(f"{i}. {task}" for i, task in enumerate(tasks, 1)),
+        format_instructions=parser.get_format_instructions()
+    )
+    return prompt | llm | parser
+
+combined_chains = {with_reason: build_combined_chain(with_reason) for with_reason in (True, False)}
+
+def build_combined_inputs(resume_scores: dict, question: str, response: str) -> dict:
+    return {
+        "resume_scores": json.dumps(resume_scores),
+        "question": question,
+        "response": response
+    }
+
+def assemble_evaluation(
+    result: CombinedScoresAndPlan,
+    resume_scores: dict,
+    question: str,
+    response: str,
+    behavior_score: int,
+    resource_urls: List[str]
+) -> dict:
+    """Build the mock_scores, outcome and improvement_plan state fields, shaped as the separate agents return them."""
+    # The question and response are filled in here rather than echoed back by the LLM
+    mock_scores = {"question": question, "response": response, **result.mock_scores.model_dump()}
+    success_score = final_success_score(compute_outcome_inputs(resume_scores, mock_scores, behavior_score))
+    if isinstance(result, CombinedEvaluation):
+        reason = result.outcome_reason.strip()
+    else:
+        reason = template_reason(resume_scores, mock_scores, success_score)
+    return {
+        "mock_scores": mock_scores,
+        "outcome": {
+            "success_score": success_score,
+            "reason": reason
+        },
+        "improvement_plan": finalize_improvement_plan(result.improvement_plan, resource_urls)
+    }
+
+def evaluate_combined(
+    resume_scores: dict,
+    question: str,
+    response: str,
+    behavior_score: int,
+    llm_reason: Optional[bool] = None
+) -> dict:
+    """llm_reason as for predict_outcome: otherwise the outcome reason is templated."""
+    result = combined_chains[wants_llm_reason(llm_reason)].invoke(build_combined_inputs(resume_scores, question, response))
+    resource_urls = [get_learning_resource_urls(r.title) for r in result.improvement_plan.resources]
+    return assemble_evaluation(result, resume_scores, question, response, behavior_score, resource_urls)
+
+async def aevaluate_combined(
+    resume_scores: dict,
+    question: str,
+    response: str,
+    behavior_score: int,
+    llm_reason: Optional[bool] = None
+) -> dict:
+    result = await combined_chains[wants_llm_reason(llm_reason)].ainvoke(build_combined_inputs(resume_scores, question, response))
+    # Look up all resource URLs concurrently
+    resource_urls = await asyncio.gather(
+        *(aget_learning_resource_urls(r.title) for r in result.improvement_plan.resources)
+    )
+    return assemble_evaluation(result, resume_scores, question, response, behavior_score, resource_urls)
@@ -1,10 +1,12 @@
 import json
+import asyncio
 from typing import List
 from pydantic import BaseModel, Field, HttpUrl
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain.output_parsers import PydanticOutputParser
 from llm_client import llm  # Gemini/Groq model
+from telemetry import external_span
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain.agents import tool
 # ---- Step 1: Define Pydantic schema ----
@@ -59,40 +61,72 @@ from fastapi.responses import JSONResponse
 # Set up Tavily tool (requires TAVILY_API_KEY in env)
 search_tool = TavilySearchResults(k=1)
 
+def fallback_resource_url(query: str) -> str:
+    return "https://www.google.com/search?q=" + query.replace(" ", "+")
+
 def get_learning_resource_urls(query: str) -> str:
-    results = search_tool.invoke({"query": query})
+    with external_span("tavily_resource_search"):
+        results = search_tool.invoke({"query": query})
     if isinstance(results, list) and len(results) > 0:
         return results[0]["url"]
-    return "https://www.google.com/search?q=" + query.replace(" ", "+")
-def generate_improvement_plan(resume_scores: dict, mock_scores: dict, outcome: dict) -> dict:
-    input_vars = {
+    return fallback_resource_url(query)
+
+async def aget_learning_resource_urls(query: str) -> str:
+    with external_span("tavily_resource_search"):
+        results = await search_tool.ainvoke({"query": query})
+    if isinstance(results, list) and len(results) > 0:
+        return results[0]["url"]
+    return fallback_resource_url(query)
+
+def build_gap_fixer_inputs(resume_scores: dict, mock_scores: dict, outcome: dict) -> dict:
+    return {
         "resume_scores": json.dumps(resume_scores),
         "mock_scores": json.dumps(mock_scores),
         "outcome_score": outcome["success_score"],
         "outcome_reason": outcome["reason"]
     }
 
+def finalize_improvement_plan(plan: ImprovementPlan, resource_urls: List[str]) -> dict:
+    enriched_resources = [
+        Resource(title=r.title, link=url) for r, url in zip(plan.resources, resource_urls)
+    ]
+
+    # Replace with enriched resources
+    final_response = ImprovementResponse(
+        improvement_plan=ImprovementPlan(
+            suggestions=plan.suggestions,
+            resources=enriched_resources
+        )
+    )
+
+    return final_response.model_dump()
+
+def generate_improvement_plan(resume_scores: dict, mock_scores: dict, outcome: dict) -> dict:
+    input_vars = build_gap_fixer_inputs(resume_scores, mock_scores, outcome)
+
     try:
         result = gap_fixer_chain.invoke(input_vars)
         plan = result.improvement_plan
 
         # Fetch real URLs for resources using Tavily
-        enriched_resources = []
-        for r in plan.resources:
-            search_url = get_learning_resource_urls(r.title)
-            enriched_resources.append(Resource(title=r.title, link=search_url))
-
-        # Replace with enriched resources
-        final_response = ImprovementResponse(
-            improvement_plan=ImprovementPlan(
-                suggestions=plan.suggestions,
-                resources=enriched_resources
-            )
-        )
+        resource_urls = [get_learning_resource_urls(r.title) for r in plan.resources]
 
-        return final_response.model_dump()
+        return finalize_improvement_plan(plan, resource_urls)
     except Exception as e:
         raise ValueError(f"Failed to parse or enrich LLM output: {e}")
 
+async def agenerate_improvement_plan(resume_scores: dict, mock_scores: dict, outcome: dict) -> dict:
+    input_vars = build_gap_fixer_inputs(resume_scores, mock_scores, outcome)
+
+    try:
+        result = await gap_fixer_chain.ainvoke(input_vars)
+        plan = result.improvement_plan
 
+        # Look up all resource URLs concurrently
+        resource_urls = await asyncio.gather(
+            *(aget_learning_resource_urls(r.title) for r in plan.resources)
+        )
 
+        return finalize_improvement_plan(plan, resource_urls)
+    except Exception as e:
+        raise ValueError(f"Failed to parse or enrich LLM output: {e}")
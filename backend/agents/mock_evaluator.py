@@ -2,10 +2,14 @@
 
 # 📄 File: backend/agents/mock_interview_evaluator.py
 
+import os
 import json
+from typing import Dict, List, Tuple
+from pydantic import BaseModel, Field
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from llm_client import llm  # your configured Groq or Gemini model
+from telemetry import record_fallback
 
 # Prompt Template
 EVALUATION_PROMPT = """
@@ -31,15 +35,22 @@ Return your answer in JSON format with the following keys:
 No preamble. No conversational text. Just the JSON.
 """
 
+# --- Configuration (overridable through .env) ---
+# Answers of one submission evaluated at the same time
+MOCK_EVAL_CONCURRENCY = int(os.getenv("MOCK_EVAL_CONCURRENCY", "5"))
+
+# Shape of an evaluation (the JSON the prompt above asks for)
+class InterviewScores(BaseModel):
+    tone: int = Field(ge=0, le=100)
+    confidence: int = Field(ge=0, le=100)
+    relevance: int = Field(ge=0, le=100)
+    feedback: List[str]
+
 # LangChain setup
 evaluation_template = PromptTemplate.from_template(EVALUATION_PROMPT)
 evaluation_chain = LLMChain(llm=llm, prompt=evaluation_template)
 
-def evaluate_mock_response(question: str, response: str) -> dict:
-    raw = evaluation_chain.run({
-        "question": question,
-        "response": response
-    })
+def parse_evaluation(raw: str) -> dict:
     try:
         # Strip whitespace and potential hidden characters before parsing
         return json.loads(raw.strip())
@@ -48,4 +59,89 @@ def evaluate_mock_response(question: str, response: str) -> dict:
         raise ValueError(f"Failed to parse LLM output as JSON: {e}\nRaw output: '{raw}'")
     except Exception as e:
         # Catch any other unexpected errors
-        raise ValueError(f"An unexpected error occurred during LLM output parsing: {e}\nRaw output: '{raw}'")
\ No newline at end of file
+        raise ValueError(f"An unexpected error occurred during LLM output parsing: {e}\nRaw output: '{raw}'")
+
+def evaluate_mock_response(question: str, response: str) -> dict:
+    raw = evaluation_chain.run({
+        "question": question,
+        "response": response
+    })
+    return parse_evaluation(raw)
+
+async def aevaluate_mock_response(question: str, response: str) -> dict:
+    raw = await evaluation_chain.arun({
+        "question": question,
+        "response": response
+    })
+    return parse_evaluation(raw)
+
+def batch_inputs(answers: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    return [{"question": question, "response": response} for question, response in answers]
+
+def collect_evaluations(answers: List[Tuple[str, str]], results: list) -> List[dict]:
+    """
+    Parse batch results in answer order. An answer whose call or JSON failed
+    gets an entry with an "error" instead of scores, so it is visible in the
+    result but left out of the averages.
+    """
+    evaluations = []
+    for (question, response), result in zip(answers, results):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            evaluation = parse_evaluation(result["text"])
+            # The question and response are the submitted ones, not the LLM's echo
+            evaluations.append({**evaluation, "question": question, "response": response})
+        except Exception as e:
+            print(f"Could not evaluate the answer to '{question}': {e}")
+            record_fallback("mock_evaluation_answer")
+            evaluations.append({"question": question, "response": response, "error": str(e)})
+    if all("error" in evaluation for evaluation in evaluations):
+        raise ValueError("No answer could be evaluated")
+    return evaluations
+
+def evaluate_mock_responses(answers: List[Tuple[str, str]]) -> List[dict]:
+    """
+    Evaluate several (question, response) pairs, at most MOCK_EVAL_CONCURRENCY
+    at a time, so N answers take about as long as one rather than N times as long.
+    """
+    results = evaluation_chain.batch(
+        batch_inputs(answers),
+        config={"max_concurrency": MOCK_EVAL_CONCURRENCY},
+        return_exceptions=True
+    )
+    return collect_evaluations(answers, results)
+
+async def aevaluate_mock_responses(answers: List[Tuple[str, str]]) -> List[dict]:
+    results = await evaluation_chain.abatch(
+        batch_inputs(answers),
+        config={"max_concurrency": MOCK_EVAL_CONCURRENCY},
+        return_exceptions=True
+    )
+    return collect_evaluations(answers, results)
+
+def aggregate_mock_scores(evaluations: List[dict]) -> dict:
+    """
+    Combine per-answer evaluations into one mock_scores dict: tone, confidence
+    and relevance are averaged over the answers that were evaluated, feedback
+    is merged without repeats and every answer's evaluation (or error) is kept
+    under "answers". Only tone, confidence and relevance are numeric, since
+    outcome prediction averages every number in mock_scores.
+    """
+    def mean(key: str) -> int:
+        values = [e[key] for e in evaluations if isinstance(e.get(key), (int, float))]
+        return round(sum(values) / len(values)) if values else 0
+
+    feedback = []
+    for evaluation in evaluations:
+        for tip in evaluation.get("feedback") or []:
+            if tip not in feedback:
+                feedback.append(tip)
+
+    return {
+        "tone": mean("tone"),
+        "confidence": mean("confidence"),
+        "relevance": mean("relevance"),
+        "feedback": feedback,
+        "answers": evaluations
+    }
@@ -1,6 +1,8 @@
 # 📄 File: backend/agents/predict_outcome.py
 
+import os
 import json
+from typing import Optional
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from llm_client import llm  # Your Gemini or Groq LLM
@@ -18,27 +20,128 @@ Generate a one-sentence reason justifying a success prediction score (0–100).
 No preamble. Output only the justification sentence.
 """
 
+# --- Configuration (overridable through .env) ---
+# Write the outcome reason with the LLM instead of the score template. Requests
+# can still opt in (or out) individually; /explain-outcome produces it on demand.
+OUTCOME_LLM_REASON = os.getenv("OUTCOME_LLM_REASON", "false").lower() == "true"
+
+# Lower bound of each success score band, highest first
+SCORE_BANDS = [
+    (80, "Strong"),
+    (65, "Good"),
+    (50, "Moderate"),
+    (0, "Low")
+]
+
+# Sub-scores on the 0-100 scale, the only ones the reason template ranks
+# (the resume's experience score is a count of years)
+RANKED_SUB_SCORES = {
+    "resume": ("clarity", "relevance", "structure"),
+    "interview": ("tone", "confidence", "relevance")
+}
+
 template = PromptTemplate.from_template(PREDICTOR_PROMPT)
 predictor_chain = LLMChain(llm=llm, prompt=template)
 
-def predict_outcome(resume_scores: dict, mock_scores: dict, behavior_score: int) -> dict:
+def compute_outcome_inputs(resume_scores: dict, mock_scores: dict, behavior_score: int) -> dict:
     # Safely compute averages
     def safe_avg(score_dict):
         values = [v for v in score_dict.values() if isinstance(v, (int, float))]
         return sum(values) / len(values) if values else 0
 
-    resume_avg = safe_avg(resume_scores)
-    mock_avg = safe_avg(mock_scores)
+    return {
+        "resume_avg": safe_avg(resume_scores),
+        "mock_avg": safe_avg(mock_scores),
+        "behavior_score": behavior_score
+    }
+
+def final_success_score(inputs: dict) -> int:
+    return round(0.4 * inputs["resume_avg"] + 0.4 * inputs["mock_avg"] + 0.2 * inputs["behavior_score"])
 
-    final_score = round(0.4 * resume_avg + 0.4 * mock_avg + 0.2 * behavior_score)
+def score_band(score: float) -> str:
+    for lower_bound, band in SCORE_BANDS:
+        if score >= lower_bound:
+            return band
+    return SCORE_BANDS[-1][1]
 
-    justification = predictor_chain.run({
-        "resume_avg": resume_avg,
-        "mock_avg": mock_avg,
-        "behavior_score": behavior_score
-    })
+def labelled_sub_scores(resume_scores: dict, mock_scores: dict) -> dict:
+    """The RANKED_SUB_SCORES present, keyed by a readable label, e.g. "resume clarity" or "interview tone"."""
+    labelled = {}
+    for prefix, scores in (("resume", resume_scores), ("interview", mock_scores)):
+        for key in RANKED_SUB_SCORES[prefix]:
+            value = (scores or {}).get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                labelled[f"{prefix} {key}"] = value
+    return labelled
+
+def template_reason(resume_scores: dict, mock_scores: dict, success_score: int) -> str:
+    """One-sentence justification from the score band and the strongest and weakest sub-scores."""
+    band = score_band(success_score)
+    sub_scores = labelled_sub_scores(resume_scores, mock_scores)
+    if not sub_scores:
+        return f"{band} overall outlook with a predicted success score of {success_score}/100."
+
+    strongest = max(sub_scores, key=sub_scores.get)
+    weakest = min(sub_scores, key=sub_scores.get)
+    if sub_scores[strongest] == sub_scores[weakest]:
+        return (
+            f"{band} overall outlook ({success_score}/100) with evenly matched scores "
+            f"of {sub_scores[strongest]:g} across the resume and interview."
+        )
+    return (
+        f"{band} overall outlook ({success_score}/100): {strongest} is the strongest area "
+        f"({sub_scores[strongest]:g}), while {weakest} ({sub_scores[weakest]:g}) "
+        f"offers the most room for improvement."
+    )
+
+def generate_llm_reason(resume_scores: dict, mock_scores: dict, behavior_score: int) -> str:
+    inputs = compute_outcome_inputs(resume_scores, mock_scores, behavior_score)
+    return predictor_chain.run(inputs).strip()
+
+async def agenerate_llm_reason(resume_scores: dict, mock_scores: dict, behavior_score: int) -> str:
+    inputs = compute_outcome_inputs(resume_scores, mock_scores, behavior_score)
+    return (await predictor_chain.arun(inputs)).strip()
+
+def wants_llm_reason(llm_reason: Optional[bool] = None) -> bool:
+    """Whether the reason is written by the LLM: the request's choice, else OUTCOME_LLM_REASON."""
+    return llm_reason if llm_reason is not None else OUTCOME_LLM_REASON
+
+def predict_outcome(
+    resume_scores: dict,
+    mock_scores: dict,
+    behavior_score: int,
+    llm_reason: Optional[bool] = None
+) -> dict:
+    """
+    llm_reason: write the reason with the LLM (one extra call) instead of the
+    score template. None uses OUTCOME_LLM_REASON.
+    """
+    success_score = final_success_score(compute_outcome_inputs(resume_scores, mock_scores, behavior_score))
+
+    if wants_llm_reason(llm_reason):
+        justification = generate_llm_reason(resume_scores, mock_scores, behavior_score)
+    else:
+        justification = template_reason(resume_scores, mock_scores, success_score)
+
+    return {
+        "success_score": success_score,
+        "reason": justification
+    }
+
+async def apredict_outcome(
+    resume_scores: dict,
+    mock_scores: dict,
+    behavior_score: int,
+    llm_reason: Optional[bool] = None
+) -> dict:
+    success_score = final_success_score(compute_outcome_inputs(resume_scores, mock_scores, behavior_score))
+
+    if wants_llm_reason(llm_reason):
+        justification = await agenerate_llm_reason(resume_scores, mock_scores, behavior_score)
+    else:
+        justification = template_reason(resume_scores, mock_scores, success_score)
 
     return {
-        "success_score": final_score,
-        "reason": justification.strip()
+        "success_score": success_score,
+        "reason": justification
     }
@@ -1,8 +1,13 @@
 import os
 import json
+import asyncio
+import io
+import hashlib
+import threading
+from collections import OrderedDict
 import pdfplumber
 import docx2txt
-from typing import List
+from typing import List, Optional, Union, BinaryIO
 from pydantic import BaseModel
 from llm_client import llm
 from langchain_core.prompts import PromptTemplate
@@ -25,15 +30,68 @@ class ResumeScore(BaseModel):
 # Resume Extraction
 # ----------------------------
 
-def extract_resume_text(file_path: str) -> str:
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".pdf":
-        with pdfplumber.open(file_path) as pdf:
-            return "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-    elif ext == ".docx":
-        return docx2txt.process(file_path)
-    else:
+# Extracted text keyed by SHA-256 of the uploaded bytes, so the same resume
+# sent to several endpoints or for several JDs is only parsed once
+RESUME_TEXT_CACHE_SIZE = int(os.getenv("RESUME_TEXT_CACHE_SIZE", "256"))
+_resume_text_cache: "OrderedDict[str, str]" = OrderedDict()
+_resume_text_cache_lock = threading.Lock()
+
+SUPPORTED_RESUME_EXTENSIONS = (".pdf", ".docx")
+
+def _resume_ext(name: str) -> str:
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in SUPPORTED_RESUME_EXTENSIONS:
         raise ValueError("Unsupported file type. Only PDF and DOCX are allowed.")
+    return ext
+
+def _extract_text_uncached(source: Union[str, BinaryIO], ext: str) -> str:
+    # Both pdfplumber and docx2txt accept a path or a binary file-like object
+    if ext == ".pdf":
+        with pdfplumber.open(source) as pdf:
+            # extract_text() is the expensive step, so call it once per page
+            page_texts = (page.extract_text() for page in pdf.pages)
+            return "\n".join(text for text in page_texts if text)
+    return docx2txt.process(source)
+
+def _cached_extract(cache_key: str, source: Union[str, BinaryIO], ext: str) -> str:
+    with _resume_text_cache_lock:
+        if cache_key in _resume_text_cache:
+            _resume_text_cache.move_to_end(cache_key)
+            return _resume_text_cache[cache_key]
+
+    text = _extract_text_uncached(source, ext)
+
+    with _resume_text_cache_lock:
+        _resume_text_cache[cache_key] = text
+        while len(_resume_text_cache) > RESUME_TEXT_CACHE_SIZE:
+            _resume_text_cache.popitem(last=False)
+    return text
+
+def extract_resume_text(file_path: str) -> str:
+    ext = _resume_ext(file_path)
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return _cached_extract(digest.hexdigest() + ext, file_path, ext)
+
+def extract_resume_text_from_bytes(content: bytes, filename: str) -> str:
+    """Extract text straight from an in-memory upload, without writing it to disk."""
+    ext = _resume_ext(filename)
+    cache_key = hashlib.sha256(content).hexdigest() + ext
+    return _cached_extract(cache_key, io.BytesIO(content), ext)
+
+def read_resume_text(
+    file_path: Optional[str] = None,
+    content: Optional[bytes] = None,
+    filename: Optional[str] = None
+) -> str:
+    """Extract resume text from in-memory content if given, otherwise from file_path."""
+    if content is not None:
+        return extract_resume_text_from_bytes(content, filename or "")
+    return extract_resume_text(file_path)
 
 # ----------------------------
 # LLM Chain Setup
@@ -47,16 +105,40 @@ chain = prompt | llm
 # Resume Analyzer Agent
 # ----------------------------
 
-def analyze_resume(file_path: str, job_description: str) -> ResumeScore:
-    resume_text = extract_resume_text(file_path)
+def parse_resume_score(result: str) -> ResumeScore:
+    try:
+        parsed = ResumeScore(**json.loads(result))
+        return parsed
+    except Exception as e:
+        raise ValueError(f"Failed to parse output: {e}\nRaw output:\n{result}")
+
+def analyze_resume(
+    file_path: Optional[str],
+    job_description: str,
+    content: Optional[bytes] = None,
+    filename: Optional[str] = None
+) -> ResumeScore:
+    resume_text = read_resume_text(file_path, content, filename)
 
     result = chain.invoke({
         "resume_text": resume_text,
         "job_description": job_description
     }).content
 
-    try:
-        parsed = ResumeScore(**json.loads(result))
-        return parsed
-    except Exception as e:
-        raise ValueError(f"Failed to parse output: {e}\nRaw output:\n{result}")
+    return parse_resume_score(result)
+
+async def aanalyze_resume(
+    file_path: Optional[str],
+    job_description: str,
+    content: Optional[bytes] = None,
+    filename: Optional[str] = None
+) -> ResumeScore:
+    # pdfplumber is CPU-bound, keep it off the event loop
+    resume_text = await asyncio.to_thread(read_resume_text, file_path, content, filename)
+
+    result = (await chain.ainvoke({
+        "resume_text": resume_text,
+        "job_description": job_description
+    })).content
+
+    return parse_resume_score(result)
@@ -1,12 +1,19 @@
 from fastapi import FastAPI, UploadFile, File, Form, Request
-from fastapi.responses import JSONResponse
+from typing import List, Optional
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import tempfile
 import os
+import sys
+import asyncio
 
 from pydantic import BaseModel, HttpUrl # Import HttpUrl
-from graph.workflow import build_graph
-from models import InterviewState
+from models import InterviewState, RESUME_INPUT_FIELDS, REQUEST_INPUT_FIELDS
+from telemetry import render_metrics
+from llm_scheduler import llm_request_scope, LLM_BATCH_REQUEST_CONCURRENCY
+from warmup import Warmup, WARMUP_ON_STARTUP
+# graph/agents (langchain, langgraph, chromadb, newspaper, ...) are imported by
+# the background warm-up below, not at module load, so the port binds quickly
 # from pydantic.json import pydantic_encoder # We'll handle this more explicitly or let model_dump do its job
 import json # Ensure json is imported
 
@@ -20,31 +27,248 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global graph instance (compile once, reuse many times)
+# Global graph instances (compile once, reuse many times)
 interview_graph = None
+candidate_graph = None
+
+def import_agents():
+    """Import the graph and, through it, every agent and its clients."""
+    import graph.workflow  # noqa: F401
+
+def build_graphs():
+    global interview_graph, candidate_graph
+    from graph.workflow import build_graph, build_candidate_graph
+    interview_graph = build_graph()
+    candidate_graph = build_candidate_graph()
+    print("Interview evaluation graph initialized successfully")
+
+def load_knowledge_base():
+    # Load the embedding model and vectorstore once; all requests share them
+    from agents.behavioral_retriever import knowledge_base
+    knowledge_base.load()
+
+def start_refresher():
+    # Live search for poorly covered JDs happens here, off the request path
+    from agents.behavioral_retriever import knowledge_refresher
+    knowledge_refresher.start()
+
+warmup = Warmup([
+    ("import_agents", import_agents, True),
+    ("build_graphs", build_graphs, True),
+    ("load_knowledge_base", load_knowledge_base, False),
+    ("start_refresher", start_refresher, False),
+])
+
+async def ensure_warm(steps: Optional[List[str]] = None):
+    """
+    Wait for the warm-up, or only for the steps an endpoint depends on;
+    returns a 503 response if it failed, else None.
+    """
+    if await warmup.wait_ready(steps):
+        return None
+    return JSONResponse(
+        content={"error": "Interview evaluation system failed to initialize", "warmup": warmup.progress()},
+        status_code=503
+    )
+
+# Batch evaluation limits
+BATCH_MAX_CANDIDATES = int(os.getenv("BATCH_MAX_CANDIDATES", "500"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Question/answer pairs accepted in one evaluation request
+MAX_ANSWERS = int(os.getenv("MAX_ANSWERS", "10"))
+
+# Upload handling: resumes are kept in memory and only spilled to a temp file
+# above UPLOAD_SPILL_THRESHOLD_BYTES; anything above MAX_UPLOAD_BYTES is rejected
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_SPILL_THRESHOLD_BYTES = int(os.getenv("UPLOAD_SPILL_THRESHOLD_BYTES", str(2 * 1024 * 1024)))
+UPLOAD_READ_CHUNK_BYTES = 64 * 1024
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES"""
+
+def resume_filename_for(filename):
+    """Normalize the upload name so its extension is one the pipeline understands (default .pdf)"""
+    suffix = ".pdf"  # default
+    stem = "resume"
+    if filename:
+        stem, file_ext = os.path.splitext(filename)
+        if file_ext.lower() in ['.pdf', '.doc', '.docx', '.txt']:
+            suffix = file_ext.lower()
+    return f"{stem or 'resume'}{suffix}"
+
+async def read_resume_upload(resume: UploadFile):
+    """
+    Read the upload in chunks and return (content, spill_path).
+    Small uploads stay in memory (spill_path is None); once the size passes
+    UPLOAD_SPILL_THRESHOLD_BYTES the data is streamed to a temp file and its
+    path is returned instead (content is None). The caller removes spill_path.
+    """
+    if resume.size is not None and resume.size > MAX_UPLOAD_BYTES:
+        raise UploadTooLargeError(f"Resume exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes")
+
+    buffer = bytearray()
+    spill = None
+    size = 0
+    try:
+        while True:
+            chunk = await resume.read(UPLOAD_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError(f"Resume exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes")
+            if spill is None and size > UPLOAD_SPILL_THRESHOLD_BYTES:
+                spill = tempfile.NamedTemporaryFile(
+                    delete=False, suffix=os.path.splitext(resume_filename_for(resume.filename))[1]
+                )
+                spill.write(buffer)
+                buffer = bytearray()
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                buffer.extend(chunk)
+    except Exception:
+        if spill is not None:
+            spill.close()
+            os.unlink(spill.name)
+        raise
+
+    if spill is not None:
+        spill.close()
+        return None, spill.name
+    return bytes(buffer), None
+
+# Convert any remaining Pydantic models (including HttpUrl) to dicts/strings
+def recursive_model_dump_and_url_convert(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json") # mode="json" handles HttpUrl automatically
+    elif isinstance(obj, HttpUrl): # Explicitly convert HttpUrl to string
+        return str(obj)
+    elif isinstance(obj, dict):
+        return {k: recursive_model_dump_and_url_convert(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [recursive_model_dump_and_url_convert(i) for i in obj]
+    else:
+        return obj
+
+def serialize_workflow_result(result):
+    """Turn a graph result into a JSON-safe dict without the uploaded resume or request options"""
+    # Convert AddableValuesDict to regular dict and exclude sensitive data
+    response_data = dict(result)
+
+    # Remove sensitive data and the request options, which are not results
+    for field in RESUME_INPUT_FIELDS + REQUEST_INPUT_FIELDS:
+        response_data.pop(field, None)
+
+    return recursive_model_dump_and_url_convert(response_data)
+
+def plan_request(sections: Optional[str]):
+    """
+    Resolve the comma-separated `sections` form field of an evaluation request.
+    Returns (requested fields, or None for the full result; graph to run;
+    whether the candidate response is used). Raises ValueError for unknown names.
+    """
+    if sections is None or not sections.strip():
+        return None, interview_graph, True
+    from graph.workflow import SECTIONS, plan_nodes, build_section_graph
+
+    names = frozenset(name.strip() for name in sections.split(",") if name.strip())
+    nodes = plan_nodes(names)
+    requested = tuple(field for field in SECTIONS if field in names)
+    uses_response = "mock_evaluation" in nodes or "combined_evaluation" in nodes
+    return requested, build_section_graph(names), uses_response
+
+def parse_answers(answers: Optional[str]) -> Optional[List[dict]]:
+    """
+    Parse the `answers` form field: a JSON list whose items are either a
+    response string (answering the behavioral question at the same position)
+    or {"question": ..., "response": ...}. Raises ValueError if malformed.
+    """
+    if answers is None or not answers.strip():
+        return None
+    try:
+        items = json.loads(answers)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"answers must be a JSON list: {e}")
+    if not isinstance(items, list) or not items:
+        raise ValueError("answers must be a non-empty JSON list")
+    if len(items) > MAX_ANSWERS:
+        raise ValueError(f"answers exceeds the maximum of {MAX_ANSWERS}")
+
+    parsed = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"response": item}
+        if not isinstance(item, dict) or not isinstance(item.get("response"), str) or not item["response"].strip():
+            raise ValueError("Each answer needs a non-empty response")
+        if item.get("question") is not None and not isinstance(item["question"], str):
+            raise ValueError("An answer's question must be a string")
+        parsed.append({key: item[key] for key in ("question", "response") if item.get(key)})
+    return parsed
+
+def cleanup_spill_file(path):
+    """Remove a spilled upload, if there is one"""
+    if path and os.path.exists(path):
+        try:
+            os.unlink(path)
+            print(f"Cleaned up temporary file: {path}")
+        except Exception as e:
+            print(f"Failed to clean up temporary file: {e}")
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the graph on startup"""
-    global interview_graph
-    try:
-        interview_graph = build_graph()
-        print("Interview evaluation graph initialized successfully")
-    except Exception as e:
-        print(f"Failed to initialize graph: {e}")
+    """Kick off the warm-up in the background; startup returns so the port binds right away"""
+    if WARMUP_ON_STARTUP:
+        warmup.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background enrichment and release the shared knowledge base and the scraper's connection pool"""
+    # Only touch what the warm-up (or a request) actually loaded
+    if "agents.behavioral_retriever" in sys.modules:
+        from agents.behavioral_retriever import knowledge_base, knowledge_refresher
+        await asyncio.to_thread(knowledge_refresher.stop)
+        knowledge_base.close()
+    if "scraper" in sys.modules:
+        from scraper import page_fetcher
+        await page_fetcher.aclose()
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "Interview Evaluation API is running"}
 
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once the warm-up has finished, 503 with step-by-step progress until then"""
+    progress = warmup.progress()
+    return JSONResponse(content=progress, status_code=200 if progress["ready"] else 503)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: node, LLM and external-call latencies, token usage, fallbacks, cache stats"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.post("/run-interview-evaluation/")
 async def run_pipeline(
     resume: UploadFile = File(...),
     job_description: str = Form(...),
-    candidate_response: str = Form(...)
+    candidate_response: str = Form(""),
+    llm_reason: Optional[bool] = Form(None),
+    sections: Optional[str] = Form(None),
+    answers: Optional[str] = Form(None)
 ):
-    """Run the complete interview evaluation pipeline"""
+    """
+    Run the interview evaluation pipeline.
+    sections (comma-separated, e.g. "resume_scores,outcome") limits the response
+    to those fields and runs only the nodes they depend on. The candidate
+    response is only required when mock_scores are (directly or indirectly).
+    answers (JSON list, see parse_answers) submits several answers instead of
+    candidate_response; they are evaluated concurrently and mock_scores holds
+    their averaged scores plus each evaluation under "answers".
+    """
     temp_resume_path = None
     try:
         print(f"Processing request:")
@@ -59,69 +283,55 @@ async def run_pipeline(
                 status_code=400
             )
 
-        if not candidate_response.strip():
-            return JSONResponse(
-                content={"error": "Candidate response cannot be empty"},
-                status_code=400
-            )
+        # Read the resume in memory (large files spill to a temp file)
+        try:
+            resume_content, temp_resume_path = await read_resume_upload(resume)
+        except UploadTooLargeError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=413)
 
-        # Save resume file temporarily
-        suffix = ".pdf"  # default
-        if resume.filename:
-            file_ext = os.path.splitext(resume.filename)[1].lower()
-            if file_ext in ['.pdf', '.doc', '.docx', '.txt']:
-                suffix = file_ext
+        if temp_resume_path:
+            print(f"Resume spilled to: {temp_resume_path}")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await resume.read()
-            tmp.write(content)
-            temp_resume_path = tmp.name
+        # Requests that arrive during warm-up wait for it
+        not_ready = await ensure_warm()
+        if not_ready is not None:
+            return not_ready
 
-        print(f"Resume saved to: {temp_resume_path}")
+        try:
+            requested, graph, uses_response = plan_request(sections)
+            candidate_answers = parse_answers(answers)
+        except ValueError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=400)
 
-        # Check if graph is initialized
-        if interview_graph is None:
+        if uses_response and not candidate_response.strip() and not candidate_answers:
             return JSONResponse(
-                content={"error": "Interview evaluation system not initialized"},
-                status_code=500
+                content={"error": "Candidate response cannot be empty"},
+                status_code=400
             )
 
         # Create initial state
         state = InterviewState(
             resume_path=temp_resume_path,
+            resume_content=resume_content,
+            resume_filename=resume_filename_for(resume.filename),
             job_description=job_description,
-            candidate_response=candidate_response
+            candidate_response=candidate_response,
+            candidate_answers=candidate_answers,
+            llm_reason=llm_reason
         )
 
         print("Starting interview evaluation workflow...")
 
-        # Run the workflow
-        result = interview_graph.invoke(state)
+        # Run the workflow without blocking the event loop
+        with llm_request_scope("interactive"):
+            result = await graph.ainvoke(state)
 
         print("Workflow completed successfully")
 
-        # Convert AddableValuesDict to regular dict and exclude sensitive data
-        response_data = dict(result)
-
-        # Remove sensitive data
-        if 'resume_path' in response_data:
-            del response_data['resume_path']
-
-        # Convert any remaining Pydantic models (including HttpUrl) to dicts/strings
-        def recursive_model_dump_and_url_convert(obj):
-            if isinstance(obj, BaseModel):
-                return obj.model_dump(mode="json") # mode="json" handles HttpUrl automatically
-            elif isinstance(obj, HttpUrl): # Explicitly convert HttpUrl to string
-                return str(obj)
-            elif isinstance(obj, dict):
-                return {k: recursive_model_dump_and_url_convert(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [recursive_model_dump_and_url_convert(i) for i in obj]
-            else:
-                return obj
-
-        response_json = recursive_model_dump_and_url_convert(response_data)
-        return JSONResponse(content=response_json)
+        response_data = serialize_workflow_result(result)
+        if requested is not None:
+            response_data = {field: response_data.get(field) for field in requested}
+        return JSONResponse(content=response_data)
 
     except Exception as e:
         print(f"Error in pipeline: {e}")
@@ -134,12 +344,186 @@ async def run_pipeline(
 
     finally:
         # Clean up temporary file
-        if temp_resume_path and os.path.exists(temp_resume_path):
-            try:
-                os.unlink(temp_resume_path)
-                print(f"Cleaned up temporary file: {temp_resume_path}")
-            except Exception as e:
-                print(f"Failed to clean up temporary file: {e}")
+        cleanup_spill_file(temp_resume_path)
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(recursive_model_dump_and_url_convert(data))}\n\n"
+
+@app.post("/run-interview-evaluation/stream")
+async def run_pipeline_stream(
+    resume: UploadFile = File(...),
+    job_description: str = Form(...),
+    candidate_response: str = Form(""),
+    llm_reason: Optional[bool] = Form(None),
+    sections: Optional[str] = Form(None),
+    answers: Optional[str] = Form(None)
+):
+    """
+    Streaming variant of /run-interview-evaluation/.
+    Emits a Server-Sent Event per result field (resume_scores, behavioral_patterns,
+    mock_scores, outcome, improvement_plan) as soon as the node producing it
+    finishes, then a final "done" event. Failures are reported as an "error" event.
+    sections and answers work as in /run-interview-evaluation/.
+    """
+    if not job_description.strip():
+        return JSONResponse(
+            content={"error": "Job description cannot be empty"},
+            status_code=400
+        )
+
+    not_ready = await ensure_warm()
+    if not_ready is not None:
+        return not_ready
+
+    try:
+        requested, graph, uses_response = plan_request(sections)
+        candidate_answers = parse_answers(answers)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    if uses_response and not candidate_response.strip() and not candidate_answers:
+        return JSONResponse(
+            content={"error": "Candidate response cannot be empty"},
+            status_code=400
+        )
+
+    # Read the upload before the response starts streaming
+    try:
+        resume_content, temp_resume_path = await read_resume_upload(resume)
+    except UploadTooLargeError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=413)
+
+    state = InterviewState(
+        resume_path=temp_resume_path,
+        resume_content=resume_content,
+        resume_filename=resume_filename_for(resume.filename),
+        job_description=job_description,
+        candidate_response=candidate_response,
+        candidate_answers=candidate_answers,
+        llm_reason=llm_reason
+    )
+
+    async def event_stream():
+        try:
+            with llm_request_scope("interactive"):
+                async for chunk in graph.astream(state, stream_mode="updates"):
+                    for node_name, update in chunk.items():
+                        for field, value in (update or {}).items():
+                            if field in RESUME_INPUT_FIELDS:
+                                continue
+                            if requested is not None and field not in requested:
+                                continue
+                            yield sse_event(field, {"node": node_name, "value": value})
+            yield sse_event("done", {})
+        except Exception as e:
+            print(f"Error in streaming pipeline: {e}")
+            yield sse_event("error", {"error": f"Internal server error: {str(e)}"})
+        finally:
+            cleanup_spill_file(temp_resume_path)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/run-batch-evaluation/")
+async def run_batch_pipeline(
+    job_description: str = Form(...),
+    resumes: List[UploadFile] = File(...),
+    candidate_responses: List[str] = Form(...),
+    llm_reason: Optional[bool] = Form(None)
+):
+    """
+    Evaluate many candidates against one job description.
+    resumes[i] is paired with candidate_responses[i]. Behavioral patterns depend
+    only on the job description, so they are generated once for the whole batch;
+    the per-candidate stages then run with at most BATCH_CONCURRENCY in flight.
+    Its LLM calls run at batch priority, behind interactive requests, with at
+    most LLM_BATCH_REQUEST_CONCURRENCY in flight.
+    """
+    try:
+        print(f"Processing batch request: {len(resumes)} candidates")
+
+        if not job_description.strip():
+            return JSONResponse(
+                content={"error": "Job description cannot be empty"},
+                status_code=400
+            )
+
+        if len(resumes) != len(candidate_responses):
+            return JSONResponse(
+                content={"error": "Each resume needs exactly one candidate response"},
+                status_code=400
+            )
+
+        if len(resumes) > BATCH_MAX_CANDIDATES:
+            return JSONResponse(
+                content={"error": f"Batch exceeds the maximum of {BATCH_MAX_CANDIDATES} candidates"},
+                status_code=413
+            )
+
+        not_ready = await ensure_warm()
+        if not_ready is not None:
+            return not_ready
+        from graph.nodes import behavioral_analysis_node
+
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def evaluate_candidate(index: int, resume: UploadFile, candidate_response: str) -> dict:
+            async with semaphore:
+                temp_resume_path = None
+                try:
+                    if not candidate_response.strip():
+                        raise ValueError("Candidate response cannot be empty")
+
+                    resume_content, temp_resume_path = await read_resume_upload(resume)
+                    state = InterviewState(
+                        resume_path=temp_resume_path,
+                        resume_content=resume_content,
+                        resume_filename=resume_filename_for(resume.filename),
+                        job_description=job_description,
+                        candidate_response=candidate_response,
+                        llm_reason=llm_reason,
+                        behavioral_patterns=behavioral_patterns
+                    )
+                    result = await candidate_graph.ainvoke(state)
+                    response_data = serialize_workflow_result(result)
+                    # The JD and shared patterns are returned once at the top level
+                    for field in ("job_description", "behavioral_patterns"):
+                        response_data.pop(field, None)
+                    return {"index": index, "resume_filename": resume.filename, **response_data}
+                except Exception as e:
+                    print(f"Error evaluating candidate {index}: {e}")
+                    return {"index": index, "resume_filename": resume.filename, "error": str(e)}
+                finally:
+                    cleanup_spill_file(temp_resume_path)
+
+        with llm_request_scope("batch", LLM_BATCH_REQUEST_CONCURRENCY):
+            # JD-dependent work, paid once per batch
+            jd_state = InterviewState(job_description=job_description, candidate_response="")
+            behavioral_patterns = (await behavioral_analysis_node(jd_state))["behavioral_patterns"]
+
+            results = await asyncio.gather(*(
+                evaluate_candidate(i, resume, response)
+                for i, (resume, response) in enumerate(zip(resumes, candidate_responses))
+            ))
+
+        return JSONResponse(content={
+            "job_description": job_description,
+            "behavioral_patterns": recursive_model_dump_and_url_convert(behavioral_patterns),
+            "results": results
+        })
+
+    except Exception as e:
+        print(f"Error in batch pipeline: {e}")
+        import traceback
+        traceback.print_exc()
+        return JSONResponse(
+            content={"error": f"Internal server error: {str(e)}"},
+            status_code=500
+        )
 
 # Keep your existing endpoints for individual components
 @app.post("/analyze-resume/")
@@ -148,18 +532,25 @@ async def analyze_resume_endpoint(
     job_description: str = Form(...)
 ):
     """Individual resume analysis endpoint"""
+    tmp_path = None
     try:
-        from agents.resume_analyzer import analyze_resume
-
-        # Save uploaded file to a temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{resume.filename.split('.')[-1]}") as tmp:
-            tmp.write(await resume.read())
-            tmp_path = tmp.name
-
-        result = analyze_resume(file_path=tmp_path, job_description=job_description)
-
-        # Clean up
-        os.unlink(tmp_path)
+        not_ready = await ensure_warm(["import_agents"])
+        if not_ready is not None:
+            return not_ready
+        from agents.resume_analyzer import aanalyze_resume
+
+        try:
+            content, tmp_path = await read_resume_upload(resume)
+        except UploadTooLargeError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=413)
+
+        with llm_request_scope("interactive"):
+            result = await aanalyze_resume(
+                file_path=tmp_path,
+                job_description=job_description,
+                content=content,
+                filename=resume_filename_for(resume.filename)
+            )
 
         # Ensure the result is properly serialized, especially if it contains Pydantic models
         if isinstance(result, BaseModel):
@@ -171,11 +562,18 @@ async def analyze_resume_endpoint(
         print(f"Error in resume analysis: {e}")
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
+    finally:
+        # Clean up even if analysis raised
+        cleanup_spill_file(tmp_path)
+
 @app.post("/get-behavioral-patterns")
 async def behavioral_patterns_endpoint(request: Request):
     """Individual behavioral patterns endpoint"""
     try:
-        from agents.behavioral_retriever import get_behavioral_patterns
+        not_ready = await ensure_warm(["import_agents", "load_knowledge_base"])
+        if not_ready is not None:
+            return not_ready
+        from agents.behavioral_retriever import aget_behavioral_patterns
 
         body = await request.json()
         job_description = body.get("job_description")
@@ -185,7 +583,8 @@ async def behavioral_patterns_endpoint(request: Request):
                 status_code=400
             )
 
-        result = get_behavioral_patterns(job_description)
+        with llm_request_scope("interactive"):
+            result = await aget_behavioral_patterns(job_description)
         # Ensure the result is properly serialized if it's a Pydantic model
         if isinstance(result, BaseModel):
             return JSONResponse(content=result.model_dump(mode="json"))
@@ -194,4 +593,35 @@ async def behavioral_patterns_endpoint(request: Request):
 
     except Exception as e:
         print(f"Error in behavioral patterns: {e}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
\ No newline at end of file
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+@app.post("/explain-outcome")
+async def explain_outcome_endpoint(request: Request):
+    """
+    LLM-written justification for an evaluation's outcome, on demand.
+    Evaluations return a templated reason unless llm_reason is set; clients that
+    want the LLM sentence post the resume_scores and mock_scores they got back.
+    """
+    try:
+        not_ready = await ensure_warm(["import_agents"])
+        if not_ready is not None:
+            return not_ready
+        from agents.outcome_predictor import agenerate_llm_reason
+        from graph.nodes import BEHAVIOR_SCORE
+
+        body = await request.json()
+        resume_scores = body.get("resume_scores")
+        mock_scores = body.get("mock_scores")
+        if not isinstance(resume_scores, dict) or not isinstance(mock_scores, dict):
+            return JSONResponse(
+                content={"error": "Missing resume_scores or mock_scores"},
+                status_code=400
+            )
+
+        with llm_request_scope("interactive"):
+            reason = await agenerate_llm_reason(resume_scores, mock_scores, BEHAVIOR_SCORE)
+        return JSONResponse(content={"reason": reason})
+
+    except Exception as e:
+        print(f"Error in outcome explanation: {e}")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
@@ -0,0 +1,276 @@
+"""
+Local stand-ins for the external services the pipeline talks to: the Groq LLM,
+the embedding model, Tavily search and page fetching. Each fake sleeps for
+a configurable latency (plus jitter) so the benchmarks measure the backend's own
+overhead on top of a known, repeatable service cost.
+
+install_fakes() must run before graph/agents/api are imported, because the
+agents build their chains around llm_client.llm at import time.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from html import escape
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+import httpx
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+@dataclass
+class FakeLatency:
+    """Latency model for one fake service, in seconds."""
+    mean: float = 0.0
+    jitter: float = 0.0
+
+    def sample(self) -> float:
+        if self.jitter <= 0:
+            return max(self.mean, 0.0)
+        return max(random.uniform(self.mean - self.jitter, self.mean + self.jitter), 0.0)
+
+    def sleep(self) -> None:
+        delay = self.sample()
+        if delay:
+            time.sleep(delay)
+
+    async def asleep(self) -> None:
+        delay = self.sample()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class FakeServiceConfig:
+    llm: FakeLatency = field(default_factory=FakeLatency)
+    embeddings: FakeLatency = field(default_factory=FakeLatency)
+    tavily: FakeLatency = field(default_factory=FakeLatency)
+    scrape: FakeLatency = field(default_factory=FakeLatency)
+    embedding_dim: int = 384
+
+
+# ----------------------------
+# LLM
+# ----------------------------
+
+def fake_llm_response(prompt: str) -> str:
+    """Return a well-formed answer for whichever agent prompt this is."""
+    if "evaluating resumes" in prompt:
+        return json.dumps({"clarity": 78, "relevance": 72, "structure": 80, "experience": 3,
+                           "feedback": ["Quantify project impact", "Tighten the summary"]})
+    if "mock interview response" in prompt:
+        return json.dumps({"question": "Tell me about yourself.", "response": "...", "tone": 70,
+                           "confidence": 68, "relevance": 74,
+                           "feedback": ["Use the STAR method", "Be more specific"]})
+    if "full interview evaluation in one pass" in prompt:
+        return json.dumps({
+            "mock_scores": {"tone": 70, "confidence": 68, "relevance": 74,
+                            "feedback": ["Use the STAR method", "Be more specific"]},
+            "outcome_reason": "Strong resume relevance with room to improve interview delivery.",
+            "improvement_plan": {
+                "suggestions": [{"title": f"Suggestion {i}", "description": "Practice regularly."} for i in range(3)],
+                "resources": [{"title": f"Course {i}", "link": f"https://example.com/course-{i}"} for i in range(2)],
+            },
+        })
+    if "one-sentence reason" in prompt:
+        return "Strong resume relevance with room to improve interview delivery."
+    if "career coach AI" in prompt:
+        return json.dumps({"improvement_plan": {
+            "suggestions": [{"title": f"Suggestion {i}", "description": "Practice regularly."} for i in range(3)],
+            "resources": [{"title": f"Course {i}", "link": f"https://example.com/course-{i}"} for i in range(2)],
+        }})
+    if "creating search queries" in prompt:
+        return "software engineer behavioral interview questions python"
+    if "behavioral interview information" in prompt:
+        return json.dumps({"questions": [
+            {"question": f"Tell me about challenge {i}.", "sample_answer": "I used STAR.", "source": "web_search_results"}
+            for i in range(5)
+        ]})
+    return "ok"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers agent prompts locally after a simulated delay."""
+    latency: FakeLatency = FakeLatency()
+    model_name: str = "fake-llm"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _result(self, messages) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        completion = fake_llm_response(prompt)
+        message = AIMessage(content=completion, usage_metadata={
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(completion) // 4,
+            "total_tokens": (len(prompt) + len(completion)) // 4,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={"model_name": self.model_name})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.latency.sleep()
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await self.latency.asleep()
+        return self._result(messages)
+
+
+# ----------------------------
+# Embeddings
+# ----------------------------
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic bag-of-words hashing embeddings (unit length)."""
+
+    def __init__(self, dim: int = 384, latency: Optional[FakeLatency] = None):
+        self.dim = dim
+        self.model = f"fake-embeddings-{dim}"
+        self.latency = latency or FakeLatency()
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % self.dim] += 1.0
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.latency.sleep()
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.latency.sleep()
+        return self._vector(text)
+
+
+# ----------------------------
+# Tavily
+# ----------------------------
+
+FAKE_DOMAINS = ["indeed.com", "glassdoor.com", "builtin.com", "themuse.com", "linkedin.com"]
+
+
+def _fake_urls(query: str, k: int) -> List[str]:
+    slug = hashlib.md5(query.encode("utf-8")).hexdigest()[:8]
+    return [f"https://www.{FAKE_DOMAINS[i % len(FAKE_DOMAINS)]}/{slug}-{i}" for i in range(k)]
+
+
+def make_fake_tavily_retriever(latency: FakeLatency):
+    """Build a class usable in place of TavilySearchAPIRetriever(k=...)."""
+    class FakeTavilySearchAPIRetriever:
+        def __init__(self, k: int = 5, **kwargs: Any):
+            self.k = k
+
+        def _docs(self, query: str) -> List[Document]:
+            return [Document(page_content=f"Result for {query}", metadata={"source": url})
+                    for url in _fake_urls(query, self.k)]
+
+        def invoke(self, query: str, **kwargs: Any) -> List[Document]:
+            latency.sleep()
+            return self._docs(query)
+
+        async def ainvoke(self, query: str, **kwargs: Any) -> List[Document]:
+            await latency.asleep()
+            return self._docs(query)
+
+    return FakeTavilySearchAPIRetriever
+
+
+class FakeTavilySearchResults:
+    """Stand-in for the TavilySearchResults tool used by gap_fixer."""
+
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+
+    def _results(self, payload: dict) -> List[dict]:
+        return [{"url": url, "content": "Course page"} for url in _fake_urls(payload["query"], 1)]
+
+    def invoke(self, payload: dict, **kwargs: Any) -> List[dict]:
+        self.latency.sleep()
+        return self._results(payload)
+
+    async def ainvoke(self, payload: dict, **kwargs: Any) -> List[dict]:
+        await self.latency.asleep()
+        return self._results(payload)
+
+
+# ----------------------------
+# Web pages
+# ----------------------------
+
+FAKE_ARTICLE_PARAGRAPH = (
+    "Behavioral interview questions ask candidates to describe how they handled real situations. "
+    "Tell me about a time you debugged a production incident, resolved a conflict with a teammate, "
+    "or delivered a project under a tight deadline. Strong answers follow the STAR method. "
+)
+
+
+def fake_page_html(url: str, paragraphs: int = 30) -> str:
+    body = "".join(f"<p>{escape(FAKE_ARTICLE_PARAGRAPH + url)}</p>" for _ in range(paragraphs))
+    return (f"<html><head><title>Interview guide: {escape(url)}</title></head>"
+            f"<body><article><h1>Interview guide</h1>{body}</article></body></html>")
+
+
+def make_fake_page_transport(latency: FakeLatency, paragraphs: int = 30) -> httpx.MockTransport:
+    """
+    httpx transport serving a generated article for any URL. Each page has a
+    stable ETag, so conditional requests get a 304 with no body.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await latency.asleep()
+        url = str(request.url)
+        etag = f'"{hashlib.md5(url.encode("utf-8")).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag, "Content-Type": "text/html"},
+                              text=fake_page_html(url, paragraphs))
+
+    return httpx.MockTransport(handler)
+
+
+# ----------------------------
+# Installation
+# ----------------------------
+
+def install_fakes(config: FakeServiceConfig, persist_dir: str) -> None:
+    """
+    Swap every external service for its local fake. persist_dir is used for the
+    Chroma store so benchmarks never touch the real knowledge base.
+    """
+    if any(name.startswith(("agents.", "graph.")) or name == "api" for name in sys.modules):
+        raise RuntimeError("install_fakes() must run before agents, graph or api are imported")
+
+    import llm_client
+    from llm_scheduler import TokenBucket
+    # Keep the scheduler's priorities and concurrency caps; the fake has no provider rate limits
+    llm_client.llm_scheduler.requests = TokenBucket(0)
+    llm_client.llm_scheduler.tokens = TokenBucket(0)
+    llm_client.llm = llm_client.ScheduledChatModel(
+        model=FakeChatModel(latency=config.llm),
+        scheduler=llm_client.llm_scheduler,
+        cache=llm_client.llm_cache,
+        callbacks=llm_client.llm.callbacks
+    )
+
+    import agents.behavioral_retriever as behavioral_retriever
+    import agents.gap_fixer as gap_fixer
+    from scraper import page_fetcher
+
+    embeddings = FakeEmbeddings(dim=config.embedding_dim, latency=config.embeddings)
+    behavioral_retriever.create_embeddings = lambda: embeddings
+    behavioral_retriever.TavilySearchAPIRetriever = make_fake_tavily_retriever(config.tavily)
+    page_fetcher.transport = make_fake_page_transport(config.scrape)
+    # Fake hosts need no politeness delay
+    page_fetcher.domain_interval = 0
+    behavioral_retriever.knowledge_base.persist_dir = persist_dir
+    gap_fixer.search_tool = FakeTavilySearchResults(config.tavily)
@@ -0,0 +1,547 @@
+"""
+Offline benchmark suite for the interview evaluation backend.
+
+Every external service is replaced by a local fake (see benchmarks/fakes.py) with
+configurable latency, so the numbers reflect the backend's own overhead and
+concurrency behaviour. Results are written as JSON so runs can be diffed across
+versions.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmarks --output bench_results.json
+    python -m benchmarks.run_benchmarks --suites pipeline,api --llm-latency 0.5 --jitter 0.1
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+SUITES = ("pipeline", "extraction", "vector_query", "vector_backends", "api", "imports")
+
+JOB_DESCRIPTION = (
+    "Software Engineer working on Python microservices, AWS and PostgreSQL. "
+    "Collaborate with cross-functional teams, troubleshoot production issues and review code."
+)
+CANDIDATE_RESPONSE = (
+    "In my last role I led the migration of our billing service to microservices, "
+    "coordinating with three teams and cutting latency by 40%."
+)
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal single-font PDF with one text line per entry; enough for pdfplumber."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    font_ref = 3 + 2 * len(pages)
+    for i, lines in enumerate(pages):
+        escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines)
+        stream = "BT /F1 10 Tf 40 760 Td 12 TL " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_ref} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def make_docx(paragraphs: List[str]) -> bytes:
+    """Minimal DOCX containing only word/document.xml; enough for docx2txt."""
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml",
+                         '<?xml version="1.0" encoding="UTF-8"?>'
+                         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def resume_lines(candidate: int, lines: int) -> List[str]:
+    return [f"Candidate {candidate} - Senior Python engineer, item {i}: built APIs on AWS" for i in range(lines)]
+
+
+def make_resume_pdf(candidate: int, pages: int = 2) -> bytes:
+    return make_pdf([resume_lines(candidate, 45) for _ in range(pages)])
+
+
+# ----------------------------
+# Suites
+# ----------------------------
+
+async def bench_pipeline(iterations: int, answers: int = 1) -> dict:
+    """Per-node and end-to-end time of the build_graph pipeline."""
+    import graph.workflow as workflow
+    from agents.behavioral_retriever import knowledge_refresher
+    from models import InterviewState
+
+    node_times: Dict[str, List[float]] = {}
+    originals = dict(workflow.NODES)
+
+    def timed(name: str, fn: Callable):
+        async def wrapper(state):
+            start = time.perf_counter()
+            try:
+                return await fn(state)
+            finally:
+                node_times.setdefault(name, []).append(time.perf_counter() - start)
+        return wrapper
+
+    # The graph is wired from workflow.NODES, so timing wrappers go there
+    workflow.NODES.update({name: timed(name, fn) for name, fn in originals.items()})
+    try:
+        graph = workflow.build_graph()
+    finally:
+        workflow.NODES.update(originals)
+
+    totals = []
+    enrichment = []
+    for i in range(iterations):
+        state = InterviewState(
+            resume_content=make_resume_pdf(i),
+            resume_filename="resume.pdf",
+            job_description=JOB_DESCRIPTION,
+            candidate_response=CANDIDATE_RESPONSE,
+            # Several answers to the generated behavioral questions
+            candidate_answers=[{"response": CANDIDATE_RESPONSE}] * answers if answers > 1 else None,
+        )
+        start = time.perf_counter()
+        await graph.ainvoke(state)
+        totals.append(time.perf_counter() - start)
+
+        # A cold index queues background enrichment; time it separately from the
+        # request and let it finish so later iterations see the enriched index
+        start = time.perf_counter()
+        await asyncio.to_thread(knowledge_refresher.join)
+        if i == 0:
+            enrichment.append(time.perf_counter() - start)
+
+    return {
+        "end_to_end": summarize(totals),
+        "nodes": {name: summarize(samples) for name, samples in node_times.items()},
+        "background_enrichment": summarize(enrichment),
+    }
+
+
+def bench_extraction(repeats: int) -> dict:
+    """pdfplumber / docx2txt extraction time across resume sizes (uncached)."""
+    from agents.resume_analyzer import _extract_text_uncached
+
+    results = {}
+    for pages in (1, 2, 5, 10, 20):
+        pdf = make_pdf([resume_lines(0, 50) for _ in range(pages)])
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _extract_text_uncached(io.BytesIO(pdf), ".pdf")
+            samples.append(time.perf_counter() - start)
+        results[f"pdf_{pages}_pages"] = {"bytes": len(pdf), **summarize(samples)}
+
+    for paragraphs in (50, 200, 1000):
+        docx = make_docx(resume_lines(0, paragraphs))
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _extract_text_uncached(io.BytesIO(docx), ".docx")
+            samples.append(time.perf_counter() - start)
+        results[f"docx_{paragraphs}_paragraphs"] = {"bytes": len(docx), **summarize(samples)}
+    return results
+
+
+def bench_vector_query(sizes: List[int], queries: int, embedding_dim: int) -> dict:
+    """Query latency of the behavioral vectorstore as the index grows."""
+    from langchain_community.vectorstores import Chroma
+    from agents.behavioral_retriever import retrieve_behavioral_context
+    from benchmarks.fakes import FakeEmbeddings, FAKE_ARTICLE_PARAGRAPH
+
+    embeddings = FakeEmbeddings(dim=embedding_dim)
+    results = {}
+    with tempfile.TemporaryDirectory() as persist_dir:
+        store = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+        indexed = 0
+        for size in sorted(sizes):
+            batch = []
+            while indexed < size:
+                batch.append(f"{FAKE_ARTICLE_PARAGRAPH} chunk {indexed} topic {indexed % 97}")
+                indexed += 1
+                if len(batch) == 1000 or indexed == size:
+                    store.add_texts(batch, metadatas=[{"source": f"https://example.com/{indexed}",
+                                                       "source_domain": "example.com"}] * len(batch))
+                    batch = []
+            samples = []
+            for q in range(queries):
+                start = time.perf_counter()
+                retrieve_behavioral_context(store, f"{JOB_DESCRIPTION} variant {q}")
+                samples.append(time.perf_counter() - start)
+            results[str(size)] = summarize(samples)
+    return results
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_vector_store(backend: str, persist_dir: str, size: int, dim: int) -> None:
+    """Fill a store of the given backend with `size` random unit vectors and persist it."""
+    import numpy as np
+    from benchmarks.fakes import FakeEmbeddings, FAKE_ARTICLE_PARAGRAPH
+
+    embeddings = FakeEmbeddings(dim=dim)
+    rng = np.random.default_rng(0)
+    if backend == "chroma":
+        from langchain_community.vectorstores import Chroma
+        store = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+    else:
+        from vector_index import NumpyVectorIndex
+        store = NumpyVectorIndex(persist_directory=persist_dir, embedding_function=embeddings)
+
+    batch = 5000
+    for start in range(0, size, batch):
+        count = min(batch, size - start)
+        vectors = rng.standard_normal((count, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        ids = [f"chunk-{start + i}" for i in range(count)]
+        texts = [f"{FAKE_ARTICLE_PARAGRAPH} chunk {start + i}" for i in range(count)]
+        metadatas = [{"source": f"https://example.com/{(start + i) % 500}", "source_domain": "example.com"}
+                     for i in range(count)]
+        if backend == "chroma":
+            store._collection.add(ids=ids, embeddings=vectors.tolist(), documents=texts, metadatas=metadatas)
+        else:
+            store.add_embeddings(texts, vectors, metadatas, ids)
+    store.persist()
+
+
+def probe_vector_store(backend: str, persist_dir: str, dim: int, queries: int) -> None:
+    """
+    Run in a fresh interpreter: time library import, store open and queries,
+    and report RSS. Prints one JSON line.
+    """
+    baseline_rss = current_rss_mb()
+    start = time.perf_counter()
+    import numpy as np
+    from benchmarks.fakes import FakeEmbeddings
+    if backend == "chroma":
+        from langchain_community.vectorstores import Chroma
+    else:
+        from vector_index import NumpyVectorIndex
+    import_seconds = time.perf_counter() - start
+
+    embeddings = FakeEmbeddings(dim=dim)
+    start = time.perf_counter()
+    if backend == "chroma":
+        store = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+    else:
+        store = NumpyVectorIndex.load(persist_dir, embeddings)
+    open_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    query_vectors = rng.standard_normal((queries, dim)).astype(np.float32)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+    samples = []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        store.similarity_search_by_vector_with_relevance_scores(vector.tolist(), k=5)
+        samples.append(time.perf_counter() - start)
+
+    result = {
+        "import_ms": import_seconds * 1000,
+        "open_ms": open_seconds * 1000,
+        "first_query_ms": samples[0] * 1000,
+        "cold_start_ms": (import_seconds + open_seconds + samples[0]) * 1000,
+        "query": summarize(samples[1:]),
+        "rss_mb": current_rss_mb(),
+        "rss_delta_mb": current_rss_mb() - baseline_rss,
+    }
+    if backend == "numpy":
+        start = time.perf_counter()
+        store.search_by_vectors(query_vectors, k=5)
+        result["batched_query_ms_per_query"] = (time.perf_counter() - start) * 1000 / queries
+    print(json.dumps(result))
+
+
+def bench_vector_backends(sizes: List[int], queries: int, dim: int) -> dict:
+    """Chroma vs the NumPy index: build time, cold start, query latency and RSS per size."""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for size in sizes:
+        results[str(size)] = {}
+        for backend in ("chroma", "numpy"):
+            with tempfile.TemporaryDirectory() as persist_dir:
+                start = time.perf_counter()
+                build_vector_store(backend, persist_dir, size, dim)
+                build_seconds = time.perf_counter() - start
+                probe = subprocess.run(
+                    [sys.executable, "-c",
+                     "from benchmarks.run_benchmarks import probe_vector_store; "
+                     f"probe_vector_store({backend!r}, {persist_dir!r}, {dim}, {queries})"],
+                    cwd=backend_dir, capture_output=True, text=True, check=True,
+                )
+                measured = json.loads(probe.stdout.strip().splitlines()[-1])
+                results[str(size)][backend] = {"build_ms": build_seconds * 1000, **measured}
+            print(f"  {backend} @ {size}: cold start {measured['cold_start_ms']:.0f} ms, "
+                  f"p50 query {measured['query'].get('p50_ms', 0):.2f} ms, RSS {measured['rss_mb']:.0f} MB")
+    return results
+
+
+async def bench_api(concurrency: int, requests_per_client: int) -> dict:
+    """Throughput and latency percentiles of the FastAPI endpoints under concurrent clients."""
+    import httpx
+    import api
+
+    await api.startup_event()
+    await api.warmup.wait_ready()
+    results = {"warmup": api.warmup.progress()}
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        endpoints = {
+            "run_interview_evaluation": ("/run-interview-evaluation/",
+                                         {"job_description": JOB_DESCRIPTION, "candidate_response": CANDIDATE_RESPONSE}),
+            "analyze_resume": ("/analyze-resume/", {"job_description": JOB_DESCRIPTION}),
+        }
+        for name, (path, data) in endpoints.items():
+            latencies: List[float] = []
+            errors = 0
+
+            async def client_loop(client_id: int):
+                nonlocal errors
+                for r in range(requests_per_client):
+                    files = {"resume": ("resume.pdf", make_resume_pdf(client_id * 1000 + r), "application/pdf")}
+                    start = time.perf_counter()
+                    response = await client.post(path, data=data, files=files)
+                    latencies.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop(c) for c in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                "concurrency": concurrency,
+                "requests": len(latencies),
+                "errors": errors,
+                "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+                **summarize(latencies),
+            }
+    await api.shutdown_event()
+    return results
+
+
+IMPORT_PROFILE_MODULES = (
+    "api", "graph.workflow", "agents.behavioral_retriever", "agents.gap_fixer",
+    "agents.resume_analyzer", "agents.mock_evaluator", "agents.outcome_predictor",
+    "llm_client", "scraper", "vector_index",
+)
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Parse `python -X importtime` output into {module, self_ms, cumulative_ms, depth} rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def bench_imports(top: int) -> dict:
+    """
+    Import-time profile of the API and each agent module, each in a fresh
+    interpreter, so start-up regressions show up in the benchmark JSON.
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for module in IMPORT_PROFILE_MODULES:
+        probe = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=backend_dir, capture_output=True, text=True,
+        )
+        rows = parse_importtime(probe.stderr)
+        target = next((r for r in reversed(rows) if r["module"] == module), None)
+        # Time attributed to each top-level package, by self time
+        packages: Dict[str, float] = {}
+        for row in rows:
+            package = row["module"].split(".")[0]
+            packages[package] = packages.get(package, 0.0) + row["self_ms"]
+        results[module] = {
+            "ok": probe.returncode == 0,
+            "total_ms": target["cumulative_ms"] if target else None,
+            "modules_imported": len(rows),
+            "top_packages_ms": dict(sorted(packages.items(), key=lambda kv: -kv[1])[:top]),
+            "slowest_modules": sorted(
+                ({"module": r["module"], "cumulative_ms": r["cumulative_ms"]} for r in rows),
+                key=lambda r: -r["cumulative_ms"]
+            )[:top],
+        }
+        print(f"  import {module}: {results[module]['total_ms']} ms, {len(rows)} modules")
+    return results
+
+
+# ----------------------------
+# Entry point
+# ----------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the interview evaluation backend")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mean fake LLM latency (s)")
+    parser.add_argument("--embedding-latency", type=float, default=0.01, help="Mean fake embedding latency (s)")
+    parser.add_argument("--tavily-latency", type=float, default=0.1, help="Mean fake Tavily latency (s)")
+    parser.add_argument("--scrape-latency", type=float, default=0.2, help="Mean fake page download latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter applied to every fake latency (s)")
+    parser.add_argument("--iterations", type=int, default=5, help="Pipeline runs")
+    parser.add_argument("--answers", type=int, default=1, help="Question/answer pairs per pipeline run")
+    parser.add_argument("--extraction-repeats", type=int, default=5, help="Repeats per extraction corpus entry")
+    parser.add_argument("--index-sizes", default="100,1000,5000", help="Vector index sizes to query")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per index size")
+    parser.add_argument("--backend-sizes", default="1000,10000,100000",
+                        help="Chunk counts for the Chroma vs NumPy backend comparison (building Chroma at 100k takes minutes)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent API clients")
+    parser.add_argument("--requests-per-client", type=int, default=3, help="Requests per API client")
+    parser.add_argument("--import-top", type=int, default=15, help="Packages/modules listed per import profile")
+    parser.add_argument("--evaluation-mode", choices=["standard", "fast"], default="standard",
+                        help="EVALUATION_MODE for the graphs: three tail LLM calls, or one combined call")
+    parser.add_argument("--with-llm-cache", action="store_true",
+                        help="Keep the LLM response cache on (off by default so every call pays fake latency)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise SystemExit(f"Unknown suites: {sorted(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="interview-bench-")
+    if not args.with_llm_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+    # Every persistent cache lives in the workdir: results must not depend on
+    # (or leave fake entries in) the caches of the checked-out tree
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm_cache.db")
+    os.environ["SEMANTIC_CACHE_PATH"] = os.path.join(workdir, "semantic_cache.db")
+    os.environ["EMBEDDING_CACHE_DIR"] = os.path.join(workdir, "embedding_cache")
+    os.environ["EVALUATION_MODE"] = args.evaluation_mode
+    os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+    os.environ.setdefault("TAVILY_API_KEY", "offline-benchmark")
+
+    from benchmarks.fakes import FakeLatency, FakeServiceConfig, install_fakes
+
+    config = FakeServiceConfig(
+        llm=FakeLatency(args.llm_latency, args.jitter),
+        embeddings=FakeLatency(args.embedding_latency, args.jitter),
+        tavily=FakeLatency(args.tavily_latency, args.jitter),
+        scrape=FakeLatency(args.scrape_latency, args.jitter),
+    )
+    install_fakes(config, persist_dir=os.path.join(workdir, "chroma"))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": {},
+    }
+
+    for suite in suites:
+        print(f"Running benchmark suite: {suite}")
+        start = time.perf_counter()
+        if suite == "pipeline":
+            result = asyncio.run(bench_pipeline(args.iterations, args.answers))
+        elif suite == "extraction":
+            result = bench_extraction(args.extraction_repeats)
+        elif suite == "vector_query":
+            sizes = [int(s) for s in args.index_sizes.split(",") if s.strip()]
+            result = bench_vector_query(sizes, args.queries, config.embedding_dim)
+        elif suite == "imports":
+            result = bench_imports(args.import_top)
+        elif suite == "vector_backends":
+            sizes = [int(s) for s in args.backend_sizes.split(",") if s.strip()]
+            result = bench_vector_backends(sizes, max(args.queries, 2), config.embedding_dim)
+        else:
+            result = asyncio.run(bench_api(args.concurrency, args.requests_per_client))
+        result["suite_seconds"] = time.perf_counter() - start
+        report["results"][suite] = result
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
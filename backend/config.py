@@ -0,0 +1,15 @@
+import os
+
+# backend/ itself; relative store and cache paths are anchored here so every
+# worker and pod resolves the same location whatever its working directory.
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def resolve_backend_path(env: str, default: str) -> str:
+    """Absolute path configured by ``env`` (``default`` if unset), relative
+    paths taken from backend/. An empty value stays empty, which the caches
+    treat as "in memory only"."""
+    path = os.getenv(env, default)
+    if not path:
+        return ""
+    return os.path.abspath(os.path.join(BACKEND_DIR, path))
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from filelock import FileLock
+from langchain_core.embeddings import Embeddings
+
+from config import resolve_backend_path
+
+# --- Configuration (overridable through .env) ---
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_DIR = resolve_backend_path("EMBEDDING_CACHE_DIR", "embedding_cache")
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.txt"
+META_FILE = "meta.json"
+LOCK_FILE = ".write.lock"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store of float32 vectors for one embedding model.
+    vectors.f32 is a raw row-major float32 array read through np.memmap;
+    index.txt has one "<sha256 of text> <row>" line per vector. Vectors are
+    written before their index line, so a crash can leave an unindexed row
+    but never an index line pointing past the end of the array.
+
+    Several processes may share a directory: appends are serialized by a file
+    lock, rows are numbered from the file's real length, and index lines
+    written by other processes are picked up on the next miss or append.
+    """
+
+    def __init__(self, directory: str, model: str):
+        self.directory = directory
+        self.model = model
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._count = 0            # rows in vectors.f32
+        self._index_read = 0       # bytes of index.txt already loaded
+        self._mapped: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._file_lock = FileLock(os.path.join(directory, LOCK_FILE))
+        self._load_meta()
+        self._sync()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, VECTORS_FILE)
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _load_meta(self) -> None:
+        meta_path = os.path.join(self.directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("model") != self.model:
+                raise ValueError(f"Embedding cache in {self.directory} belongs to {meta.get('model')}, not {self.model}")
+            self.dim = meta["dim"]
+
+    def _sync(self) -> None:
+        """Load index lines appended (by any process) since the last sync."""
+        if self.dim is None:
+            return
+        self._count = os.path.getsize(self._vectors_path) // (4 * self.dim) if os.path.exists(self._vectors_path) else 0
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_read)
+            chunk = f.read()
+        # A line another process is still writing is read next time
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        self._index_read += len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and int(parts[1]) < self._count:
+                self._rows[parts[0]] = int(parts[1])
+
+    def _write_meta(self) -> None:
+        with open(os.path.join(self.directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim}, f)
+
+    def _matrix(self) -> np.ndarray:
+        # Remap only when rows were appended since the last mapping
+        if self._mapped is None or self._mapped.shape[0] < self._count:
+            self._mapped = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._count, self.dim))
+        return self._mapped
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        with self._lock:
+            if self.dim is None:
+                self._load_meta()
+            if any(key not in self._rows for key in keys):
+                # Another process may have embedded them meanwhile
+                self._sync()
+            rows = [self._rows.get(key) for key in keys]
+            if self.dim is None or not any(row is not None for row in rows):
+                return [None] * len(keys)
+            matrix = self._matrix()
+            return [None if row is None else matrix[row].tolist() for row in rows]
+
+    def put_many(self, keys: List[str], vectors: List[List[float]]) -> None:
+        if not keys:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock:
+            if self.dim is None:
+                self._load_meta()
+            if self.dim is None:
+                self.dim = int(array.shape[1])
+                self._write_meta()
+            if array.shape[1] != self.dim:
+                print(f"Not caching embeddings of dimension {array.shape[1]} (store has {self.dim})")
+                return
+            self._sync()
+            fresh = [i for i, key in enumerate(keys) if key not in self._rows]
+            if not fresh:
+                return
+            row_bytes = 4 * self.dim
+            with open(self._vectors_path, "ab") as f:
+                # Rows are numbered from the file itself, not from what this
+                # process last saw; a row torn by a crash is cut off first
+                end = f.tell()
+                if end % row_bytes:
+                    f.truncate(end - end % row_bytes)
+                first_row = end // row_bytes
+                f.write(array[fresh].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                for offset, i in enumerate(fresh):
+                    f.write(f"{keys[i]} {first_row + offset}\n")
+            for offset, i in enumerate(fresh):
+                self._rows[keys[i]] = first_row + offset
+            self._count = first_row + len(fresh)
+            # Everything in the index up to here has been loaded (the lock is held)
+            self._index_read = os.path.getsize(self._index_path)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document embeddings for previously seen text
+    from an EmbeddingStore and only sends unseen text to the wrapped model.
+    Rebuilding the index or re-adding unchanged chunks then costs no model calls.
+    Queries are passed straight through.
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, cache_dir: str = EMBEDDING_CACHE_DIR):
+        self.underlying = underlying
+        self.model = model
+        slug = hashlib.sha256(model.encode("utf-8")).hexdigest()[:12]
+        self.store = EmbeddingStore(os.path.join(cache_dir, slug), model)
+        self._counters = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [text_hash(text) for text in texts]
+        vectors = self.store.get_many(keys)
+
+        # Identical texts in one batch are embedded once
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        with self._lock:
+            self._counters["hits"] += len(texts) - sum(1 for v in vectors if v is None)
+            self._counters["misses"] += len(missing)
+
+        if missing:
+            new_keys = list(missing)
+            new_vectors = self.underlying.embed_documents([missing[key] for key in new_keys])
+            self.store.put_many(new_keys, new_vectors)
+            computed = dict(zip(new_keys, new_vectors))
+            vectors = [computed[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.underlying.aembed_query(text)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": len(self.store),
+            }
+
+
+def with_embedding_cache(embeddings: Embeddings, model: str) -> Embeddings:
+    """Wrap an embedding model with the persistent chunk cache, if enabled."""
+    if not EMBEDDING_CACHE_ENABLED:
+        return embeddings
+    try:
+        return CachedEmbeddings(embeddings, model)
+    except Exception as e:
+        print(f"Failed to open embedding cache, embedding without it: {e}")
+        return embeddings
@@ -1,47 +1,94 @@
+from typing import List, Tuple
 from models import InterviewState
-from agents.resume_analyzer import analyze_resume
-from agents.behavioral_retriever import get_behavioral_patterns
-from agents.mock_evaluator import evaluate_mock_response
-from agents.outcome_predictor import predict_outcome
-from agents.gap_fixer import generate_improvement_plan
+from telemetry import traced_node, record_fallback
+from agents.resume_analyzer import aanalyze_resume
+from agents.behavioral_retriever import aget_behavioral_patterns
+from agents.mock_evaluator import aevaluate_mock_response, aevaluate_mock_responses, aggregate_mock_scores
+from agents.outcome_predictor import apredict_outcome
+from agents.gap_fixer import agenerate_improvement_plan
+from agents.combined_evaluator import aevaluate_combined
 
 # graph/nodes.py
-def resume_analysis_node(state: InterviewState) -> InterviewState:
-    """Analyze resume and update state"""
+# Nodes return only the fields they produce. resume_analysis and
+# behavioral_analysis run in the same superstep, so returning the whole state
+# would make both branches write every input field at once.
+# Nodes are async so the graph runs under ainvoke without blocking the event loop.
+
+# Behavioral match score used by outcome prediction
+BEHAVIOR_SCORE = 60  # Optional: can be dynamic later
+
+DEFAULT_QUESTION = "Tell me about yourself."
+
+def behavioral_question(state: InterviewState, index: int = 0) -> str:
+    """The index-th generated behavioral question, or DEFAULT_QUESTION if there is none."""
+    question = DEFAULT_QUESTION
+    if state.behavioral_patterns and "questions" in state.behavioral_patterns:
+        questions = state.behavioral_patterns["questions"]
+        if questions and len(questions) > index:
+            if isinstance(questions[index], dict) and "question" in questions[index]:
+                question = questions[index]["question"]
+            elif isinstance(questions[index], str):
+                question = questions[index]
+    return question
+
+def interview_question(state: InterviewState) -> str:
+    """The question the candidate answered: the first generated behavioral question."""
+    return behavioral_question(state, 0)
+
+def interview_answers(state: InterviewState) -> List[Tuple[str, str]]:
+    """(question, response) pairs to evaluate."""
+    if not state.candidate_answers:
+        return [(interview_question(state), state.candidate_response)]
+    return [
+        (answer.get("question") or behavioral_question(state, i), answer["response"])
+        for i, answer in enumerate(state.candidate_answers)
+    ]
+
+@traced_node("resume_analysis")
+async def resume_analysis_node(state: InterviewState) -> dict:
+    """Analyze resume and return the resume_scores update"""
     try:
-        resume_result = analyze_resume(state.resume_path, state.job_description)
+        resume_result = await aanalyze_resume(
+            state.resume_path,
+            state.job_description,
+            content=state.resume_content,
+            filename=state.resume_filename
+        )
         
         # Convert ResumeScore model to dictionary
         if hasattr(resume_result, 'model_dump'):
-            state.resume_scores = resume_result.model_dump()
+            resume_scores = resume_result.model_dump()
         elif hasattr(resume_result, 'dict'):
-            state.resume_scores = resume_result.dict()
+            resume_scores = resume_result.dict()
         else:
             # Fallback: assume it's already a dict or convert manually
-            state.resume_scores = dict(resume_result) if hasattr(resume_result, '__dict__') else resume_result
+            resume_scores = dict(resume_result) if hasattr(resume_result, '__dict__') else resume_result
             
-        print(f"Resume analysis completed: {state.resume_scores}")
+        print(f"Resume analysis completed: {resume_scores}")
     except Exception as e:
         print(f"Error in resume analysis: {e}")
+        record_fallback("resume_analysis")
         # Set default scores if analysis fails
-        state.resume_scores = {
+        resume_scores = {
             "clarity": 50,
             "relevance": 50,
             "structure": 50,
             "experience": 1,
             "feedback": ["Resume analysis failed - please check the file format"]
         }
-    return state
+    return {"resume_scores": resume_scores}
 
-def behavioral_analysis_node(state: InterviewState) -> InterviewState:
-    """Generate behavioral patterns and update state"""
+@traced_node("behavioral_analysis")
+async def behavioral_analysis_node(state: InterviewState) -> dict:
+    """Generate behavioral patterns and return the behavioral_patterns update"""
     try:
-        state.behavioral_patterns = get_behavioral_patterns(state.job_description)
-        print(f"Behavioral analysis completed: Found {len(state.behavioral_patterns.get('questions', []))} questions")
+        behavioral_patterns = await aget_behavioral_patterns(state.job_description)
+        print(f"Behavioral analysis completed: Found {len(behavioral_patterns.get('questions', []))} questions")
     except Exception as e:
         print(f"Error in behavioral analysis: {e}")
+        record_fallback("behavioral_analysis")
         # Set default behavioral patterns if analysis fails
-        state.behavioral_patterns = {
+        behavioral_patterns = {
             "questions": [
                 {
                     "question": "Tell me about yourself and your experience.",
@@ -50,27 +97,27 @@ def behavioral_analysis_node(state: InterviewState) -> InterviewState:
                 }
             ]
         }
-    return state
+    return {"behavioral_patterns": behavioral_patterns}
 
-def mock_evaluation_node(state: InterviewState) -> InterviewState:
-    """Evaluate mock interview response and update state"""
+@traced_node("mock_evaluation")
+async def mock_evaluation_node(state: InterviewState) -> dict:
+    """Evaluate mock interview response and return the mock_scores update"""
     try:
-        # Extract question from behavioral patterns
-        question = "Tell me about yourself."
-        if state.behavioral_patterns and "questions" in state.behavioral_patterns:
-            questions = state.behavioral_patterns["questions"]
-            if questions and len(questions) > 0:
-                if isinstance(questions[0], dict) and "question" in questions[0]:
-                    question = questions[0]["question"]
-                elif isinstance(questions[0], str):
-                    question = questions[0]
-        
-        state.mock_scores = evaluate_mock_response(question, state.candidate_response)
-        print(f"Mock evaluation completed: {state.mock_scores}")
+        answers = interview_answers(state)
+        if len(answers) == 1:
+            question, response = answers[0]
+            evaluation = await aevaluate_mock_response(question, response)
+            # Report the submitted pair, not the LLM's echo of it
+            mock_scores = {**evaluation, "question": question, "response": response}
+        else:
+            # All answers are evaluated concurrently, then averaged
+            mock_scores = aggregate_mock_scores(await aevaluate_mock_responses(answers))
+        print(f"Mock evaluation completed: {mock_scores}")
     except Exception as e:
         print(f"Error in mock evaluation: {e}")
+        record_fallback("mock_evaluation")
         # Set default scores if evaluation fails
-        state.mock_scores = {
+        mock_scores = {
             "question": "Tell me about yourself.",
             "response": state.candidate_response,
             "tone": 60,
@@ -78,39 +125,44 @@ def mock_evaluation_node(state: InterviewState) -> InterviewState:
             "confidence": 60,
             "feedback": ["Mock evaluation failed - using default scores"]
         }
-    return state
+    return {"mock_scores": mock_scores}
 
-def outcome_prediction_node(state: InterviewState) -> InterviewState:
-    """Predict interview outcome and update state"""
+@traced_node("outcome_prediction")
+async def outcome_prediction_node(state: InterviewState) -> dict:
+    """Predict interview outcome and return the outcome update"""
     try:
-        state.outcome = predict_outcome(
+        outcome = await apredict_outcome(
             resume_scores=state.resume_scores,
             mock_scores=state.mock_scores,
-            behavior_score=60  # Optional: can be dynamic later
+            behavior_score=BEHAVIOR_SCORE,
+            llm_reason=state.llm_reason
         )
-        print(f"Outcome prediction completed: {state.outcome}")
+        print(f"Outcome prediction completed: {outcome}")
     except Exception as e:
         print(f"Error in outcome prediction: {e}")
+        record_fallback("outcome_prediction")
         # Set default outcome if prediction fails
-        state.outcome = {
+        outcome = {
             "success_score": 65,
             "reason": "Analysis completed with mixed results. Focus on improving specific areas identified in feedback."
         }
-    return state
+    return {"outcome": outcome}
 
-def improvement_planning_node(state: InterviewState) -> InterviewState:
-    """Generate improvement plan and update state"""
+@traced_node("improvement_planning")
+async def improvement_planning_node(state: InterviewState) -> dict:
+    """Generate improvement plan and return the improvement_plan update"""
     try:
-        state.improvement_plan = generate_improvement_plan(
+        improvement_plan = await agenerate_improvement_plan(
             resume_scores=state.resume_scores,
             mock_scores=state.mock_scores,
             outcome=state.outcome
         )
-        print(f"Improvement planning completed: {state.improvement_plan}")
+        print(f"Improvement planning completed: {improvement_plan}")
     except Exception as e:
         print(f"Error in improvement planning: {e}")
+        record_fallback("improvement_planning")
         # Set default improvement plan if generation fails
-        state.improvement_plan = {
+        improvement_plan = {
             "priority_areas": ["Resume formatting", "Interview preparation"],
             "action_items": [
                 "Review and update resume format",
@@ -119,4 +171,40 @@ def improvement_planning_node(state: InterviewState) -> InterviewState:
             ],
             "timeline": "2-3 weeks"
         }
-    return state
\ No newline at end of file
+    return {"improvement_plan": improvement_plan}
+
+async def evaluate_step_by_step(state: InterviewState) -> dict:
+    """Mock evaluation, outcome prediction and improvement planning, one after another."""
+    update = {}
+    for node in (mock_evaluation_node, outcome_prediction_node, improvement_planning_node):
+        update.update(await node(state))
+        state = state.model_copy(update=update)
+    return update
+
+@traced_node("combined_evaluation")
+async def combined_evaluation_node(state: InterviewState) -> dict:
+    """
+    Fast mode: mock evaluation, outcome prediction and improvement planning from
+    one LLM call. Returns the mock_scores, outcome and improvement_plan updates.
+    If the combined call fails, the three steps run one after another instead.
+    """
+    answers = interview_answers(state)
+    if len(answers) > 1:
+        # The combined prompt scores one answer; several use the batched mock evaluation
+        return await evaluate_step_by_step(state)
+
+    question, response = answers[0]
+    try:
+        update = await aevaluate_combined(
+            resume_scores=state.resume_scores,
+            question=question,
+            response=response,
+            behavior_score=BEHAVIOR_SCORE,
+            llm_reason=state.llm_reason
+        )
+        print(f"Combined evaluation completed: {update['mock_scores']}, {update['outcome']}")
+        return update
+    except Exception as e:
+        print(f"Error in combined evaluation: {e}. Falling back to step-by-step evaluation.")
+        record_fallback("combined_evaluation")
+        return await evaluate_step_by_step(state)
@@ -1,38 +1,154 @@
 # graph/workflow.py
-from langgraph.graph import StateGraph, END
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from langgraph.graph import StateGraph, START, END
 from models import InterviewState
 from graph.nodes import (
     resume_analysis_node,
     behavioral_analysis_node,
     mock_evaluation_node,
     outcome_prediction_node,
-    improvement_planning_node
+    improvement_planning_node,
+    combined_evaluation_node
 )
 
-def build_graph():
-    """Build and compile the interview evaluation workflow graph"""
+# --- Configuration (overridable through .env) ---
+# "standard": mock evaluation, outcome prediction and improvement planning are
+#             three LLM calls, each seeing the previous one's output.
+# "fast":     one combined LLM call produces all three (same state fields).
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "standard").lower()
+
+NODES = {
+    "resume_analysis": resume_analysis_node,
+    "behavioral_analysis": behavioral_analysis_node,
+    "mock_evaluation": mock_evaluation_node,
+    "outcome_prediction": outcome_prediction_node,
+    "improvement_planning": improvement_planning_node,
+    "combined_evaluation": combined_evaluation_node
+}
+
+# The state fields each node reads (besides the request inputs) and writes
+NODE_INPUTS = {
+    "resume_analysis": (),
+    "behavioral_analysis": (),
+    # Mock evaluation only needs the behavioral questions, not the resume score
+    "mock_evaluation": ("behavioral_patterns",),
+    # Fan in: outcome prediction waits for both branches to finish
+    "outcome_prediction": ("resume_scores", "mock_scores"),
+    "improvement_planning": ("resume_scores", "mock_scores", "outcome"),
+    # One call needs both the questions and the resume score
+    "combined_evaluation": ("resume_scores", "behavioral_patterns")
+}
+NODE_OUTPUTS = {
+    "resume_analysis": ("resume_scores",),
+    "behavioral_analysis": ("behavioral_patterns",),
+    "mock_evaluation": ("mock_scores",),
+    "outcome_prediction": ("outcome",),
+    "improvement_planning": ("improvement_plan",),
+    "combined_evaluation": ("mock_scores", "outcome", "improvement_plan")
+}
+
+# Result fields a client can ask for, in pipeline order
+SECTIONS = ("resume_scores", "behavioral_patterns", "mock_scores", "outcome", "improvement_plan")
+
+def section_producers(mode: str, sections: Iterable[str]) -> Dict[str, str]:
+    """Which node produces each state field."""
+    producers = {}
+    for node in ("resume_analysis", "behavioral_analysis", "mock_evaluation",
+                 "outcome_prediction", "improvement_planning"):
+        for field in NODE_OUTPUTS[node]:
+            producers[field] = node
+    # Fast mode only pays off when the plan is wanted: without it, mock
+    # evaluation is the only LLM call left (the outcome reason is templated)
+    if mode == "fast" and "improvement_plan" in sections:
+        for field in NODE_OUTPUTS["combined_evaluation"]:
+            producers[field] = "combined_evaluation"
+    return producers
+
+def plan_nodes(sections: Iterable[str], mode: str = EVALUATION_MODE, supplied: Iterable[str] = ()) -> Tuple[str, ...]:
+    """
+    The minimal set of nodes that produces `sections`, walking NODE_INPUTS back
+    from the requested fields. Fields in `supplied` are already in the state.
+    """
+    sections = set(sections)
+    unknown = sections - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}. Choose from: {', '.join(SECTIONS)}")
+
+    producers = section_producers(mode, sections)
+    needed, pending = [], [f for f in SECTIONS if f in sections and f not in supplied]
+    while pending:
+        node = producers[pending.pop()]
+        if node in needed:
+            continue
+        needed.append(node)
+        pending.extend(f for f in NODE_INPUTS[node] if f not in supplied)
+    # Stable order, so equal plans share one compiled graph
+    return tuple(n for n in NODES if n in needed)
+
+def compile_nodes(nodes: Tuple[str, ...], name: str = "graph"):
+    """Wire `nodes` by their data dependencies and compile the graph."""
     try:
         graph = StateGraph(InterviewState)
-        
+        producers = {field: node for node in nodes for field in NODE_OUTPUTS[node]}
+        upstream: Dict[str, List[str]] = {}
+
         # Add nodes with unique names (not conflicting with state attributes)
-        graph.add_node("resume_analysis", resume_analysis_node)
-        graph.add_node("behavioral_analysis", behavioral_analysis_node)
-        graph.add_node("mock_evaluation", mock_evaluation_node)
-        graph.add_node("outcome_prediction", outcome_prediction_node)
-        graph.add_node("improvement_planning", improvement_planning_node)
-        
-        # Set entry point
-        graph.set_entry_point("resume_analysis")
-        
-        # Add edges to define the workflow
-        graph.add_edge("resume_analysis", "behavioral_analysis")
-        graph.add_edge("behavioral_analysis", "mock_evaluation")
-        graph.add_edge("mock_evaluation", "outcome_prediction")
-        graph.add_edge("outcome_prediction", "improvement_planning")
-        graph.add_edge("improvement_planning", END)
-        
+        ancestors: Dict[str, set] = {}
+        for node in nodes:
+            graph.add_node(node, NODES[node])
+            sources = {producers[f] for f in NODE_INPUTS[node] if f in producers}
+            # `nodes` is in pipeline order, so every source is already resolved
+            ancestors[node] = sources.union(*(ancestors[source] for source in sources))
+            # Skip sources another source already waits for (outcome_prediction
+            # has run after resume_analysis, so improvement_planning needs only it)
+            upstream[node] = sorted(
+                source for source in sources
+                if not any(source in ancestors[other] for other in sources)
+            )
+
+        for node, sources in upstream.items():
+            if not sources:
+                # Fan out: nodes without dependencies start together
+                graph.add_edge(START, node)
+            elif len(sources) == 1:
+                graph.add_edge(sources[0], node)
+            else:
+                # Fan in: wait for every source to finish
+                graph.add_edge(sources, node)
+
+        feeding = {source for sources in upstream.values() for source in sources}
+        for node in nodes:
+            if node not in feeding:
+                graph.add_edge(node, END)
+
         return graph.compile()
-    
+
     except Exception as e:
-        print(f"Error building graph: {e}")
-        raise e
\ No newline at end of file
+        print(f"Error building {name}: {e}")
+        raise e
+
+def build_graph(mode: str = EVALUATION_MODE):
+    """Build and compile the interview evaluation workflow graph"""
+    return compile_nodes(plan_nodes(SECTIONS, mode), "graph")
+
+def build_candidate_graph(mode: str = EVALUATION_MODE):
+    """
+    Build the per-candidate part of the workflow for batch evaluation.
+    The state must already carry behavioral_patterns, which depend only on the
+    job description and are computed once per batch.
+    """
+    return compile_nodes(plan_nodes(SECTIONS, mode, supplied=("behavioral_patterns",)), "candidate graph")
+
+@lru_cache(maxsize=None)
+def _compiled_plan(nodes: Tuple[str, ...]):
+    return compile_nodes(nodes, "section graph")
+
+def build_section_graph(sections: FrozenSet[str], mode: str = EVALUATION_MODE):
+    """
+    Graph running only the nodes `sections` depend on; e.g. outcome needs
+    resume and mock evaluation but not improvement planning. Compiled graphs
+    are cached per node set (there are only a handful).
+    """
+    return _compiled_plan(plan_nodes(sections, mode))
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from config import resolve_backend_path
+
+# --- Configuration (overridable through .env) ---
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+# Empty keeps the cache in memory only
+LLM_CACHE_PATH = resolve_backend_path("LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+LLM_CACHE_DISK_ENTRIES = int(os.getenv("LLM_CACHE_DISK_ENTRIES", "20000"))
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Content address for a call: llm_string carries the model name and parameters."""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class TieredLLMCache(BaseCache):
+    """
+    LangChain cache with an in-memory LRU tier in front of a SQLite tier.
+    Entries expire after ttl_seconds; both tiers are size-bounded and evict
+    least recently used entries first. Disk hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = LLM_CACHE_PATH,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        max_disk_entries: int = LLM_CACHE_DISK_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: RETURN_VAL_TYPE, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if self._expired(row[1], now):
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                        self._conn.commit()
+                    else:
+                        try:
+                            value = [loads(gen) for gen in _split_generations(row[0])]
+                        except Exception as e:
+                            print(f"Failed to load cached LLM response: {e}")
+                        else:
+                            self._conn.execute(
+                                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                            )
+                            self._conn.commit()
+                            self._remember(key, value, row[1])
+                            self._counters["disk_hits"] += 1
+                            return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            self._remember(key, return_val, now)
+            if self._conn is None:
+                return
+            try:
+                serialized = _join_generations([dumps(gen) for gen in return_val])
+            except Exception as e:
+                print(f"Failed to serialize LLM response for caching: {e}")
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now),
+            )
+            self._evict_disk(now)
+            self._conn.commit()
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._counters["evictions"] += overflow
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current tier sizes."""
+        with self._lock:
+            lookups = sum(self._counters[k] for k in ("memory_hits", "disk_hits", "misses"))
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            disk_entries = 0
+            if self._conn is not None:
+                (disk_entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            return {
+                **self._counters,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+
+# Generations are stored as one JSON document per line
+def _join_generations(serialized: Sequence[str]) -> str:
+    return "\n".join(serialized)
+
+
+def _split_generations(value: str) -> list:
+    return [line for line in value.split("\n") if line]
+
+
+def create_llm_cache() -> Optional[TieredLLMCache]:
+    """Build the shared cache from configuration, or None if caching is disabled."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return TieredLLMCache()
+    except Exception as e:
+        print(f"Failed to open persistent LLM cache, using memory only: {e}")
+        return TieredLLMCache(db_path=None)
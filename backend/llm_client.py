@@ -1,9 +1,120 @@
+import copy
+import json
+from typing import Any, List, Optional
+
 from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult
 from langchain_groq import ChatGroq
 
 load_dotenv()
-llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
+
+from llm_cache import create_llm_cache
+from llm_scheduler import LLMScheduler, estimate_tokens
+from single_flight import inflight
+from telemetry import LLMMetricsCallback, register_stats
+
+LLM_MODEL = "llama-3.1-8b-instant"
+
+# Shared response cache: every chain built on `llm` looks up
+# (model + parameters, rendered prompt) here before calling Groq
+llm_cache = create_llm_cache()
+if llm_cache is not None:
+    register_stats("llm_cache", llm_cache.stats)
+
+# Rate limits, priorities and retries for every Groq call in the process
+llm_scheduler = LLMScheduler()
+register_stats("llm_scheduler", llm_scheduler.stats)
+register_stats("single_flight", inflight.stats)
+
+
+def result_tokens(result: ChatResult) -> Optional[int]:
+    """Total tokens a call used, from the provider's usage report."""
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    if usage.get("total_tokens") is not None:
+        return usage["total_tokens"]
+    totals = [
+        (getattr(generation.message, "usage_metadata", None) or {}).get("total_tokens")
+        for generation in result.generations
+    ]
+    return sum(totals) if totals and None not in totals else None
+
+
+def shared_result(result: ChatResult) -> ChatResult:
+    """
+    Copy of a result for a caller that joined an in-flight identical call.
+    Its token usage is dropped so the metrics count the upstream call once.
+    """
+    result = copy.deepcopy(result)
+    if result.llm_output:
+        result.llm_output.pop("token_usage", None)
+    for generation in result.generations:
+        if getattr(generation.message, "usage_metadata", None):
+            generation.message.usage_metadata = None
+    return result
+
+
+class ScheduledChatModel(BaseChatModel):
+    """
+    Sends every call of the wrapped chat model through an LLMScheduler.
+    Cache lookups happen before _generate, so cached prompts never queue, and
+    identical prompts already in flight (same model, parameters and messages)
+    share that one call instead of queueing again.
+    Cache keys, model type and llm_output are those of the wrapped model, so
+    existing cache entries and metrics are unaffected by the wrapper.
+    """
+    model: BaseChatModel
+    scheduler: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return self.model._llm_type
+
+    @property
+    def _identifying_params(self):
+        return self.model._identifying_params
+
+    def _get_llm_string(self, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        return self.model._get_llm_string(stop=stop, **kwargs)
+
+    def _combine_llm_outputs(self, llm_outputs):
+        return self.model._combine_llm_outputs(llm_outputs)
+
+    def _call_key(self, messages, stop, kwargs) -> tuple:
+        rendered = json.dumps([[m.type, m.content] for m in messages], sort_keys=True, default=str)
+        return ("llm", self._get_llm_string(stop=stop, **kwargs), rendered)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return inflight.do(
+            self._call_key(messages, stop, kwargs),
+            lambda: self.scheduler.run(
+                lambda: self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                estimate_tokens([str(m.content) for m in messages]),
+                result_tokens
+            ),
+            shared_result
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return await inflight.ado(
+            self._call_key(messages, stop, kwargs),
+            lambda: self.scheduler.arun(
+                lambda: self.model._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                estimate_tokens([str(m.content) for m in messages]),
+                result_tokens
+            ),
+            shared_result
+        )
+
+
+llm = ScheduledChatModel(
+    # The scheduler retries with backoff, so the Groq client does not
+    model=ChatGroq(model=LLM_MODEL, temperature=0, max_retries=0),
+    scheduler=llm_scheduler,
+    cache=llm_cache,
+    callbacks=[LLMMetricsCallback(default_model=LLM_MODEL)]
+)
 
 if __name__=="__main__":
     res=llm.invoke("What is ai")
-    print(res)
\ No newline at end of file
+    print(res)
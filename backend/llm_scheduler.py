@@ -0,0 +1,405 @@
+import asyncio
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from telemetry import LLM_QUEUE_WAIT, LLM_RETRIES
+
+# --- Configuration (overridable through .env) ---
+# Provider limits for the account/model; 0 disables that limit.
+# The defaults are Groq's free-tier limits for llama-3.1-8b-instant.
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "30"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "6000"))
+# Processes sharing the account (uvicorn --workers reads WEB_CONCURRENCY too);
+# each process enforces its share of the limits above
+LLM_WORKERS = max(int(os.getenv("LLM_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))), 1)
+# LLM calls in flight across the process, and per request scope (see llm_request_scope)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUEST_CONCURRENCY = int(os.getenv("LLM_REQUEST_CONCURRENCY", "4"))
+LLM_BATCH_REQUEST_CONCURRENCY = int(os.getenv("LLM_BATCH_REQUEST_CONCURRENCY", "2"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+# A call that cannot get a slot within this long fails instead of queueing forever
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "300"))
+# Completion tokens reserved per call before the real usage is known
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "400"))
+
+# Lower runs first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+T = TypeVar("T")
+
+
+def per_worker(limit: int, workers: int = LLM_WORKERS) -> int:
+    """This process's share of an account-wide limit (0 stays unlimited)."""
+    return max(limit // workers, 1) if limit else 0
+
+
+class LLMQueueTimeout(TimeoutError):
+    """Raised when a call waited longer than the queue timeout for a slot."""
+
+
+def estimate_tokens(texts: List[str], completion_tokens: int = LLM_EXPECTED_COMPLETION_TOKENS) -> int:
+    # ~4 characters per token for English prose, plus room for the reply
+    return sum(len(text) for text in texts) // 4 + completion_tokens
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket holding at most per_minute units.
+    per_minute = 0 means unlimited. The level may go negative when a call
+    turns out to have used more tokens than were reserved for it.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay_for(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (a call larger than the bucket waits for a full one)."""
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        if self.capacity:
+            self._refill(now)
+            self.level -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) the difference between actual and reserved usage."""
+        if self.capacity:
+            self.level = min(self.capacity, self.level - delta)
+
+
+@dataclass
+class RequestScope:
+    """LLM calls made on behalf of one API request (or one background job)."""
+    priority: str = "interactive"
+    max_concurrency: int = 0   # 0 = no per-request cap
+    in_flight: int = 0
+
+
+_current_scope: ContextVar[Optional[RequestScope]] = ContextVar("llm_request_scope", default=None)
+
+
+@contextmanager
+def llm_request_scope(priority: str = "interactive", max_concurrency: int = LLM_REQUEST_CONCURRENCY):
+    """
+    Tag the LLM calls made inside the block (including tasks and to_thread
+    calls started from it) with a priority class and a shared concurrency cap.
+    Calls made outside any scope are interactive and uncapped.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority '{priority}'")
+    token = _current_scope.set(RequestScope(priority, max_concurrency))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+@dataclass
+class _Ticket:
+    scope: RequestScope
+    tokens: int
+    seq: int
+    enqueued_at: float
+    wake: Callable[[], None]
+
+    @property
+    def rank(self):
+        return (PRIORITIES[self.scope.priority], self.seq)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The Retry-After of a provider error response (seconds or HTTP date), if any."""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_reason(error: BaseException) -> Optional[str]:
+    """Why error is worth retrying ("rate_limited", "server_error", "connection"), or None."""
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return "rate_limited"
+    if isinstance(status, int) and status >= 500:
+        return "server_error"
+    try:
+        from groq import APIConnectionError  # also covers APITimeoutError
+    except ImportError:
+        return None
+    return "connection" if isinstance(error, APIConnectionError) else None
+
+
+class LLMScheduler:
+    """
+    Admission control in front of the LLM provider.
+
+    A call first waits for a slot: it must be the highest-priority waiting call
+    whose request scope is under its cap, the process must be under
+    max_concurrency, and the request (RPM) and token (TPM) buckets must cover
+    it. Token usage is reserved from an estimate and reconciled with the real
+    usage afterwards. Retryable errors (429, 5xx, connection problems) are
+    retried with jittered exponential backoff; a 429's Retry-After pauses all
+    admissions until it has passed, since the provider counts every attempt.
+
+    Works for both sync callers (worker threads) and async callers (event loop).
+    """
+
+    def __init__(
+        self,
+        rpm: int = per_worker(LLM_RPM_LIMIT),
+        tpm: int = per_worker(LLM_TPM_LIMIT),
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = LLM_BACKOFF_MAX_SECONDS,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._waiting: List[_Ticket] = []
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._counters = {"granted": 0, "retries": 0, "rate_limited": 0, "failed": 0, "queue_timeouts": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # --- Admission ---
+    def _enqueue(self, tokens: int, wake: Callable[[], None]) -> _Ticket:
+        scope = _current_scope.get() or RequestScope()
+        with self._lock:
+            ticket = _Ticket(scope, tokens, next(self._seq), time.monotonic(), wake)
+            self._waiting.append(ticket)
+        return ticket
+
+    def _notify(self) -> None:
+        # Every waiter re-checks; the queue is short, so this stays cheap
+        for ticket in self._waiting:
+            ticket.wake()
+
+    def _try_grant(self, ticket: _Ticket) -> Optional[float]:
+        """
+        Called with the lock held. Returns 0 if the ticket was granted, the
+        number of seconds to wait before trying again, or None to wait until
+        another call finishes or is granted.
+        """
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return None
+        eligible = [
+            t for t in self._waiting
+            if not t.scope.max_concurrency or t.scope.in_flight < t.scope.max_concurrency
+        ]
+        if min(eligible, key=lambda t: t.rank, default=None) is not ticket:
+            return None
+        now = time.monotonic()
+        delay = max(
+            self._paused_until - now,
+            self.requests.delay_for(1, now),
+            self.tokens.delay_for(ticket.tokens, now),
+        )
+        if delay > 0:
+            return delay
+
+        self._waiting.remove(ticket)
+        self._in_flight += 1
+        ticket.scope.in_flight += 1
+        self.requests.take(1, now)
+        self.tokens.take(ticket.tokens, now)
+        waited = now - ticket.enqueued_at
+        self._counters["granted"] += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        LLM_QUEUE_WAIT.labels(priority=ticket.scope.priority).observe(waited)
+        # The next ticket in line may now be eligible
+        self._notify()
+        return 0.0
+
+    def _withdraw(self, ticket: _Ticket) -> None:
+        """Drop a ticket that stopped waiting, so it no longer blocks the tickets behind it."""
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._notify()
+
+    def _timed_out(self, ticket: _Ticket) -> None:
+        self._withdraw(ticket)
+        with self._lock:
+            self._counters["queue_timeouts"] += 1
+        raise LLMQueueTimeout(f"LLM call waited more than {self.queue_timeout:.0f}s for a rate-limit slot")
+
+    def acquire(self, tokens: int) -> _Ticket:
+        """Block the calling thread until the call may start."""
+        event = threading.Event()
+        ticket = self._enqueue(tokens, event.set)
+        deadline = ticket.enqueued_at + self.queue_timeout
+        try:
+            while True:
+                with self._lock:
+                    # Cleared under the lock, so a wake-up after the check is not lost
+                    event.clear()
+                    delay = self._try_grant(ticket)
+                if delay == 0:
+                    return ticket
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timed_out(ticket)
+                event.wait(min(delay, remaining) if delay is not None else remaining)
+        except BaseException:
+            # Interrupted while waiting: leave the queue (a no-op after a timeout)
+            self._withdraw(ticket)
+            raise
+
+    async def aacquire(self, tokens: int) -> _Ticket:
+        """Wait (without blocking the event loop) until the call may start."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        ticket = self._enqueue(tokens, lambda: loop.call_soon_threadsafe(event.set))
+        deadline = ticket.enqueued_at + self.queue_timeout
+        try:
+            while True:
+                with self._lock:
+                    event.clear()
+                    delay = self._try_grant(ticket)
+                if delay == 0:
+                    return ticket
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timed_out(ticket)
+                try:
+                    await asyncio.wait_for(event.wait(), min(delay, remaining) if delay is not None else remaining)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            # Cancelled while waiting (client disconnect, outer timeout): leave the queue
+            self._withdraw(ticket)
+            raise
+
+    def release(self, ticket: _Ticket, used_tokens: Optional[int] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            ticket.scope.in_flight -= 1
+            if used_tokens is not None:
+                self.tokens.adjust(used_tokens - ticket.tokens)
+            self._notify()
+
+    # --- Retries ---
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after error, or None if it should not be retried."""
+        reason = retry_reason(error)
+        if reason is None or attempt >= self.max_retries:
+            return None
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        # Equal jitter: keep at least half the backoff, spread the rest
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        with self._lock:
+            self._counters["retries"] += 1
+            if reason == "rate_limited":
+                self._counters["rate_limited"] += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        LLM_RETRIES.labels(reason=reason).inc()
+        print(f"LLM call failed ({reason}: {error}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def _failed(self) -> None:
+        with self._lock:
+            self._counters["failed"] += 1
+
+    def run(self, call: Callable[[], T], tokens: int, usage: Callable[[T], Optional[int]] = lambda _: None) -> T:
+        """Run call() once admitted, retrying retryable errors. usage(result) reports the tokens used."""
+        for attempt in itertools.count():
+            ticket = self.acquire(tokens)
+            try:
+                result = call()
+            except Exception as e:
+                self.release(ticket)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    self._failed()
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # Interrupted mid-call: free the slot, never retry
+                self.release(ticket)
+                raise
+            self.release(ticket, usage(result))
+            return result
+
+    async def arun(
+        self,
+        call: Callable[[], Awaitable[T]],
+        tokens: int,
+        usage: Callable[[T], Optional[int]] = lambda _: None
+    ) -> T:
+        """Async counterpart of run(); call() returns a fresh awaitable per attempt."""
+        for attempt in itertools.count():
+            ticket = await self.aacquire(tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                self.release(ticket)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    self._failed()
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled mid-call (client disconnect, outer timeout): free the slot, never retry
+                self.release(ticket)
+                raise
+            self.release(ticket, usage(result))
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waiting = {name: 0 for name in PRIORITIES}
+            for ticket in self._waiting:
+                waiting[ticket.scope.priority] += 1
+            granted = self._counters["granted"]
+            return {
+                **self._counters,
+                "queue_depth": len(self._waiting),
+                **{f"queue_depth_{name}": count for name, count in waiting.items()},
+                "in_flight": self._in_flight,
+                "avg_wait_seconds": self._wait_total / granted if granted else 0.0,
+                "max_wait_seconds": self._wait_max,
+            }
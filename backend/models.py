@@ -1,15 +1,27 @@
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from pydantic import BaseModel, field_validator
-from langgraph.graph import add_messages
-from typing_extensions import Annotated
+
+# Fields that carry the uploaded resume itself and must never be returned to clients
+RESUME_INPUT_FIELDS = ('resume_path', 'resume_content', 'resume_filename')
+# Request options that steer the workflow but are not part of the result
+REQUEST_INPUT_FIELDS = ('llm_reason', 'candidate_answers')
 
 class InterviewState(BaseModel):
     """State model for the interview evaluation workflow"""
     
-    # Input fields
-    resume_path: str
+    # Input fields - the resume is either held in memory (resume_content +
+    # resume_filename) or, for large uploads, spilled to disk at resume_path
+    resume_path: Optional[str] = None
+    resume_content: Optional[bytes] = None
+    resume_filename: Optional[str] = None
     job_description: str
     candidate_response: str
+    # Several answers in one submission: {"response": ..., "question": ...}
+    # items; without a question, item i answers the i-th behavioral question.
+    # When set, these are evaluated instead of candidate_response.
+    candidate_answers: Optional[List[Dict[str, str]]] = None
+    # Write the outcome reason with the LLM; None uses OUTCOME_LLM_REASON
+    llm_reason: Optional[bool] = None
     
     # Output fields - these will be populated by the workflow nodes
     resume_scores: Optional[Union[Dict[str, Any], BaseModel]] = None
@@ -34,9 +46,9 @@ class InterviewState(BaseModel):
         arbitrary_types_allowed = True
         
     def model_dump(self, **kwargs):
-        """Custom model_dump to exclude file paths and only return results"""
+        """Custom model_dump to exclude the uploaded resume and only return results"""
         result = super().model_dump(**kwargs)
-        # Remove file path for security/privacy
-        if 'resume_path' in result:
-            del result['resume_path']
+        # Remove file path and raw upload for security/privacy, and request options
+        for field in RESUME_INPUT_FIELDS + REQUEST_INPUT_FIELDS:
+            result.pop(field, None)
         return result
\ No newline at end of file
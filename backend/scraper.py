@@ -0,0 +1,210 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from newspaper import Article
+
+from telemetry import record_external
+
+# --- Configuration (overridable through .env) ---
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_MAX_CONNECTIONS = int(os.getenv("SCRAPE_MAX_CONNECTIONS", "20"))
+SCRAPE_DOMAIN_INTERVAL_SECONDS = float(os.getenv("SCRAPE_DOMAIN_INTERVAL_SECONDS", "1.0"))
+SCRAPE_TIMEOUT_SECONDS = float(os.getenv("SCRAPE_TIMEOUT_SECONDS", "15"))
+SCRAPE_USER_AGENT = os.getenv(
+    "SCRAPE_USER_AGENT",
+    "Mozilla/5.0 (compatible; InterviewPrepBot/1.0; +https://github.com/)"
+)
+
+
+def parse_article_html(url: str, html: str) -> Tuple[str, str]:
+    """Extract (text, title) from already-downloaded HTML with newspaper. CPU-bound."""
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return article.text, article.title
+
+
+class DomainRateLimiter:
+    """Spaces out requests to the same host by at least `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_allowed: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, domain: str) -> None:
+        if self.interval <= 0:
+            return
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            delay = self._next_allowed.get(domain, 0.0) - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now += delay
+            self._next_allowed[domain] = now + self.interval
+
+
+class PageFetcher:
+    """
+    Async page fetch stage used by the knowledge base:
+    - one keep-alive connection pool (httpx.AsyncClient) shared by all fetches
+    - at most `concurrency` downloads in flight, and per-domain spacing
+    - conditional GET: pass the ETag/Last-Modified from the previous fetch and
+      an unchanged page comes back as 304 with no body (not_modified=True)
+    - HTML parsing runs in a worker thread so the event loop keeps serving requests
+
+    The client, semaphore and rate limiter belong to the event loop that created
+    them; fetch_all_sync() runs on a private loop with its own short-lived pool.
+    `transport` can be swapped for httpx.MockTransport in benchmarks.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        max_connections: int = SCRAPE_MAX_CONNECTIONS,
+        domain_interval: float = SCRAPE_DOMAIN_INTERVAL_SECONDS,
+        timeout: float = SCRAPE_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+        self.domain_interval = domain_interval
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[DomainRateLimiter] = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": SCRAPE_USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self.transport
+            )
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._limiter = DomainRateLimiter(self.domain_interval)
+        return self._client
+
+    async def fetch(self, url: str, validators: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fetch and parse one page. The result carries content, title, url,
+        success, not_modified, etag, last_modified and last_scraped.
+        """
+        client = self._ensure_client()
+        validators = validators or {}
+        page = {
+            'content': '',
+            'title': '',
+            'url': url,
+            'success': False,
+            'not_modified': False,
+            'etag': None,
+            'last_modified': None,
+            'last_scraped': datetime.now().isoformat()
+        }
+
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        async with self._semaphore:
+            await self._limiter.wait(urlparse(url).netloc.lower())
+            start = time.perf_counter()
+            try:
+                response = await client.get(url, headers=headers)
+                if response.status_code == 304:
+                    record_external("page_fetch", time.perf_counter() - start, status="not_modified")
+                    page.update(
+                        success=True,
+                        not_modified=True,
+                        etag=response.headers.get("etag", validators.get("etag")),
+                        last_modified=response.headers.get("last-modified", validators.get("last_modified"))
+                    )
+                    return page
+                response.raise_for_status()
+                html = response.text
+                record_external("page_fetch", time.perf_counter() - start)
+            except Exception as e:
+                record_external("page_fetch", time.perf_counter() - start, status="error")
+                print(f"Failed to fetch {url}: {e}")
+                return page
+
+        # Parse after releasing the download slot so the next fetch can start
+        start = time.perf_counter()
+        try:
+            text, title = await asyncio.to_thread(parse_article_html, url, html)
+            record_external("html_parse", time.perf_counter() - start)
+        except Exception as e:
+            record_external("html_parse", time.perf_counter() - start, status="error")
+            print(f"Failed to parse {url}: {e}")
+            return page
+
+        page.update(
+            content=text,
+            title=title or 'Untitled',
+            success=True,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified")
+        )
+        return page
+
+    async def fetch_all(
+        self,
+        urls: List[str],
+        validators: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch several pages concurrently; results are in the same order as urls."""
+        validators = validators or {}
+        return list(await asyncio.gather(*(self.fetch(url, validators.get(url)) for url in urls)))
+
+    def fetch_all_sync(
+        self,
+        urls: List[str],
+        validators: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Blocking counterpart of fetch_all for scheduler/CLI code. Must not be
+        called from a thread that is already running an event loop.
+        """
+        fetcher = PageFetcher(
+            concurrency=self.concurrency,
+            max_connections=self.max_connections,
+            domain_interval=self.domain_interval,
+            timeout=self.timeout,
+            transport=self.transport
+        )
+
+        async def run():
+            try:
+                return await fetcher.fetch_all(urls, validators)
+            finally:
+                await fetcher.aclose()
+
+        return asyncio.run(run())
+
+    async def aclose(self) -> None:
+        """Close the connection pool (called on API shutdown)."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+page_fetcher = PageFetcher()
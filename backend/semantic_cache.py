@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import resolve_backend_path
+
+# --- Configuration (overridable through .env) ---
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+# Empty keeps the cache in memory only
+SEMANTIC_CACHE_PATH = resolve_backend_path("SEMANTIC_CACHE_PATH", "semantic_cache.db")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+
+
+def text_key(namespace: str, text: str) -> str:
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(f"{namespace}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+class SemanticCache:
+    """
+    Maps the embedding of a text (a job description) to a JSON-serializable
+    result. lookup() returns the stored result of the most similar entry if its
+    cosine similarity reaches the threshold, so near-identical inputs (reposted
+    reqs, a template with a different location) share one generation.
+
+    Entries live in memory (LRU, at most max_entries, expiring after
+    ttl_seconds) and are mirrored to SQLite so they survive restarts.
+    `namespace` separates entries made with different embedding/LLM models.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = SEMANTIC_CACHE_PATH,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: int = SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (namespace, unit vector, serialized value, created_at)
+        self._entries: "OrderedDict[str, Tuple[str, np.ndarray, str, float]]" = OrderedDict()
+        # Stacked vectors per namespace, rebuilt lazily after any change
+        self._matrices: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, vector BLOB NOT NULL, "
+                "value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self) -> None:
+        now = time.time()
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM semantic_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT key, namespace, vector, value, created_at FROM semantic_cache "
+            "ORDER BY accessed_at DESC LIMIT ?", (self.max_entries,)
+        ).fetchall()
+        # Oldest first, so the most recently used entries end up at the LRU tail
+        for key, namespace, vector, value, created_at in reversed(rows):
+            self._entries[key] = (namespace, np.frombuffer(vector, dtype=np.float32), value, created_at)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _matrix(self, namespace: str) -> Tuple[List[str], np.ndarray]:
+        if namespace not in self._matrices:
+            keys = [key for key, entry in self._entries.items() if entry[0] == namespace]
+            vectors = np.stack([self._entries[key][1] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+            self._matrices[namespace] = (keys, vectors)
+        return self._matrices[namespace]
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._matrices.pop(entry[0], None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM semantic_cache WHERE key = ?", (key,))
+
+    def lookup(self, vector: Sequence[float], namespace: str = "") -> Optional[Tuple[Any, float]]:
+        """Return (value, similarity) of the closest entry at or above the threshold, else None."""
+        query = _unit(vector)
+        now = time.time()
+        with self._lock:
+            keys, matrix = self._matrix(namespace)
+            if keys and matrix.shape[1] == query.shape[0]:
+                similarities = matrix @ query
+                expired = False
+                # Best match first; an expired entry gives way to the next one above the threshold
+                for index in np.argsort(-similarities):
+                    similarity = float(similarities[index])
+                    if similarity < self.threshold:
+                        break
+                    key = keys[index]
+                    _, _, value, created_at = self._entries[key]
+                    if self._expired(created_at, now):
+                        self._drop(key)
+                        self._counters["expired"] += 1
+                        expired = True
+                        continue
+                    self._entries.move_to_end(key)
+                    if self._conn is not None:
+                        self._conn.execute(
+                            "UPDATE semantic_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._conn.commit()
+                    self._counters["hits"] += 1
+                    return json.loads(value), similarity
+                if expired and self._conn is not None:
+                    self._conn.commit()
+            self._counters["misses"] += 1
+            return None
+
+    def update(self, text: str, vector: Sequence[float], value: Any, namespace: str = "") -> None:
+        """Store value for text; an existing entry for the same text is replaced."""
+        key = text_key(namespace, text)
+        unit = _unit(vector)
+        serialized = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (namespace, unit, serialized, now)
+            self._entries.move_to_end(key)
+            self._matrices.pop(namespace, None)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO semantic_cache "
+                    "(key, namespace, vector, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, namespace, unit.tobytes(), serialized, now, now),
+                )
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._counters["evictions"] += 1
+            if self._conn is not None:
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM semantic_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """Build the behavioral question cache from configuration, or None if disabled."""
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        return SemanticCache()
+    except Exception as e:
+        print(f"Failed to open persistent semantic cache, using memory only: {e}")
+        return SemanticCache(db_path=None)
@@ -0,0 +1,135 @@
+import asyncio
+import copy
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The call the followers were waiting on was cancelled; they retry on their own."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs the work, callers that arrive while it is in flight wait for
+    it and get its result, or its exception. Nothing is remembered after
+    the call finishes; this is not a cache.
+
+    Keys are (name, ...) tuples; name groups the counters in stats(). Sync
+    callers (threads) and async callers (event loop) share the same in-flight
+    table, so a worker thread and a request coroutine asking for the same
+    thing still cost one computation. Followers get a deep copy of the
+    result (or follower_result(result)), so nobody mutates the leader's object.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+
+    def _count(self, key: Tuple, outcome: str) -> None:
+        name = f"{key[0]}_{outcome}"
+        self._counters[name] = self._counters.get(name, 0) + 1
+
+    def _join(self, key: Tuple) -> Tuple[Future, bool]:
+        """Return (future, is_leader) for key."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._count(key, "coalesced")
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._count(key, "leaders")
+            return future, True
+
+    def _finish(self, key: Tuple, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(
+        self,
+        key: Tuple,
+        fn: Callable[[], T],
+        follower_result: Callable[[T], T] = copy.deepcopy
+    ) -> T:
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    return follower_result(future.result())
+                except _LeaderCancelled:
+                    continue
+            # The key is released before the future resolves, so followers that
+            # retry after a cancelled leader never rejoin the finished call
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, future)
+                future.set_exception(e if isinstance(e, Exception) else _LeaderCancelled())
+                raise
+            self._finish(key, future)
+            future.set_result(result)
+            return result
+
+    async def ado(
+        self,
+        key: Tuple,
+        fn: Callable[[], Awaitable[T]],
+        follower_result: Callable[[T], T] = copy.deepcopy
+    ) -> T:
+        """Async counterpart of do(); fn() returns the awaitable to run if this caller leads."""
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    # shield: a cancelled follower must not cancel the shared call
+                    return follower_result(await asyncio.shield(asyncio.wrap_future(future)))
+                except _LeaderCancelled:
+                    continue
+            try:
+                result = await fn()
+            except BaseException as e:
+                # A cancelled leader hands the work back to the followers
+                self._finish(key, future)
+                future.set_exception(e if isinstance(e, Exception) else _LeaderCancelled())
+                raise
+            self._finish(key, future)
+            future.set_result(result)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._calls)}
+
+
+# Shared by the JD-keyed agent stages and the LLM client
+inflight = SingleFlight()
+
+
+def coalesced(name: str):
+    """
+    Decorator coalescing concurrent calls with equal (hashable) arguments
+    through `inflight`. Decorate a function and its async counterpart with the
+    same name and they share in-flight calls with each other.
+    """
+    def decorator(fn):
+        def key(args, kwargs) -> Tuple:
+            return (name, *args, *sorted(kwargs.items()))
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await inflight.ado(key(args, kwargs), lambda: fn(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return inflight.do(key(args, kwargs), lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
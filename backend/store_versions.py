@@ -0,0 +1,108 @@
+import os
+import re
+import shutil
+from typing import List, Optional
+
+from filelock import FileLock
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+LOCK_FILE = ".write.lock"
+_VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+class VersionedStore:
+    """
+    Copy-on-write versions of a persisted store, for many reader processes and
+    one writer at a time:
+
+        <root>/versions/v000001/   complete store (vector files + source index)
+        <root>/versions/v000002/
+        <root>/CURRENT             name of the published version
+        <root>/.write.lock         held by whichever process is writing
+
+    A writer takes the lock, copies the current version to a new one, mutates
+    the copy and publishes it by atomically replacing CURRENT. Readers never
+    see a half-written store: they keep using the version they opened until
+    they notice CURRENT changed and open the new one. Old versions are pruned,
+    keeping the newest keep_versions for readers still finishing on them.
+    """
+
+    def __init__(self, root: str, keep_versions: int = 3, lock_timeout: float = 300):
+        self.root = os.path.abspath(root)
+        self.keep_versions = max(keep_versions, 1)
+        os.makedirs(os.path.join(self.root, VERSIONS_DIR), exist_ok=True)
+        self.lock = FileLock(os.path.join(self.root, LOCK_FILE), timeout=lock_timeout)
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.root, VERSIONS_DIR, version)
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and os.path.isdir(self.path(version)) else None
+
+    def versions(self) -> List[str]:
+        """All version directories, oldest first."""
+        names = [n for n in os.listdir(os.path.join(self.root, VERSIONS_DIR)) if _VERSION_PATTERN.match(n)]
+        return sorted(names, key=lambda n: int(_VERSION_PATTERN.match(n).group(1)))
+
+    def _next_version(self) -> str:
+        existing = self.versions()
+        number = int(_VERSION_PATTERN.match(existing[-1]).group(1)) + 1 if existing else 1
+        return f"v{number:06d}"
+
+    def stage(self, base: Optional[str] = None) -> str:
+        """Create the next version directory, as a copy of base if given. Call with the lock held."""
+        version = self._next_version()
+        if base:
+            shutil.copytree(self.path(base), self.path(version))
+        else:
+            os.makedirs(self.path(version))
+        return version
+
+    def stage_legacy(self) -> Optional[str]:
+        """
+        Copy a store persisted directly in root (the layout before versioning)
+        into a new version directory. The original files are left in place, so
+        an older build pointed at the same directory still works. Returns None
+        if there is nothing to copy. Call with the lock held.
+        """
+        legacy = [
+            name for name in os.listdir(self.root)
+            if name not in (VERSIONS_DIR, CURRENT_FILE, LOCK_FILE) and not name.endswith(".tmp")
+        ]
+        if not legacy:
+            return None
+        version = self.stage()
+        for name in legacy:
+            source, target = os.path.join(self.root, name), os.path.join(self.path(version), name)
+            if os.path.isdir(source):
+                shutil.copytree(source, target)
+            else:
+                shutil.copy2(source, target)
+        print(f"Copied existing store in {self.root} to version {version}")
+        return version
+
+    def publish(self, version: str) -> None:
+        """Point CURRENT at version (atomic rename) and prune old versions. Call with the lock held."""
+        current_path = os.path.join(self.root, CURRENT_FILE)
+        with open(f"{current_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{current_path}.tmp", current_path)
+        self.prune()
+
+    def discard(self, version: str) -> None:
+        shutil.rmtree(self.path(version), ignore_errors=True)
+
+    def prune(self) -> None:
+        current = self.current_version()
+        versions = self.versions()
+        for version in versions[:-self.keep_versions]:
+            if version != current:
+                self.discard(version)
@@ -0,0 +1,188 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+# ----------------------------
+# Metric definitions
+# ----------------------------
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+NODE_DURATION = Histogram(
+    "interview_node_duration_seconds",
+    "Wall-clock time of each graph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_FALLBACKS = Counter(
+    "interview_node_fallbacks_total",
+    "Times a node swallowed an exception and returned its default output",
+    ["node"],
+)
+LLM_DURATION = Histogram(
+    "interview_llm_call_duration_seconds",
+    "Latency of each LLM invocation",
+    ["model", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "interview_llm_tokens_total",
+    "Tokens consumed by LLM invocations",
+    ["model", "kind"],
+)
+LLM_QUEUE_WAIT = Histogram(
+    "interview_llm_queue_wait_seconds",
+    "Time an LLM call waited in the scheduler for a rate-limit/concurrency slot",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_RETRIES = Counter(
+    "interview_llm_retries_total",
+    "LLM calls retried by the scheduler after a retryable provider error",
+    ["reason"],
+)
+EXTERNAL_DURATION = Histogram(
+    "interview_external_call_duration_seconds",
+    "Latency of calls to Chroma, Tavily and page fetching/parsing",
+    ["service", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ----------------------------
+# Spans
+# ----------------------------
+
+@contextmanager
+def external_span(service: str):
+    """Time a call to an external dependency; status is "error" if the block raises."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        EXTERNAL_DURATION.labels(service=service, status=status).observe(time.perf_counter() - start)
+
+
+def record_external(service: str, seconds: float, status: str = "ok") -> None:
+    """Record an external call whose outcome is only known after it returns."""
+    EXTERNAL_DURATION.labels(service=service, status=status).observe(seconds)
+
+
+def traced_node(node: str):
+    """Decorator recording the duration of an async graph node."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                NODE_DURATION.labels(node=node).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record_fallback(node: str) -> None:
+    NODE_FALLBACKS.labels(node=node).inc()
+
+# ----------------------------
+# LLM instrumentation
+# ----------------------------
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records latency and token usage for every call made through the shared LLM."""
+
+    def __init__(self, default_model: str = "unknown"):
+        self.default_model = default_model
+        self._started: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def _elapsed(self, run_id: UUID) -> Optional[float]:
+        with self._lock:
+            start = self._started.pop(run_id, None)
+        return None if start is None else time.perf_counter() - start
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        llm_output = response.llm_output or {}
+        model = llm_output.get("model_name") or self.default_model
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            LLM_DURATION.labels(model=model, status="ok").observe(elapsed)
+
+        usage = llm_output.get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if prompt_tokens is None:
+            # Fall back to per-message usage metadata when llm_output has none
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    prompt_tokens = (prompt_tokens or 0) + metadata.get("input_tokens", 0)
+                    completion_tokens = (completion_tokens or 0) + metadata.get("output_tokens", 0)
+        if prompt_tokens:
+            LLM_TOKENS.labels(model=model, kind="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(model=model, kind="completion").inc(completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            LLM_DURATION.labels(model=self.default_model, status="error").observe(elapsed)
+
+# ----------------------------
+# Component stats (caches etc.)
+# ----------------------------
+
+class StatsCollector:
+    """Exposes numeric values from registered stats() callables as Prometheus gauges."""
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, stats_fn: Callable[[], Dict[str, Any]]) -> None:
+        self._sources[name] = stats_fn
+
+    def collect(self):
+        for name, stats_fn in list(self._sources.items()):
+            try:
+                stats = stats_fn()
+            except Exception as e:
+                print(f"Failed to collect stats for {name}: {e}")
+                continue
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"interview_{name}_{key}", f"{name} {key}", value=value)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def register_stats(name: str, stats_fn: Callable[[], Dict[str, Any]]) -> None:
+    stats_collector.register(name, stats_fn)
+
+
+def render_metrics():
+    """Return (body, content_type) in Prometheus text exposition format."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Backend modules import each other by top-level name (e.g. `from telemetry import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Module-level caches and stores are created on import; keep them out of the tree
+_workdir = tempfile.mkdtemp(prefix="interview-tests-")
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_workdir, "llm_cache.db"))
+os.environ.setdefault("SEMANTIC_CACHE_PATH", os.path.join(_workdir, "semantic_cache.db"))
+os.environ.setdefault("EMBEDDING_CACHE_DIR", os.path.join(_workdir, "embedding_cache"))
+os.environ.setdefault("KB_PERSIST_DIR", os.path.join(_workdir, "knowledge_base"))
+os.environ.setdefault("GROQ_API_KEY", "offline-tests")
+os.environ.setdefault("TAVILY_API_KEY", "offline-tests")
@@ -0,0 +1,25 @@
+from embedding_cache import EmbeddingStore
+
+
+def test_stores_sharing_a_directory_keep_their_own_rows(tmp_path):
+    first = EmbeddingStore(str(tmp_path), "model")
+    second = EmbeddingStore(str(tmp_path), "model")
+
+    first.put_many(["ka"], [[1.0, 1.0]])
+    second.put_many(["kb"], [[2.0, 2.0]])
+
+    expected = [[1.0, 1.0], [2.0, 2.0]]
+    assert first.get_many(["ka", "kb"]) == expected
+    assert second.get_many(["ka", "kb"]) == expected
+    assert EmbeddingStore(str(tmp_path), "model").get_many(["ka", "kb"]) == expected
+
+
+def test_torn_row_is_cut_off_before_appending(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model")
+    store.put_many(["ka"], [[1.0, 1.0]])
+    # Half a row left by a writer that crashed mid-append
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(b"\0" * 4)
+
+    store.put_many(["kb"], [[2.0, 2.0]])
+    assert EmbeddingStore(str(tmp_path), "model").get_many(["ka", "kb"]) == [[1.0, 1.0], [2.0, 2.0]]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from llm_scheduler import LLMScheduler, llm_request_scope
+
+
+def make_scheduler(**kwargs) -> LLMScheduler:
+    # No rate limits: only the concurrency caps decide admission
+    return LLMScheduler(rpm=0, tpm=0, queue_timeout=2, **kwargs)
+
+
+async def finish(value):
+    await asyncio.sleep(0.01)
+    return value
+
+
+def test_cancelled_in_flight_calls_release_their_slots():
+    scheduler = make_scheduler(max_concurrency=2)
+
+    async def main():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        tasks = [asyncio.create_task(scheduler.arun(hang, 1)) for _ in range(2)]
+        await started.wait()
+        await asyncio.sleep(0)
+        assert scheduler.stats()["in_flight"] == 2
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert scheduler.stats()["in_flight"] == 0
+        assert await scheduler.arun(lambda: finish("ok"), 1) == "ok"
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiting_call_leaves_the_queue():
+    scheduler = make_scheduler(max_concurrency=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "held"
+
+        holder = asyncio.create_task(scheduler.arun(hold, 1))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(scheduler.arun(lambda: finish("never"), 1))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["queue_depth"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.stats()["queue_depth"] == 0
+
+        # A later call queues behind the holder, not behind the cancelled ticket
+        later = asyncio.create_task(scheduler.arun(lambda: finish("later"), 1))
+        release.set()
+        assert await holder == "held"
+        assert await later == "later"
+        assert scheduler.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_scope_call_frees_the_scope_cap():
+    scheduler = make_scheduler(max_concurrency=8)
+
+    async def main():
+        with llm_request_scope("interactive", max_concurrency=1):
+            task = asyncio.create_task(scheduler.arun(lambda: asyncio.sleep(60), 1))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert await scheduler.arun(lambda: finish("ok"), 1) == "ok"
+
+    asyncio.run(main())
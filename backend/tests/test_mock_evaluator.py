@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from agents.mock_evaluator import aggregate_mock_scores, collect_evaluations
+from graph import nodes
+from models import InterviewState
+
+ANSWERS = [
+    ("Tell me about a conflict.", "I listened first."),
+    ("Describe a failure.", "I missed a deadline once."),
+    ("Why this role?", "It fits my experience."),
+]
+
+
+def llm_output(tone, confidence, relevance, feedback, question="echoed question", response="echoed response"):
+    return {"text": json.dumps({
+        "question": question, "response": response,
+        "tone": tone, "confidence": confidence, "relevance": relevance, "feedback": feedback,
+    })}
+
+
+def test_collect_evaluations_keeps_submitted_pairs_in_order():
+    evaluations = collect_evaluations(ANSWERS[:2], [
+        llm_output(70, 60, 80, ["Add a result"]),
+        llm_output(50, 40, 90, ["Be specific"]),
+    ])
+
+    assert [(e["question"], e["response"]) for e in evaluations] == ANSWERS[:2]
+    assert [e["tone"] for e in evaluations] == [70, 50]
+
+
+def test_failed_answers_are_kept_with_their_error():
+    evaluations = collect_evaluations(ANSWERS, [
+        llm_output(70, 60, 80, []),
+        RuntimeError("rate limited"),
+        {"text": "not json"},
+    ])
+
+    assert evaluations[1] == {"question": ANSWERS[1][0], "response": ANSWERS[1][1], "error": "rate limited"}
+    assert evaluations[2]["question"] == ANSWERS[2][0]
+    assert "Failed to parse LLM output as JSON" in evaluations[2]["error"]
+    assert "tone" not in evaluations[1] and "tone" not in evaluations[2]
+
+
+def test_all_answers_failing_is_an_error():
+    with pytest.raises(ValueError, match="No answer could be evaluated"):
+        collect_evaluations(ANSWERS[:2], [RuntimeError("down"), {"text": ""}])
+
+
+def test_aggregate_averages_only_evaluated_answers():
+    evaluations = collect_evaluations(ANSWERS, [
+        llm_output(70, 61, 80, []),
+        RuntimeError("rate limited"),
+        llm_output(50, 40, 91, []),
+    ])
+
+    scores = aggregate_mock_scores(evaluations)
+
+    # round((61 + 40) / 2) and round((80 + 91) / 2): the failed answer is not a zero
+    assert (scores["tone"], scores["confidence"], scores["relevance"]) == (60, 50, 86)
+    assert scores["answers"] == evaluations
+    assert scores["answers"][1]["error"] == "rate limited"
+    # Nothing else numeric that outcome prediction would fold into its average
+    assert [key for key, value in scores.items() if isinstance(value, (int, float))] == [
+        "tone", "confidence", "relevance"
+    ]
+
+
+def test_aggregate_merges_feedback_without_repeats():
+    scores = aggregate_mock_scores([
+        {"tone": 70, "confidence": 70, "relevance": 70, "feedback": ["Use STAR", "Quantify results"]},
+        {"tone": 70, "confidence": 70, "relevance": 70, "feedback": ["Quantify results", "Slow down"]},
+        {"question": "q", "response": "r", "error": "failed"},
+    ])
+
+    assert scores["feedback"] == ["Use STAR", "Quantify results", "Slow down"]
+
+
+def test_single_answer_reports_the_submitted_pair(monkeypatch):
+    async def evaluate(question, response):
+        return {"question": "What the model thought was asked", "response": "A paraphrase",
+                "tone": 75, "confidence": 70, "relevance": 80, "feedback": ["Good structure"]}
+
+    monkeypatch.setattr(nodes, "aevaluate_mock_response", evaluate)
+    state = InterviewState(
+        job_description="Backend engineer",
+        candidate_response="I led a migration.",
+        behavioral_patterns={"questions": [{"question": "Tell me about a project you led."}]},
+    )
+
+    mock_scores = asyncio.run(nodes.mock_evaluation_node(state))["mock_scores"]
+
+    assert mock_scores["question"] == "Tell me about a project you led."
+    assert mock_scores["response"] == "I led a migration."
+    assert mock_scores["tone"] == 75
@@ -0,0 +1,68 @@
+import pytest
+
+from agents import outcome_predictor
+from agents.outcome_predictor import labelled_sub_scores, predict_outcome, score_band, template_reason
+
+RESUME = {"clarity": 90, "relevance": 70, "structure": 60, "experience": 3}
+INTERVIEW = {"tone": 55, "confidence": 80, "relevance": 75, "feedback": ["Be concise"]}
+
+
+@pytest.mark.parametrize("score, band", [
+    (100, "Strong"), (80, "Strong"),
+    (79.9, "Good"), (65, "Good"),
+    (64, "Moderate"), (50, "Moderate"),
+    (49, "Low"), (0, "Low"), (-5, "Low"),
+])
+def test_score_band_boundaries(score, band):
+    assert score_band(score) == band
+
+
+def test_only_zero_to_hundred_sub_scores_are_ranked():
+    assert labelled_sub_scores(RESUME, INTERVIEW) == {
+        "resume clarity": 90,
+        "resume relevance": 70,
+        "resume structure": 60,
+        "interview tone": 55,
+        "interview confidence": 80,
+        "interview relevance": 75,
+    }
+
+
+def test_reason_names_strongest_and_weakest_sub_scores():
+    reason = template_reason(RESUME, INTERVIEW, 72)
+
+    assert reason == (
+        "Good overall outlook (72/100): resume clarity is the strongest area (90), "
+        "while interview tone (55) offers the most room for improvement."
+    )
+
+
+def test_experience_years_never_rank_as_weakest():
+    # 2 years of experience is not a low score; resume structure is the weakest
+    reason = template_reason({"clarity": 85, "structure": 62, "experience": 2}, {"tone": 70}, 81)
+
+    assert reason.startswith("Strong overall outlook (81/100): resume clarity is the strongest area (85)")
+    assert "resume structure (62)" in reason
+    assert "experience" not in reason
+
+
+def test_non_numeric_and_boolean_values_are_ignored():
+    reason = template_reason({"clarity": "n/a", "relevance": True}, {"confidence": 58, "tone": None}, 50)
+
+    assert reason == "Moderate overall outlook (50/100) with evenly matched scores of 58 across the resume and interview."
+
+
+def test_reason_without_sub_scores():
+    assert template_reason({}, {"error": "evaluation failed"}, 40) == (
+        "Low overall outlook with a predicted success score of 40/100."
+    )
+
+
+def test_predict_outcome_uses_template_unless_llm_reason_requested(monkeypatch):
+    monkeypatch.setattr(outcome_predictor, "generate_llm_reason", lambda *args: "LLM sentence.")
+
+    templated = predict_outcome(RESUME, INTERVIEW, 60, llm_reason=False)
+    written = predict_outcome(RESUME, INTERVIEW, 60, llm_reason=True)
+
+    assert templated["reason"] == template_reason(RESUME, INTERVIEW, templated["success_score"])
+    assert written == {"success_score": templated["success_score"], "reason": "LLM sentence."}
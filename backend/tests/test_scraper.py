@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper import PageFetcher
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+ARTICLE = (
+    "<html><head><title>Behavioral interview questions</title></head><body><article>"
+    + "".join(
+        f"<p>Question {i}: tell me about a time you had to resolve a conflict within your team. "
+        "Strong answers use the STAR method to describe the situation, task, action and result.</p>"
+        for i in range(8)
+    )
+    + "</article></body></html>"
+).encode("utf-8")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections can be observed
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1], dict(self.headers)))
+        if self.path == "/article":
+            if self.headers.get("If-None-Match") == ETAG or self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self.send_response(304)
+                self.send_header("ETag", ETAG)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", ETAG)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.send_header("Content-Length", str(len(ARTICLE)))
+            self.end_headers()
+            self.wfile.write(ARTICLE)
+        elif self.path == "/slow":
+            time.sleep(1.0)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(fetcher: PageFetcher, coro_fn):
+    async def main():
+        try:
+            return await coro_fn()
+        finally:
+            await fetcher.aclose()
+    return asyncio.run(main())
+
+
+def test_fetch_parses_page_and_records_validators(server):
+    _, base = server
+    fetcher = PageFetcher(domain_interval=0)
+
+    page = run(fetcher, lambda: fetcher.fetch(f"{base}/article"))
+
+    assert page["success"] and not page["not_modified"]
+    assert "STAR method" in page["content"]
+    assert page["etag"] == ETAG and page["last_modified"] == LAST_MODIFIED
+
+
+def test_sequential_fetches_reuse_one_pooled_connection(server):
+    httpd, base = server
+    fetcher = PageFetcher(domain_interval=0)
+
+    async def fetch_three():
+        return [await fetcher.fetch(f"{base}/article") for _ in range(3)]
+
+    pages = run(fetcher, fetch_three)
+
+    assert all(page["success"] for page in pages)
+    client_ports = {port for _, port, _ in httpd.requests}
+    assert len(httpd.requests) == 3 and len(client_ports) == 1
+
+
+@pytest.mark.parametrize("validators", [{"etag": ETAG}, {"last_modified": LAST_MODIFIED}])
+def test_conditional_get_returns_unchanged_page(server, validators):
+    httpd, base = server
+    fetcher = PageFetcher(domain_interval=0)
+
+    page = run(fetcher, lambda: fetcher.fetch(f"{base}/article", validators))
+
+    assert page["success"] and page["not_modified"]
+    assert page["content"] == ""
+    assert page["etag"] == ETAG
+    headers = httpd.requests[-1][2]
+    assert headers.get("If-None-Match") == validators.get("etag")
+    assert headers.get("If-Modified-Since") == validators.get("last_modified")
+
+
+def test_server_error_and_timeout_are_reported_as_failures(server):
+    _, base = server
+    fetcher = PageFetcher(domain_interval=0, timeout=0.2)
+
+    pages = run(fetcher, lambda: fetcher.fetch_all([f"{base}/error", f"{base}/slow", f"{base}/article"]))
+
+    assert [page["success"] for page in pages] == [False, False, True]
+    assert [page["url"] for page in pages] == [f"{base}/error", f"{base}/slow", f"{base}/article"]
+    assert pages[0]["content"] == pages[1]["content"] == ""
+
+
+def test_fetch_all_sync_uses_its_own_loop(server):
+    _, base = server
+    pages = PageFetcher(domain_interval=0).fetch_all_sync([f"{base}/article"], {f"{base}/article": {"etag": ETAG}})
+    assert pages[0]["not_modified"]
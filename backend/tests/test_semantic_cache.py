@@ -0,0 +1,70 @@
+import pytest
+
+from semantic_cache import SemanticCache, text_key
+
+
+def make_cache(tmp_path=None, **kwargs) -> SemanticCache:
+    db_path = str(tmp_path / "semantic.db") if tmp_path else None
+    return SemanticCache(db_path=db_path, **{"threshold": 0.9, "ttl_seconds": 60, "max_entries": 10, **kwargs})
+
+
+def backdate(cache: SemanticCache, text: str, seconds: float, namespace: str = "") -> None:
+    """Make an entry look `seconds` older than it is."""
+    key = text_key(namespace, text)
+    entry_namespace, vector, value, created_at = cache._entries[key]
+    cache._entries[key] = (entry_namespace, vector, value, created_at - seconds)
+
+
+def test_hit_only_at_or_above_the_threshold():
+    cache = make_cache()
+    cache.update("backend engineer", [1.0, 0.0], {"questions": ["q"]})
+
+    value, similarity = cache.lookup([1.0, 0.1])
+    assert value == {"questions": ["q"]} and similarity >= 0.9
+    # cos([1, 0], [1, 1]) ~ 0.71
+    assert cache.lookup([1.0, 1.0]) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    cache = make_cache(ttl_seconds=60)
+    cache.update("backend engineer", [1.0, 0.0], "old")
+    backdate(cache, "backend engineer", 120)
+
+    assert cache.lookup([1.0, 0.0]) is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_expired_best_match_falls_through_to_a_valid_entry():
+    cache = make_cache(ttl_seconds=60)
+    cache.update("exact", [1.0, 0.0], "expired")
+    cache.update("close", [1.0, 0.2], "valid")
+    backdate(cache, "exact", 120)
+
+    value, similarity = cache.lookup([1.0, 0.0])
+    assert value == "valid" and similarity < 1.0
+    assert cache.stats()["expired"] == 1
+
+
+def test_namespaces_do_not_share_entries():
+    cache = make_cache()
+    cache.update("backend engineer", [1.0, 0.0], "model-a", namespace="a")
+
+    assert cache.lookup([1.0, 0.0], namespace="b") is None
+    assert cache.lookup([1.0, 0.0], namespace="a")[0] == "model-a"
+
+
+def test_entries_survive_a_restart(tmp_path):
+    make_cache(tmp_path).update("backend engineer", [1.0, 0.0], "persisted", namespace="a")
+
+    assert make_cache(tmp_path).lookup([1.0, 0.0], namespace="a")[0] == "persisted"
+
+
+@pytest.mark.parametrize("entries", [11, 15])
+def test_least_recently_used_entries_are_evicted(entries):
+    cache = make_cache(max_entries=10)
+    for i in range(entries):
+        cache.update(f"jd {i}", [1.0, float(i)], i)
+
+    assert cache.stats()["entries"] == 10
+    assert cache.stats()["evictions"] == entries - 10
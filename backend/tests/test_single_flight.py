@@ -0,0 +1,232 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight, coalesced, inflight
+
+FOLLOWERS = 5
+
+
+class Interrupted(BaseException):
+    """Stands in for KeyboardInterrupt/SystemExit tearing down a sync leader."""
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def run_threads(target, count):
+    results, errors = [None] * count, [None] * count
+
+    def call(i):
+        try:
+            results[i] = target()
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(2)
+        return {"questions": ["q1"]}
+
+    threads, results, errors = run_threads(lambda: flight.do(("patterns", "jd"), work), FOLLOWERS + 1)
+    wait_for(lambda: flight.stats().get("patterns_coalesced") == FOLLOWERS)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert errors == [None] * (FOLLOWERS + 1)
+    assert all(result == {"questions": ["q1"]} for result in results)
+    # Every caller gets its own copy to mutate
+    assert len({id(result) for result in results}) == FOLLOWERS + 1
+    assert flight.stats() == {"patterns_leaders": 1, "patterns_coalesced": FOLLOWERS, "in_flight": 0}
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+
+    assert flight.do(("patterns", "a"), lambda: "a") == "a"
+    assert flight.do(("patterns", "b"), lambda: "b") == "b"
+    assert flight.stats() == {"patterns_leaders": 2, "in_flight": 0}
+
+
+def test_exception_reaches_every_waiter_and_clears_the_key():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(2)
+        raise ValueError("groq unavailable")
+
+    threads, results, errors = run_threads(lambda: flight.do(("patterns", "jd"), work), FOLLOWERS + 1)
+    wait_for(lambda: flight.stats().get("patterns_coalesced") == FOLLOWERS)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert all(isinstance(e, ValueError) and str(e) == "groq unavailable" for e in errors)
+    assert flight.stats()["in_flight"] == 0
+    # The failure is not remembered: the next call runs again
+    assert flight.do(("patterns", "jd"), lambda: "recovered") == "recovered"
+
+
+def test_interrupted_sync_leader_hands_over_to_a_follower():
+    flight = SingleFlight()
+    interrupt, finish = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        if len(calls) == 1:
+            interrupt.wait(2)
+            raise Interrupted()
+        finish.wait(2)
+        return "done"
+
+    threads, results, errors = run_threads(lambda: flight.do(("patterns", "jd"), work), FOLLOWERS + 1)
+    wait_for(lambda: flight.stats().get("patterns_coalesced") == FOLLOWERS)
+    interrupt.set()
+    # One follower leads the retry and the others join it
+    wait_for(lambda: flight.stats() == {
+        "patterns_leaders": 2, "patterns_coalesced": 2 * FOLLOWERS - 1, "in_flight": 1
+    })
+    finish.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 2
+    assert sum(isinstance(e, Interrupted) for e in errors) == 1
+    assert results.count("done") == FOLLOWERS
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_concurrent_identical_calls_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["q1"]
+
+    async def main():
+        return await asyncio.gather(*(flight.ado(("patterns", "jd"), work) for _ in range(FOLLOWERS + 1)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert results == [["q1"]] * (FOLLOWERS + 1)
+    assert flight.stats() == {"patterns_leaders": 1, "patterns_coalesced": FOLLOWERS, "in_flight": 0}
+
+
+def test_async_exception_reaches_every_waiter_and_clears_the_key():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        raise ValueError("groq unavailable")
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.ado(("patterns", "jd"), work) for _ in range(FOLLOWERS + 1)), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert flight.stats()["patterns_leaders"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_async_leader_does_not_strand_followers():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado(("patterns", "jd"), work))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.ado(("patterns", "jd"), work)) for _ in range(FOLLOWERS)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*followers), 2)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    results = asyncio.run(main())
+
+    # One follower took over and ran the work again for the rest
+    assert len(calls) == 2
+    assert results == ["done"] * FOLLOWERS
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_async_follower_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flight.ado(("patterns", "jd"), work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado(("patterns", "jd"), work))
+        await asyncio.sleep(0)
+        follower.cancel()
+        return await leader, follower.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
+
+
+def test_coalesced_shares_calls_between_sync_and_async_functions():
+    release = threading.Event()
+    calls = []
+
+    @coalesced("test_patterns")
+    def patterns(job_description, limit=3):
+        calls.append(job_description)
+        release.wait(2)
+        return [job_description] * limit
+
+    @coalesced("test_patterns")
+    async def apatterns(job_description, limit=3):
+        calls.append(job_description)
+        return [job_description] * limit
+
+    async def main():
+        worker = asyncio.create_task(asyncio.to_thread(patterns, "jd", limit=2))
+        await asyncio.to_thread(wait_for, lambda: inflight.stats().get("test_patterns_leaders") == 1)
+        follower = asyncio.create_task(apatterns("jd", limit=2))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await worker, await follower
+
+    assert asyncio.run(main()) == (["jd", "jd"], ["jd", "jd"])
+    assert calls == ["jd"]
+    assert inflight.stats()["test_patterns_coalesced"] == 1
+    # Different arguments are different keys
+    assert asyncio.run(apatterns("other", limit=1)) == ["other"]
+    assert calls == ["jd", "other"]
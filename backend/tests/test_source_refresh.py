@@ -0,0 +1,140 @@
+import os
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from agents.behavioral_retriever import (
+    SOURCE_INDEX_FILE,
+    BehavioralKnowledgeBase,
+    SourceIndex,
+    apply_scraped_pages,
+    changed_pages,
+    content_hash_for,
+    prune_sources,
+    stale_sources,
+)
+
+
+class FakeVectorStore:
+    """Records the chunk ids added and deleted, keyed like the real stores."""
+
+    def __init__(self):
+        self.chunks = {}
+        self.deleted = []
+
+    def add_documents(self, documents, ids):
+        self.chunks.update(zip(ids, documents))
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+        for chunk_id in ids:
+            self.chunks.pop(chunk_id, None)
+
+
+def page(url, content, **extra):
+    return {
+        "url": url,
+        "success": True,
+        "content": content,
+        "domain": "example.com",
+        "title": "Page",
+        "last_scraped": "2026-01-01T00:00:00",
+        **extra,
+    }
+
+
+def index_with(tmp_path, entries):
+    return SourceIndex(str(tmp_path / "source_index.json"), entries)
+
+
+def test_unchanged_hash_is_skipped(tmp_path):
+    url = "https://example.com/star"
+    content = "Use the STAR method."
+    index = index_with(tmp_path, {url: {"content_hash": content_hash_for(content), "chunk_ids": ["old-0"], "origin": "search"}})
+    store = FakeVectorStore()
+    scraped = [page(url, content, etag='"v2"')]
+
+    assert changed_pages(index, scraped) == []
+    counts, mapping = apply_scraped_pages(store, index, scraped)
+
+    assert counts == {"added": 0, "updated": 0, "unchanged": 1, "failed": 0}
+    assert store.chunks == {} and store.deleted == []
+    assert index.get(url)["chunk_ids"] == ["old-0"]
+    # New validators are still recorded for the next conditional fetch
+    assert index.get(url)["etag"] == '"v2"'
+    assert mapping == {url: "example.com"}
+
+
+def test_changed_page_replaces_its_chunk_ids(tmp_path):
+    url = "https://example.com/star"
+    index = index_with(tmp_path, {url: {"content_hash": content_hash_for("old"), "chunk_ids": ["old-0", "old-1"], "origin": "scheduled"}})
+    store = FakeVectorStore()
+    scraped = [page(url, "Tell me about a conflict with a teammate.")]
+
+    assert changed_pages(index, scraped) == [url]
+    counts, _ = apply_scraped_pages(store, index, scraped, origin="search")
+
+    entry = index.get(url)
+    assert counts["updated"] == 1
+    assert store.deleted == ["old-0", "old-1"]
+    assert sorted(store.chunks) == sorted(entry["chunk_ids"])
+    assert entry["content_hash"] == content_hash_for("Tell me about a conflict with a teammate.")
+    # A page keeps the origin it was first indexed with
+    assert entry["origin"] == "scheduled"
+
+
+def test_failed_scrape_leaves_the_stored_page_alone(tmp_path):
+    url = "https://example.com/star"
+    index = index_with(tmp_path, {url: {"content_hash": "h", "chunk_ids": ["old-0"], "origin": "search"}})
+    store = FakeVectorStore()
+
+    counts, _ = apply_scraped_pages(store, index, [page(url, "", success=False)])
+
+    assert counts["failed"] == 1
+    assert store.deleted == [] and index.get(url)["chunk_ids"] == ["old-0"]
+
+
+def test_url_missing_from_keep_urls_is_pruned_with_its_chunks(tmp_path):
+    kept, dropped, searched = "https://a.example/kept", "https://b.example/dropped", "https://c.example/searched"
+    index = index_with(tmp_path, {
+        kept: {"chunk_ids": ["a-0"], "origin": "scheduled"},
+        dropped: {"chunk_ids": ["b-0", "b-1"], "origin": "scheduled"},
+        # Added by live search: not part of the scheduled source list
+        searched: {"chunk_ids": ["c-0"], "origin": "search"},
+    })
+    store = FakeVectorStore()
+
+    assert stale_sources(index, [kept]) == [dropped]
+    assert prune_sources(store, index, [kept]) == [dropped]
+
+    assert store.deleted == ["b-0", "b-1"]
+    assert index.get(dropped) is None
+    assert index.get(kept) is not None and index.get(searched) is not None
+
+
+def test_new_validators_are_published_without_touching_the_current_version(tmp_path):
+    url = "https://example.com/star"
+    content = "Use the STAR method to structure behavioral answers."
+    kb = BehavioralKnowledgeBase(str(tmp_path / "kb"), write_mode="lock")
+    kb.embeddings = DeterministicFakeEmbedding(size=8)
+    try:
+        kb.load()
+        kb.add_urls([url], [page(url, content, etag='"v1"')])
+        published = kb.version
+        published_index = os.path.join(kb._versions.path(published), SOURCE_INDEX_FILE)
+        with open(published_index, "r", encoding="utf-8") as f:
+            before = f.read()
+
+        kb.add_urls([url], [page(url, content, etag='"v2"')])
+
+        assert kb.version != published
+        assert kb.source_index.get(url)["etag"] == '"v2"'
+        with open(published_index, "r", encoding="utf-8") as f:
+            assert f.read() == before
+
+        # Nothing new at all: no version is staged
+        version = kb.version
+        kb.add_urls([url], [page(url, content, etag='"v2"')])
+        assert kb.version == version
+        assert kb._versions.versions()[-1] == version
+    finally:
+        kb.close()
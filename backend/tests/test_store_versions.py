@@ -0,0 +1,124 @@
+import os
+
+from store_versions import CURRENT_FILE, VersionedStore
+
+
+def write(store, version, name, content):
+    with open(os.path.join(store.path(version), name), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def read(store, version, name):
+    with open(os.path.join(store.path(version), name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_new_store_has_no_current_version(tmp_path):
+    store = VersionedStore(str(tmp_path))
+
+    assert store.current_version() is None
+    assert store.versions() == []
+
+
+def test_stage_numbers_versions_and_copies_base(tmp_path):
+    store = VersionedStore(str(tmp_path))
+    first = store.stage()
+    write(store, first, "data.txt", "one")
+
+    second = store.stage(base=first)
+    write(store, second, "data.txt", "two")
+
+    assert (first, second) == ("v000001", "v000002")
+    assert read(store, first, "data.txt") == "one"
+    assert read(store, second, "data.txt") == "two"
+    # Staged versions are invisible until published
+    assert store.current_version() is None
+
+
+def test_publish_swaps_current(tmp_path):
+    store = VersionedStore(str(tmp_path))
+    first = store.stage()
+    store.publish(first)
+    second = store.stage(base=first)
+
+    assert store.current_version() == first
+    store.publish(second)
+
+    assert store.current_version() == second
+    assert (tmp_path / CURRENT_FILE).read_text() == second
+    assert not (tmp_path / f"{CURRENT_FILE}.tmp").exists()
+    # Another process opening the same root sees the published version
+    assert VersionedStore(str(tmp_path)).current_version() == second
+
+
+def test_current_pointing_at_a_missing_version_is_ignored(tmp_path):
+    store = VersionedStore(str(tmp_path))
+    (tmp_path / CURRENT_FILE).write_text("v000007")
+
+    assert store.current_version() is None
+
+
+def test_discard_removes_a_failed_stage(tmp_path):
+    store = VersionedStore(str(tmp_path))
+    store.publish(store.stage())
+    failed = store.stage(base=store.current_version())
+
+    store.discard(failed)
+
+    assert store.versions() == ["v000001"]
+    assert store.stage() == "v000002"
+
+
+def test_publish_prunes_all_but_the_newest_versions(tmp_path):
+    store = VersionedStore(str(tmp_path), keep_versions=2)
+    for _ in range(4):
+        store.publish(store.stage(base=store.current_version()))
+
+    assert store.versions() == ["v000003", "v000004"]
+    assert store.current_version() == "v000004"
+
+
+def test_prune_never_removes_the_current_version(tmp_path):
+    store = VersionedStore(str(tmp_path), keep_versions=1)
+    store.publish(store.stage())
+    # Staged but not (yet) published versions are newer than the current one
+    store.stage()
+    store.stage()
+
+    store.prune()
+
+    assert store.current_version() == "v000001"
+    assert store.versions() == ["v000001", "v000003"]
+
+
+def test_version_order_is_numeric(tmp_path):
+    store = VersionedStore(str(tmp_path))
+    for name in ("v000010", "v000002", "v000100", "not-a-version"):
+        os.makedirs(store.path(name))
+
+    assert store.versions() == ["v000002", "v000010", "v000100"]
+    assert store.stage() == "v000101"
+
+
+def test_stage_legacy_copies_unversioned_store(tmp_path):
+    (tmp_path / "chroma.sqlite3").write_text("db")
+    (tmp_path / "segment").mkdir()
+    (tmp_path / "segment" / "index.bin").write_text("hnsw")
+    (tmp_path / "partial.tmp").write_text("ignored")
+    store = VersionedStore(str(tmp_path))
+
+    version = store.stage_legacy()
+
+    assert version == "v000001"
+    assert read(store, version, "chroma.sqlite3") == "db"
+    assert read(store, version, os.path.join("segment", "index.bin")) == "hnsw"
+    assert not os.path.exists(os.path.join(store.path(version), "partial.tmp"))
+    # The originals stay for builds that predate versioning
+    assert (tmp_path / "chroma.sqlite3").exists()
+
+
+def test_stage_legacy_without_a_legacy_store(tmp_path):
+    store = VersionedStore(str(tmp_path))
+
+    assert store.stage_legacy() is None
+    assert store.versions() == []
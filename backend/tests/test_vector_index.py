@@ -0,0 +1,167 @@
+import hashlib
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from vector_index import NumpyVectorIndex
+
+DIM = 64
+
+TEXTS = [
+    "Tell me about a conflict with a teammate",
+    "Describe a time you missed a deadline",
+    "How do you handle feedback from a manager",
+    "Explain a project you led from start to finish",
+    "What motivates you at work",
+]
+
+
+class WordHashEmbeddings(Embeddings):
+    """Deterministic bag-of-words vectors, unit length like real embedding models."""
+
+    def _embed(self, text):
+        vector = np.zeros(DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1.0
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def build_index(tmp_path, texts=TEXTS):
+    index = NumpyVectorIndex(str(tmp_path / "numpy"), WordHashEmbeddings())
+    index.add_texts(texts, metadatas=[{"source": f"s{i}"} for i in range(len(texts))], ids=[f"id{i}" for i in range(len(texts))])
+    return index
+
+
+def test_add_and_get_keep_texts_and_metadata(tmp_path):
+    index = build_index(tmp_path)
+
+    assert len(index) == len(TEXTS)
+    stored = index.get(ids=["id1", "id3"])
+    assert stored["ids"] == ["id1", "id3"]
+    assert stored["documents"] == [TEXTS[1], TEXTS[3]]
+    assert stored["metadatas"] == [{"source": "s1"}, {"source": "s3"}]
+
+
+def test_add_replaces_existing_ids(tmp_path):
+    index = build_index(tmp_path)
+
+    index.add_texts(["Why do you want this job"], metadatas=[{"source": "new", "page": 2}], ids=["id1"])
+
+    assert len(index) == len(TEXTS)
+    assert index.get(ids=["id1"]) == {"ids": ["id1"], "documents": ["Why do you want this job"],
+                                      "metadatas": [{"source": "new", "page": 2}]}
+    # Rows added before the new metadata key existed simply don't carry it
+    assert index.get(ids=["id0"])["metadatas"] == [{"source": "s0"}]
+
+
+def test_add_rejects_mismatched_dimension(tmp_path):
+    index = build_index(tmp_path)
+
+    with pytest.raises(ValueError):
+        index.add_embeddings(["short"], [[1.0, 0.0]], ids=["bad"])
+
+
+def test_delete_removes_rows_from_search(tmp_path):
+    index = build_index(tmp_path)
+
+    assert index.delete(ids=["id0", "missing"]) is True
+    assert index.delete(ids=["missing"]) is False
+    assert index.delete(ids=[]) is False
+
+    assert len(index) == len(TEXTS) - 1
+    results = index.similarity_search(TEXTS[0], k=len(TEXTS))
+    assert TEXTS[0] not in [doc.page_content for doc in results]
+
+
+def test_similarity_search_ranks_exact_match_first(tmp_path):
+    index = build_index(tmp_path)
+
+    results = index.similarity_search_with_score(TEXTS[2], k=3)
+
+    assert len(results) == 3
+    assert results[0][0].page_content == TEXTS[2]
+    assert results[0][0].metadata == {"source": "s2"}
+    assert results[0][1] == pytest.approx(0.0, abs=1e-5)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores)
+
+
+def test_similarity_search_on_empty_index(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path / "numpy"), WordHashEmbeddings())
+
+    assert index.similarity_search("anything") == []
+    assert index.search_by_vectors([[1.0] * DIM, [0.5] * DIM]) == [[], []]
+
+
+def test_search_by_vectors_matches_single_queries(tmp_path):
+    index = build_index(tmp_path)
+    embeddings = WordHashEmbeddings()
+    queries = ["conflict with a manager", "a project deadline"]
+
+    batched = index.search_by_vectors(embeddings.embed_documents(queries), k=2)
+
+    for query, results in zip(queries, batched):
+        single = index.similarity_search_with_score(query, k=2)
+        assert [doc.page_content for doc, _ in results] == [doc.page_content for doc, _ in single]
+        assert [score for _, score in results] == pytest.approx([score for _, score in single])
+
+
+def test_persist_and_load_round_trip(tmp_path):
+    index = build_index(tmp_path)
+    index.delete(ids=["id4"])
+    index.persist()
+
+    assert NumpyVectorIndex.exists(index.persist_directory)
+    reloaded = NumpyVectorIndex.load(index.persist_directory, WordHashEmbeddings())
+
+    assert reloaded.get() == index.get()
+    for query in ["feedback from a manager", "a time you led a project"]:
+        original = index.similarity_search_with_score(query, k=3)
+        restored = reloaded.similarity_search_with_score(query, k=3)
+        assert [doc for doc, _ in restored] == [doc for doc, _ in original]
+        assert [score for _, score in restored] == pytest.approx([score for _, score in original])
+
+    # A reloaded (memory-mapped) index still accepts writes
+    reloaded.add_texts(["Where do you see yourself"], ids=["id5"])
+    assert len(reloaded) == len(TEXTS)
+
+
+def test_persist_empty_index(tmp_path):
+    index = NumpyVectorIndex(str(tmp_path / "numpy"), WordHashEmbeddings())
+    index.persist()
+
+    reloaded = NumpyVectorIndex.load(index.persist_directory, WordHashEmbeddings())
+
+    assert len(reloaded) == 0
+    assert reloaded.similarity_search("anything") == []
+
+
+def test_results_match_chroma(tmp_path):
+    embeddings = WordHashEmbeddings()
+    documents = [Document(page_content=text, metadata={"source": f"s{i}"}) for i, text in enumerate(TEXTS)]
+    ids = [f"id{i}" for i in range(len(TEXTS))]
+
+    numpy_index = NumpyVectorIndex(str(tmp_path / "numpy"), embeddings)
+    numpy_index.add_documents(documents, ids=ids)
+    numpy_index.persist()
+    numpy_index = NumpyVectorIndex.load(str(tmp_path / "numpy"), embeddings)
+    chroma = Chroma(persist_directory=str(tmp_path / "chroma"), embedding_function=embeddings)
+    chroma.add_documents(documents, ids=ids)
+
+    # Queries whose top three scores are distinct, so the order is well defined
+    for query in ["conflict with a teammate", "a project you led", "what motivates you"]:
+        ours = numpy_index.similarity_search_with_score(query, k=3)
+        theirs = chroma.similarity_search_with_score(query, k=3)
+        assert [doc.page_content for doc, _ in ours] == [doc.page_content for doc, _ in theirs]
+        assert [doc.metadata for doc, _ in ours] == [doc.metadata for doc, _ in theirs]
+        assert [score for _, score in ours] == pytest.approx([score for _, score in theirs], abs=1e-4)
+    assert sorted(numpy_index.get()["ids"]) == sorted(chroma.get()["ids"])
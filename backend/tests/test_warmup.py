@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from warmup import Warmup
+
+
+def test_waiting_for_a_step_does_not_wait_for_later_steps():
+    release = threading.Event()
+
+    async def main():
+        warmup = Warmup([
+            ("fast", lambda: None, True),
+            ("slow", lambda: release.wait(5), False),
+        ])
+        assert await asyncio.wait_for(warmup.wait_ready(["fast"]), 1) is True
+        assert warmup.progress()["steps"][1]["status"] == "running"
+
+        release.set()
+        assert await warmup.wait_ready() is True
+        assert warmup.progress()["completed_steps"] == 2
+
+    asyncio.run(main())
+
+
+def test_failed_optional_step_still_counts_as_warm():
+    def broken():
+        raise RuntimeError("no knowledge base")
+
+    async def main():
+        warmup = Warmup([("optional", broken, False), ("after", lambda: None, True)])
+        assert await warmup.wait_ready(["optional"]) is True
+        assert await warmup.wait_ready() is True
+        assert warmup.progress()["steps"][0] == {
+            "name": "optional", "status": "failed", "error": "no knowledge base",
+            "seconds": warmup.progress()["steps"][0]["seconds"],
+        }
+
+    asyncio.run(main())
+
+
+def test_required_failure_releases_waiters_on_skipped_steps():
+    def broken():
+        raise RuntimeError("import failed")
+
+    async def main():
+        warmup = Warmup([("required", broken, True), ("never_runs", lambda: None, False)])
+        assert await asyncio.wait_for(warmup.wait_ready(["never_runs"]), 1) is False
+        assert await warmup.wait_ready() is False
+        assert warmup.progress()["steps"][1]["status"] == "pending"
+
+    asyncio.run(main())
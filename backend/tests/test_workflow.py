@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import pytest
+
+import api
+from graph.workflow import (
+    SECTIONS,
+    build_candidate_graph,
+    build_graph,
+    build_section_graph,
+    compile_nodes,
+    plan_nodes,
+)
+
+STANDARD_PLANS = {
+    "resume_scores": ("resume_analysis",),
+    "behavioral_patterns": ("behavioral_analysis",),
+    "mock_scores": ("behavioral_analysis", "mock_evaluation"),
+    # Outcome pulls in both branches but not improvement planning
+    "outcome": ("resume_analysis", "behavioral_analysis", "mock_evaluation", "outcome_prediction"),
+    "improvement_plan": ("resume_analysis", "behavioral_analysis", "mock_evaluation",
+                         "outcome_prediction", "improvement_planning"),
+}
+FAST_PLANS = {
+    **STANDARD_PLANS,
+    # The combined call only replaces the chain when the plan is requested
+    "improvement_plan": ("resume_analysis", "behavioral_analysis", "combined_evaluation"),
+}
+
+STANDARD_EDGES = {
+    ("__start__", "resume_analysis"),
+    ("__start__", "behavioral_analysis"),
+    ("behavioral_analysis", "mock_evaluation"),
+    ("resume_analysis", "outcome_prediction"),
+    ("mock_evaluation", "outcome_prediction"),
+    ("outcome_prediction", "improvement_planning"),
+    ("improvement_planning", "__end__"),
+}
+FAST_EDGES = {
+    ("__start__", "resume_analysis"),
+    ("__start__", "behavioral_analysis"),
+    ("resume_analysis", "combined_evaluation"),
+    ("behavioral_analysis", "combined_evaluation"),
+    ("combined_evaluation", "__end__"),
+}
+
+
+def edges(graph):
+    return {(edge.source, edge.target) for edge in graph.get_graph().edges}
+
+
+@pytest.mark.parametrize("mode, plans", [("standard", STANDARD_PLANS), ("fast", FAST_PLANS)])
+@pytest.mark.parametrize("section", SECTIONS)
+def test_plan_for_each_section(mode, plans, section):
+    assert plan_nodes({section}, mode) == plans[section]
+
+
+def test_fast_mode_uses_combined_call_only_with_improvement_plan():
+    assert plan_nodes({"mock_scores", "outcome"}, "fast") == STANDARD_PLANS["outcome"]
+    assert plan_nodes({"mock_scores", "improvement_plan"}, "fast") == FAST_PLANS["improvement_plan"]
+
+
+def test_supplied_fields_are_not_recomputed():
+    assert plan_nodes(SECTIONS, "standard", supplied=("behavioral_patterns",)) == (
+        "resume_analysis", "mock_evaluation", "outcome_prediction", "improvement_planning"
+    )
+    assert plan_nodes(SECTIONS, "fast", supplied=("behavioral_patterns",)) == (
+        "resume_analysis", "combined_evaluation"
+    )
+
+
+@pytest.mark.parametrize("mode, expected", [("standard", STANDARD_EDGES), ("fast", FAST_EDGES)])
+def test_full_plan_compiles_to_the_pipeline_edges(mode, expected):
+    assert edges(build_graph(mode)) == expected
+    assert edges(compile_nodes(plan_nodes(SECTIONS, mode))) == expected
+    assert edges(build_section_graph(frozenset(SECTIONS), mode)) == expected
+
+
+def test_candidate_graph_starts_from_supplied_patterns():
+    assert edges(build_candidate_graph("standard")) == {
+        ("__start__", "resume_analysis"),
+        ("__start__", "mock_evaluation"),
+        ("resume_analysis", "outcome_prediction"),
+        ("mock_evaluation", "outcome_prediction"),
+        ("outcome_prediction", "improvement_planning"),
+        ("improvement_planning", "__end__"),
+    }
+
+
+def test_partial_plan_edges():
+    assert edges(build_section_graph(frozenset({"mock_scores"}), "standard")) == {
+        ("__start__", "behavioral_analysis"),
+        ("behavioral_analysis", "mock_evaluation"),
+        ("mock_evaluation", "__end__"),
+    }
+
+
+def test_section_graphs_are_shared_per_node_set():
+    # resume_scores adds no node to what outcome already needs
+    assert build_section_graph(frozenset({"outcome"}), "standard") is build_section_graph(
+        frozenset({"outcome", "resume_scores"}), "standard"
+    )
+
+
+def test_unknown_sections_are_rejected():
+    with pytest.raises(ValueError, match="Unknown sections: bogus"):
+        plan_nodes({"outcome", "bogus"}, "standard")
+
+
+def test_plan_request_reports_whether_the_response_is_used():
+    requested, _, uses_response = api.plan_request("resume_scores, behavioral_patterns")
+    assert requested == ("resume_scores", "behavioral_patterns")
+    assert uses_response is False
+
+    requested, _, uses_response = api.plan_request("outcome")
+    assert requested == ("outcome",)
+    assert uses_response is True
+
+
+@pytest.mark.parametrize("path", ["/run-interview-evaluation/", "/run-interview-evaluation/stream"])
+def test_unknown_sections_return_400(monkeypatch, path):
+    async def warm(steps=None):
+        return None
+
+    monkeypatch.setattr(api, "ensure_warm", warm)
+
+    async def post():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                path,
+                data={"job_description": "Backend engineer", "candidate_response": "I led a migration.",
+                      "sections": "outcome,bogus"},
+                files={"resume": ("resume.txt", b"Python developer", "text/plain")},
+            )
+
+    response = asyncio.run(post())
+
+    assert response.status_code == 400
+    assert "Unknown sections: bogus" in response.json()["error"]
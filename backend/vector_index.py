@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+VECTORS_FILE = "vectors.f32"
+TABLE_FILE = "table.json"
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable view of the index; mutations build a new one and swap it in."""
+    vectors: np.ndarray                  # (n, dim) float32, rows L2-normalized
+    ids: List[str]
+    texts: List[str]
+    columns: Dict[str, List[Any]]        # metadata key -> value per row (None if absent)
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        return {key: values[row] for key, values in self.columns.items() if values[row] is not None}
+
+
+def _normalize(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    array = np.asarray(vectors, dtype=np.float32)
+    if array.ndim == 1:
+        array = array[None, :]
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return array / norms
+
+
+class NumpyVectorIndex(VectorStore):
+    """
+    Exact in-process vector index for a knowledge base of up to ~100k chunks.
+
+    Vectors are kept as one L2-normalized float32 matrix (vectors.f32, loaded
+    with np.memmap), and ids, texts and metadata as a columnar side table
+    (table.json). Top-k is a matrix product plus argpartition, so there is no
+    HNSW build or SQLite to open at startup. Scores follow Chroma's default
+    squared-L2 convention (lower is closer): for unit vectors that is
+    2 - 2 * cosine similarity.
+
+    Reads work on an immutable snapshot and never block; writes are expected
+    to be serialized by the caller (the knowledge base holds a lock).
+    """
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings):
+        self.persist_directory = persist_directory
+        self._embedding = embedding_function
+        self._snapshot = _Snapshot(np.zeros((0, 0), dtype=np.float32), [], [], {})
+        self._write_lock = threading.Lock()
+
+    # --- Persistence ---
+    @classmethod
+    def exists(cls, persist_directory: str) -> bool:
+        return os.path.exists(os.path.join(persist_directory, TABLE_FILE))
+
+    @classmethod
+    def load(cls, persist_directory: str, embedding_function: Embeddings) -> "NumpyVectorIndex":
+        index = cls(persist_directory, embedding_function)
+        with open(os.path.join(persist_directory, TABLE_FILE), "r", encoding="utf-8") as f:
+            table = json.load(f)
+        count, dim = len(table["ids"]), table["dim"]
+        if count and dim:
+            vectors = np.memmap(os.path.join(persist_directory, VECTORS_FILE), dtype=np.float32,
+                                mode="r", shape=(count, dim))
+        else:
+            vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        index._snapshot = _Snapshot(vectors, table["ids"], table["texts"], table["columns"])
+        return index
+
+    def persist(self) -> None:
+        """Write the matrix and side table; each file is replaced atomically."""
+        snapshot = self._snapshot
+        os.makedirs(self.persist_directory, exist_ok=True)
+        vectors_path = os.path.join(self.persist_directory, VECTORS_FILE)
+        table_path = os.path.join(self.persist_directory, TABLE_FILE)
+        with open(f"{vectors_path}.tmp", "wb") as f:
+            f.write(np.ascontiguousarray(snapshot.vectors, dtype=np.float32).tobytes())
+        with open(f"{table_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "dim": int(snapshot.vectors.shape[1]) if snapshot.vectors.size else 0,
+                "ids": snapshot.ids,
+                "texts": snapshot.texts,
+                "columns": snapshot.columns,
+            }, f)
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        os.replace(f"{table_path}.tmp", table_path)
+
+    # --- Writes ---
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Add rows whose vectors are already computed; existing ids are replaced."""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        new_vectors = _normalize(vectors)
+        with self._write_lock:
+            self._remove(set(ids))
+            old = self._snapshot
+            if old.vectors.size and old.vectors.shape[1] != new_vectors.shape[1]:
+                raise ValueError(f"Vector dimension {new_vectors.shape[1]} does not match index ({old.vectors.shape[1]})")
+
+            keys = list(old.columns) + [k for m in metadatas for k in m if k not in old.columns]
+            keys = list(dict.fromkeys(keys))
+            columns = {
+                key: old.columns.get(key, [None] * len(old.ids)) + [m.get(key) for m in metadatas]
+                for key in keys
+            }
+            vectors_all = np.vstack([old.vectors, new_vectors]) if old.vectors.size else new_vectors
+            self._snapshot = _Snapshot(vectors_all, old.ids + ids, old.texts + list(texts), columns)
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self._embedding.embed_documents(texts), metadatas, ids)
+
+    def _remove(self, ids: set) -> int:
+        old = self._snapshot
+        keep = [i for i, chunk_id in enumerate(old.ids) if chunk_id not in ids]
+        if len(keep) == len(old.ids):
+            return 0
+        self._snapshot = _Snapshot(
+            old.vectors[keep] if old.vectors.size else old.vectors,
+            [old.ids[i] for i in keep],
+            [old.texts[i] for i in keep],
+            {key: [values[i] for i in keep] for key, values in old.columns.items()},
+        )
+        return len(old.ids) - len(keep)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        with self._write_lock:
+            return self._remove(set(ids)) > 0
+
+    # --- Reads ---
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Chroma-style get(): ids plus the requested documents/metadatas."""
+        snapshot = self._snapshot
+        wanted = set(ids) if ids else None
+        rows = [i for i, chunk_id in enumerate(snapshot.ids) if wanted is None or chunk_id in wanted]
+        include = include or ["documents", "metadatas"]
+        result: Dict[str, Any] = {"ids": [snapshot.ids[i] for i in rows]}
+        if "documents" in include:
+            result["documents"] = [snapshot.texts[i] for i in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [snapshot.metadata(i) for i in rows]
+        return result
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    def search_by_vectors(self, queries: Sequence[Sequence[float]], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Exact top-k for a batch of query vectors with one matrix product."""
+        snapshot = self._snapshot
+        n = len(snapshot.ids)
+        if n == 0:
+            return [[] for _ in queries]
+        query_matrix = _normalize(queries)
+        similarities = query_matrix @ snapshot.vectors.T          # (q, n)
+        k = min(k, n)
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        results = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-similarities[q, candidates])]
+            results.append([
+                (Document(page_content=snapshot.texts[i], metadata=snapshot.metadata(i)),
+                 float(2.0 - 2.0 * similarities[q, i]))
+                for i in ordered
+            ])
+        return results
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.search_by_vectors([embedding], k)[0]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_relevance_scores(self._embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # Squared L2 between unit vectors lies in [0, 4]; map it to a [0, 1] relevance
+        return lambda distance: 1.0 - distance / 4.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_directory: str = "behavioral_numpy_index",
+        **kwargs: Any
+    ) -> "NumpyVectorIndex":
+        index = cls(persist_directory, embedding)
+        index.add_texts(texts, metadatas, ids)
+        return index
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# --- Configuration (overridable through .env) ---
+# true: start warming up as soon as the server is accepting connections.
+# false: warm up on the first request that needs the pipeline.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+
+class Warmup:
+    """
+    Runs the slow start-up work (importing agents, building graphs, loading the
+    knowledge base) as a sequence of named steps in a worker thread, after the
+    API has bound its port. Requests that need the pipeline await wait_ready();
+    /ready reports progress() so orchestrators only route traffic once it is done.
+Endpoints that only depend on some of the steps can wait for just those.
+
+    Each step is (name, fn, required). A failing required step stops the
+    warm-up and marks it failed; an optional step's failure is recorded and
+    the warm-up continues.
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any], bool]]):
+        self.steps = steps
+        self.status = "pending"
+        self._step_status: Dict[str, Dict[str, Any]] = {
+            name: {"status": "pending"} for name, _, _ in steps
+        }
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._done: Optional[asyncio.Event] = None
+        self._step_done: Dict[str, asyncio.Event] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def start(self) -> None:
+        """Schedule the warm-up on the running event loop (no-op if already started)."""
+        if self._task is not None:
+            return
+        self._done = asyncio.Event()
+        self._step_done = {name: asyncio.Event() for name, _, _ in self.steps}
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        self.status = "running"
+        self._started_at = time.perf_counter()
+        try:
+            for name, fn, required in self.steps:
+                step = self._step_status[name]
+                step["status"] = "running"
+                start = time.perf_counter()
+                try:
+                    await asyncio.to_thread(fn)
+                    step["status"] = "done"
+                except Exception as e:
+                    step["status"] = "failed"
+                    step["error"] = str(e)
+                    print(f"Warm-up step '{name}' failed: {e}")
+                    if required:
+                        self.status = "failed"
+                        return
+                finally:
+                    step["seconds"] = round(time.perf_counter() - start, 3)
+                    self._step_done[name].set()
+            self.status = "ready"
+            print(f"Warm-up finished in {time.perf_counter() - self._started_at:.2f}s")
+        finally:
+            self._finished_at = time.perf_counter()
+            # Steps skipped after a required failure must not keep anyone waiting
+            for event in self._step_done.values():
+                event.set()
+            self._done.set()
+
+    async def wait_ready(self, steps: Optional[Sequence[str]] = None) -> bool:
+        """
+        Start the warm-up if needed and wait for it, or only for the named
+        steps; False if it failed.
+        """
+        self.start()
+        if steps is None:
+            await self._done.wait()
+            return self.ready
+        for name in steps:
+            await self._step_done[name].wait()
+        return self.status != "failed"
+
+    def progress(self) -> Dict[str, Any]:
+        completed = sum(1 for s in self._step_status.values() if s["status"] in ("done", "failed"))
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = round((self._finished_at or time.perf_counter()) - self._started_at, 3)
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "completed_steps": completed,
+            "total_steps": len(self.steps),
+            "elapsed_seconds": elapsed,
+            "steps": [{"name": name, **self._step_status[name]} for name, _, _ in self.steps],
+        }
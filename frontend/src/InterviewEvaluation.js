@@ -254,13 +254,25 @@ const InterviewEvaluationApp = () => {
                   <MessageSquare className="w-8 h-8 text-blue-600" />
                   <span>Mock Interview Analysis</span>
                 </h2>
-                <div className="bg-white p-6 rounded-lg shadow-md border mb-6">
-                  <h3 className="text-lg font-semibold text-gray-800 mb-3">Question Asked:</h3>
-                  <p className="text-gray-600 italic mb-4">"{results.mock_scores.question}"</p>
-                  <h3 className="text-lg font-semibold text-gray-800 mb-3">Your Response:</h3>
-                  <p className="text-gray-600 bg-gray-50 p-4 rounded-lg">"{results.mock_scores.response}"</p>
-                </div>
-                
+                {/* Several answers: one card per question, scores below are their average */}
+                {(results.mock_scores.answers || [results.mock_scores]).map((answer, index) => (
+                  <div key={index} className="bg-white p-6 rounded-lg shadow-md border mb-6">
+                    <h3 className="text-lg font-semibold text-gray-800 mb-3">Question Asked:</h3>
+                    <p className="text-gray-600 italic mb-4">"{answer.question}"</p>
+                    <h3 className="text-lg font-semibold text-gray-800 mb-3">Your Response:</h3>
+                    <p className="text-gray-600 bg-gray-50 p-4 rounded-lg">"{answer.response}"</p>
+                    {results.mock_scores.answers && (
+                      answer.error ? (
+                        <p className="text-red-600 mt-4">This answer could not be evaluated and is not included in the scores below.</p>
+                      ) : (
+                        <p className="text-gray-700 mt-4">
+                          Tone {answer.tone} · Confidence {answer.confidence} · Relevance {answer.relevance}
+                        </p>
+                      )
+                    )}
+                  </div>
+                ))}
+
                 <div className="grid md:grid-cols-3 gap-6 mb-6">
                   <ScoreCard
                     title="Tone"